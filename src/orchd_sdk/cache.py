@@ -0,0 +1,128 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import hashlib
+import json
+import pickle
+import sys
+import time
+
+from collections import OrderedDict
+from typing import Any, Tuple, Union
+
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.models import CacheInfo, Event
+
+
+class ResultCache:
+    """
+    Memoizes handler results by event content, with LRU eviction and TTL.
+
+    Entries are keyed by a hash of the event name and data, so repeated
+    readings share the result of the first one. The cache is bounded by
+    `max_entries`, `max_bytes` or both (0 means unbounded), the least
+    recently used entries are evicted first. With a `ttl` entries expire
+    that many seconds after being stored.
+
+    Cached results are shared between the events that hit them, handlers
+    whose results are mutated downstream should not be cached.
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, ttl: float = None):
+        if max_entries < 0 or max_bytes < 0:
+            raise InvalidInputError('Cache bounds can not be negative.')
+        if ttl is not None and ttl <= 0:
+            raise InvalidInputError('Cache ttl must be positive.')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries: OrderedDict[bytes, Tuple[Any, float, int]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(event: Event) -> Union[bytes, None]:
+        """
+        Stable hash of the event name and data, None when the data can not
+        be serialized to JSON, in which case the event is not cached.
+        """
+        try:
+            content = json.dumps([event.event_name, event.data], sort_keys=True, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
+
+    def get(self, key: Union[bytes, None]) -> Tuple[bool, Any]:
+        """Looks the key up, returning whether it was found and the cached result."""
+        if key is None:
+            return False, None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        value, expires_at, _ = entry
+        if expires_at < time.monotonic():
+            self._discard(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def put(self, key: Union[bytes, None], value: Any):
+        """Stores the result, evicting the least recently used entries beyond the bounds."""
+        if key is None:
+            return
+        size = self._size_of(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._discard(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl else float('inf')
+        self._entries[key] = (value, expires_at, size)
+        self.size_bytes += size
+        while (self.max_entries and len(self._entries) > self.max_entries) or \
+                (self.max_bytes and self.size_bytes > self.max_bytes):
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def info(self) -> CacheInfo:
+        lookups = self.hits + self.misses
+        return CacheInfo(
+            entries=len(self._entries), size_bytes=self.size_bytes, hits=self.hits,
+            misses=self.misses, evictions=self.evictions,
+            hit_ratio=self.hits / lookups if lookups else 0.0
+        )
+
+    def _discard(self, key: bytes):
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return sys.getsizeof(value)
@@ -17,17 +17,147 @@
 import sys
 import importlib
 
-from typing import Any
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+class ClassResolver:
+    """
+    Resolves dotted paths, like ``orchd_sdk.sink.DummySink``, to classes.
+
+    Resolved classes are memoized, so templates instantiated many times only
+    pay for the lookup once. Paths that fail to resolve are memoized too and
+    fail again with the same error, without importing anything, until
+    :meth:`forget` is called, e.g. after installing new packages.
+    """
+
+    ERRORS = (ModuleNotFoundError, AttributeError, ValueError)
+    """Errors meaning the path does not name an importable class."""
+
+    def __init__(self):
+        self._classes: Dict[str, Any] = dict()
+        self._missing: Dict[str, Exception] = dict()
+
+    def resolve(self, path: str) -> Any:
+        """Returns the class named by the path, importing its module if needed."""
+        try:
+            return self._classes[path]
+        except KeyError:
+            pass
+        error = self._missing.get(path)
+        if error is not None:
+            raise type(error)(*error.args)
+
+        module_name = path.rpartition('.')[0]
+        try:
+            module = self._import(module_name)
+        except self.ERRORS as e:
+            self._missing[path] = e
+            raise
+        return self._lookup(module, path)
+
+    def preload(self, templates: Iterable[Any]) -> Dict[str, Exception]:
+        """
+        Resolves the classes used by the given Reaction, Sink and Sensor
+        templates. The paths are grouped by module and each module is
+        imported once, in the order the templates refer to them, before
+        looking its classes up.
+
+        :return: The paths that could not be resolved and their errors.
+        """
+        by_module: Dict[str, List[str]] = defaultdict(list)
+        for template in templates:
+            for path in self.class_paths(template):
+                paths = by_module[path.rpartition('.')[0]]
+                if path not in self._classes and path not in paths:
+                    paths.append(path)
+
+        failed = dict()
+        for module_name, paths in by_module.items():
+            try:
+                module = self._import(module_name)
+            except self.ERRORS as e:
+                for path in paths:
+                    self._missing[path] = failed[path] = e
+                continue
+            for path in paths:
+                try:
+                    self._lookup(module, path)
+                except self.ERRORS as e:
+                    failed[path] = e
+        return failed
+
+    @staticmethod
+    def _import(module_name: str) -> Any:
+        module = sys.modules.get(module_name)
+        if module is None:
+            module = importlib.import_module(module_name)
+        return module
+
+    def _lookup(self, module: Any, path: str) -> Any:
+        error = self._missing.get(path)
+        if error is not None:
+            raise type(error)(*error.args)
+        try:
+            Class = getattr(module, path.rpartition('.')[2])
+        except AttributeError as e:
+            self._missing[path] = e
+            raise
+        self._classes[path] = Class
+        return Class
+
+    def forget(self, path: str = None):
+        """Forgets the given path, or every path, resolved or not."""
+        if path is None:
+            self._classes.clear()
+            self._missing.clear()
+        else:
+            self._classes.pop(path, None)
+            self._missing.pop(path, None)
+
+    @staticmethod
+    def class_paths(template: Any) -> Tuple[str, ...]:
+        """The class paths a Reaction, Sink or Sensor template refers to."""
+        paths = list()
+        for field in ('handler', 'sink_class', 'sensor', 'communicator'):
+            path = getattr(template, field, None)
+            if isinstance(path, str):
+                paths.append(path)
+        for sink_template in getattr(template, 'sinks', None) or ():
+            paths.append(sink_template.sink_class)
+        return tuple(paths)
+
+
+class_resolver = ClassResolver()
+"""Process wide :class:`ClassResolver`."""
 
 
 def import_class(class_: str) -> Any:
     """Imports a class described in the given String"""
-    class_parts = class_.split('.')
-    class_name = class_parts.pop()
-    module_name = '.'.join(class_parts)
+    return class_resolver.resolve(class_)
+
+
+def preload(templates: Iterable[Any]) -> Dict[str, Exception]:
+    """Resolves the classes of the given templates ahead of their instantiation, see :meth:`ClassResolver.preload`."""
+    return class_resolver.preload(templates)
+
+
+def field_getter(path: str) -> Callable[[Any], Any]:
+    """
+    Returns a function reading the dot separated field path from an object.
+
+    The first part is an attribute, the following ones are dictionary keys,
+    e.g. ``data.device_id`` reads ``event.data['device_id']``. Missing fields
+    are read as None.
+    """
+    attribute, *keys = path.split('.')
 
-    if module_name not in sys.modules:
-        importlib.import_module(module_name)
-    Class = getattr(sys.modules.get(module_name), class_name)
+    def get(obj: Any) -> Any:
+        value = getattr(obj, attribute, None)
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
 
-    return Class
+    return get
@@ -0,0 +1,206 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import logging
+import time
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from orchd_sdk.common import import_class
+from orchd_sdk.models import Event, ReactionTemplate, ExecutorInfo
+
+logger = logging.getLogger(__name__)
+
+EventPayload = Tuple[str, Dict[str, Any], str]
+
+
+class ExecutionMode:
+    """Where a Reaction runs its handler."""
+
+    INLINE = 'inline'
+    """On the event loop, the default."""
+    THREAD = 'thread'
+    """In a pool of threads, for blocking handlers and sinks."""
+    PROCESS = 'process'
+    """In a pool of worker processes, for CPU bound handlers."""
+
+    ALL = (INLINE, THREAD, PROCESS)
+
+
+def event_to_payload(event: Event) -> EventPayload:
+    """Pickle friendly form of an event, a plain tuple."""
+    return event.event_name, event.data, event.id
+
+
+def event_from_payload(payload: EventPayload) -> Event:
+    """Rebuilds an event from :func:`event_to_payload`, skipping validation."""
+    event_name, data, id_ = payload
+    return Event.model_construct(event_name=event_name, data=data, id=id_)
+
+
+_worker_handler = None
+_worker_template: Union[ReactionTemplate, None] = None
+
+
+def _init_process_worker(handler_class: str, template_json: str):
+    global _worker_handler, _worker_template
+    _worker_handler = import_class(handler_class)()
+    _worker_template = ReactionTemplate.model_validate_json(template_json)
+
+
+def _handle_in_process(payload: EventPayload) -> Tuple[bool, Any]:
+    result = _worker_handler.handle(event_from_payload(payload), _worker_template)
+    if isinstance(result, Event):
+        return True, event_to_payload(result)
+    return False, result
+
+
+def _handle_batch_in_process(payloads: List[EventPayload]) -> Tuple[bool, Any]:
+    events = [event_from_payload(payload) for payload in payloads]
+    result = _worker_handler.handle_batch(events, _worker_template)
+    if isinstance(result, Event):
+        return True, event_to_payload(result)
+    return False, result
+
+
+def _ping():
+    return None
+
+
+class ProcessHandlerRunner:
+    """
+    Runs the handler of a Reaction Template in a pool of worker processes.
+
+    Each worker imports the handler class and instantiates it once, when
+    the worker starts, so calls only transfer the event and the result.
+    Events go through :func:`event_to_payload`, and handler results that
+    are events come back the same way, everything else must be picklable.
+    """
+
+    def __init__(self, template: ReactionTemplate):
+        self.workers = template.max_concurrency
+        self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                         initializer=_init_process_worker,
+                                         initargs=(template.handler, template.model_dump_json()))
+
+    async def start(self):
+        """Starts and warms up the workers."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+
+    async def handle(self, event: Event) -> Any:
+        loop = asyncio.get_running_loop()
+        is_event, result = await loop.run_in_executor(self._pool, _handle_in_process,
+                                                      event_to_payload(event))
+        return event_from_payload(result) if is_event else result
+
+    async def handle_batch(self, events: List[Event]) -> Any:
+        loop = asyncio.get_running_loop()
+        is_event, result = await loop.run_in_executor(self._pool, _handle_batch_in_process,
+                                                      [event_to_payload(e) for e in events])
+        return event_from_payload(result) if is_event else result
+
+    def info(self) -> Union[ExecutorInfo, None]:
+        return None
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+
+
+class ThreadPool:
+    """
+    A bounded pool of named threads running blocking calls for the event loop.
+
+    Calls are handed off with :meth:`asyncio.loop.run_in_executor`, the loop
+    is woken up once when the call finishes and nothing is shared with the
+    threads but the call itself. Metrics are only updated on the loop side:
+    the call records when it started running, which gives the time it waited
+    for a free thread.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.pending = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free thread."""
+        return max(0, self.pending - self.max_workers)
+
+    async def run(self, function: Callable, *args) -> Any:
+        """Runs the function in a thread of the pool and returns its result."""
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        started_at = [submitted_at]
+
+        def call():
+            started_at[0] = time.monotonic()
+            return function(*args)
+
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            wait = started_at[0] - submitted_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def info(self) -> ExecutorInfo:
+        return ExecutorInfo(
+            name=self.name, workers=self.max_workers, pending=self.pending,
+            queue_depth=self.queue_depth, completed=self.completed,
+            avg_wait=self.total_wait / self.completed if self.completed else 0.0,
+            max_wait=self.max_wait
+        )
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+
+class ThreadHandlerRunner:
+    """
+    Runs the handler of a Reaction in a :class:`ThreadPool` of
+    `max_concurrency` threads, for handlers calling blocking libraries.
+    """
+
+    def __init__(self, template: ReactionTemplate, handler: Any):
+        self._template = template
+        self._handler = handler
+        self.pool = ThreadPool(f'orchd-reaction-{template.name}', template.max_concurrency)
+
+    async def start(self):
+        pass
+
+    async def handle(self, event: Event) -> Any:
+        return await self.pool.run(self._handler.handle, event, self._template)
+
+    async def handle_batch(self, events: List[Event]) -> Any:
+        return await self.pool.run(self._handler.handle_batch, events, self._template)
+
+    def info(self) -> ExecutorInfo:
+        return self.pool.info()
+
+    async def close(self):
+        await self.pool.close()
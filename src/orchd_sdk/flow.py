@@ -0,0 +1,234 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Tuple
+
+from orchd_sdk.errors import InvalidInputError
+
+
+class InFlightCounter:
+    """
+    Counts units of work in progress.
+
+    Producers of work call :meth:`started` and :meth:`done` around each unit,
+    and publishers can await :meth:`wait_below` to be suspended until the
+    amount of work in progress goes down to a given threshold.
+    """
+
+    def __init__(self):
+        self._count = 0
+        self._waiters: List[Tuple[int, asyncio.Future]] = list()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def started(self, units: int = 1):
+        self._count += units
+
+    def done(self, units: int = 1):
+        self._count -= units
+        if self._waiters:
+            self._wake_waiters()
+
+    async def wait_below(self, threshold: int):
+        """Waits until there are no more than `threshold` units in progress."""
+        if self._count <= threshold:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append((threshold, waiter))
+        await waiter
+
+    def _wake_waiters(self):
+        waiting = list()
+        for threshold, waiter in self._waiters:
+            if waiter.done():
+                continue
+            if self._count <= threshold:
+                waiter.set_result(None)
+            else:
+                waiting.append((threshold, waiter))
+        self._waiters = waiting
+
+
+class OverflowPolicy:
+    """What a :class:`BoundedQueue` does with an item that arrives when it is full."""
+
+    BLOCK = 'block'
+    """Producers awaiting `put` wait for room. Nothing is dropped."""
+    DROP_NEWEST = 'drop_newest'
+    """The arriving item is dropped."""
+    DROP_OLDEST = 'drop_oldest'
+    """The oldest queued item is dropped to make room."""
+    KEEP_LATEST = 'keep_latest'
+    """The queued item with the same key is replaced by the arriving one,
+    if there is none the oldest queued item is dropped."""
+
+    ALL = (BLOCK, DROP_NEWEST, DROP_OLDEST, KEEP_LATEST)
+
+
+class BoundedQueue:
+    """
+    A bounded FIFO queue with configurable overflow policies.
+
+    The interface follows :class:`asyncio.Queue`. When the queue is full,
+    `put_nowait` applies the :class:`OverflowPolicy` and counts the dropped
+    items in `dropped`. With `OverflowPolicy.BLOCK` nothing is dropped:
+    `put` waits for room and `put_nowait`, that cannot wait, enqueues over
+    the capacity, so the bound is enforced on producers that await. Every
+    item given to the queue, dropped or not, is counted in `received`.
+
+    `OverflowPolicy.KEEP_LATEST` needs a `key` function giving the key of
+    an item, items with unhashable keys are never replaced.
+    """
+
+    def __init__(self, maxsize: int, policy: str = OverflowPolicy.BLOCK,
+                 key: Callable[[Any], Hashable] = None):
+        if maxsize <= 0:
+            raise InvalidInputError('Queue maxsize must be greater than zero.')
+        if policy not in OverflowPolicy.ALL:
+            raise InvalidInputError(f'Unknown overflow policy {policy!r}, expected one of '
+                                    f'{", ".join(OverflowPolicy.ALL)}.')
+        if policy == OverflowPolicy.KEEP_LATEST and key is None:
+            raise InvalidInputError(f'Overflow policy {policy!r} requires a key.')
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.received = 0
+        self.dropped = 0
+        self._key = key
+        self._items: Deque[Any] = deque()
+        self._latest: Dict[Hashable, list] = dict()
+        self._getters: Deque[asyncio.Future] = deque()
+        self._putters: Deque[asyncio.Future] = deque()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def put_nowait(self, item: Any) -> int:
+        """
+        Enqueues the item, applying the overflow policy if the queue is full.
+
+        :return: The number of items dropped to do it, 0 or 1.
+        """
+        self.received += 1
+        if self.full() and self.policy != OverflowPolicy.BLOCK:
+            self.dropped += 1
+            self._overflow(item)
+            return 1
+
+        self._append(item)
+        self._wake(self._getters)
+        return 0
+
+    async def put(self, item: Any) -> int:
+        """Enqueues the item, waiting for room under `OverflowPolicy.BLOCK`."""
+        if self.policy == OverflowPolicy.BLOCK:
+            await self.wait_not_full()
+        return self.put_nowait(item)
+
+    def get_nowait(self) -> Any:
+        if not self._items:
+            raise asyncio.QueueEmpty()
+        item = self._popleft()
+        self._wake(self._putters)
+        return item
+
+    async def get(self) -> Any:
+        while not self._items:
+            await self._wait(self._getters)
+        return self.get_nowait()
+
+    async def wait_not_full(self):
+        """Waits until there is room for at least one item."""
+        while self.full():
+            await self._wait(self._putters)
+
+    def clear(self) -> int:
+        """Removes all queued items, waking every producer waiting for room, and returns how many there were."""
+        count = len(self._items)
+        self._items.clear()
+        self._latest.clear()
+        while self._putters:
+            self._wake(self._putters)
+        return count
+
+    def _append(self, item: Any):
+        if self._key is None:
+            self._items.append(item)
+            return
+
+        key = self._key(item)
+        try:
+            hash(key)
+        except TypeError:
+            key = object()
+        box = [key, item]
+        self._latest[key] = box
+        self._items.append(box)
+
+    def _popleft(self) -> Any:
+        if self._key is None:
+            return self._items.popleft()
+
+        key, item = box = self._items.popleft()
+        if self._latest.get(key) is box:
+            del self._latest[key]
+        return item
+
+    def _overflow(self, item: Any):
+        if self.policy == OverflowPolicy.DROP_NEWEST:
+            return
+
+        if self.policy == OverflowPolicy.KEEP_LATEST:
+            try:
+                box = self._latest.get(self._key(item))
+            except TypeError:
+                box = None
+            if box is not None:
+                box[1] = item
+                return
+
+        self._popleft()
+        self._append(item)
+
+    @classmethod
+    async def _wait(cls, waiters: Deque[asyncio.Future]):
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                cls._wake(waiters)
+            raise
+
+    @staticmethod
+    def _wake(waiters: Deque[asyncio.Future]):
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
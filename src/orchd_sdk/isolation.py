@@ -0,0 +1,308 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import asyncio
+import logging
+import multiprocessing
+import pickle
+import struct
+import sys
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Union
+
+from orchd_sdk.common import import_class
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.executors import ExecutionMode, event_from_payload, event_to_payload
+from orchd_sdk.models import Event, SensorTemplate, SensorWorkerInfo
+from orchd_sdk.sensor import AbstractCommunicator, AbstractSensor, SensorError, SensorState
+
+logger = logging.getLogger(__name__)
+
+
+class SharedRingBuffer:
+    """
+    Ring buffer of byte records in shared memory, for one writer process and
+    one reader process.
+
+    The header holds the write position, the read position and the
+    capacity. The positions are byte counters that only grow, each updated
+    by one side only, and published after the bytes of the records they
+    cover were written or read, so no lock is needed.
+
+    A record is its length followed by its bytes and is never split: when
+    it does not fit before the end of the buffer, the end is skipped, marked
+    by a `WRAP` length when there is room for it.
+
+    The buffer is created when no name is given, and attached to otherwise.
+    """
+
+    HEADER = struct.Struct('<QQQ')
+    POSITION = struct.Struct('<Q')
+    LENGTH = struct.Struct('<I')
+    WRAP = 0xFFFFFFFF
+
+    def __init__(self, size: int = 0, name: str = None):
+        if name is None and size <= self.LENGTH.size:
+            raise InvalidInputError('Ring buffer size is too small.')
+        self._shm = SharedMemory(name=name, create=name is None, size=self.HEADER.size + size)
+        if name is None:
+            self.HEADER.pack_into(self._shm.buf, 0, 0, 0, size)
+        self.capacity = self.HEADER.unpack_from(self._shm.buf, 0)[2]
+        self.name = self._shm.name
+
+    def _positions(self):
+        return self.HEADER.unpack_from(self._shm.buf, 0)[:2]
+
+    @property
+    def used(self) -> int:
+        write, read = self._positions()
+        return write - read
+
+    def put(self, data: bytes) -> bool:
+        """Writes a record, returning False if there is no room for it yet."""
+        need = self.LENGTH.size + len(data)
+        if need > self.capacity:
+            raise InvalidInputError(f'Record of {len(data)} bytes does not fit the ring buffer.')
+        buf = self._shm.buf
+        write, read = self._positions()
+        offset = write % self.capacity
+        tail = self.capacity - offset
+        skip = tail if tail < need else 0
+        if write - read + skip + need > self.capacity:
+            return False
+        if skip:
+            if tail >= self.LENGTH.size:
+                self.LENGTH.pack_into(buf, self.HEADER.size + offset, self.WRAP)
+            write, offset = write + skip, 0
+        start = self.HEADER.size + offset
+        buf[start + self.LENGTH.size:start + need] = data
+        self.LENGTH.pack_into(buf, start, len(data))
+        self.POSITION.pack_into(buf, 0, write + need)
+        return True
+
+    def get(self, max_items: int) -> List[bytes]:
+        """Reads up to `max_items` records, in the order they were written."""
+        buf = self._shm.buf
+        write, read = self._positions()
+        records = []
+        while read < write and len(records) < max_items:
+            offset = read % self.capacity
+            tail = self.capacity - offset
+            if tail < self.LENGTH.size:
+                read += tail
+                continue
+            start = self.HEADER.size + offset
+            (length,) = self.LENGTH.unpack_from(buf, start)
+            if length == self.WRAP:
+                read += tail
+                continue
+            records.append(bytes(buf[start + self.LENGTH.size:start + self.LENGTH.size + length]))
+            read += self.LENGTH.size + length
+        self.POSITION.pack_into(buf, self.POSITION.size, read)
+        return records
+
+    def close(self):
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+
+class RingCommunicator(AbstractCommunicator):
+    """
+    Communicator of a Sensor run in a worker process, writing the events to
+    the :class:`SharedRingBuffer` read by the agent.
+
+    Events go through :func:`orchd_sdk.executors.event_to_payload` and are
+    pickled. While the ring buffer is full, emitting waits for the agent to
+    read it.
+    """
+
+    POLL_INTERVAL = 0.005
+
+    def __init__(self, ring: SharedRingBuffer):
+        super().__init__()
+        self.ring = ring
+
+    async def emit_event(self, event: Event):
+        await self.emit_events([event])
+
+    async def emit_events(self, events: List[Event]):
+        for event in events:
+            data = pickle.dumps(event_to_payload(event), protocol=pickle.HIGHEST_PROTOCOL)
+            while not self.ring.put(data):
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def authenticate(self):
+        pass
+
+    def close(self):
+        self.ring.close()
+
+
+WORKER_WATCH_INTERVAL = 0.1
+"""Seconds between two checks of the Sensor and the agent by a worker process."""
+
+WORKER_FLUSH_TIMEOUT = 1.0
+"""Seconds a worker whose Sensor stopped waits for its queued events to be written."""
+
+
+def _run_sensor_worker(template_json: str, ring_name: str):
+    template = SensorTemplate.model_validate_json(template_json)
+    ring = SharedRingBuffer(name=ring_name)
+    try:
+        exitcode = asyncio.run(_sensor_worker(template, ring))
+    finally:
+        ring.close()
+    sys.exit(exitcode)
+
+
+async def _sensor_worker(template: SensorTemplate, ring: SharedRingBuffer) -> int:
+    """
+    Runs the Sensor until the agent dies, returning 0, or until the Sensor
+    stops running, returning 1 so the agent restarts the worker. The events
+    the Sensor queued before stopping are written to the ring buffer first,
+    for up to `WORKER_FLUSH_TIMEOUT` seconds.
+    """
+    SensorClass = import_class(template.sensor)
+    sensor = SensorClass(template.model_copy(update={'execution_mode': ExecutionMode.INLINE}),
+                         RingCommunicator(ring))
+    sensor.start()
+    tasks = [task for task in (sensor._sense_task, sensor._process_events_task) if task is not None]
+    parent = multiprocessing.parent_process()
+    while parent is None or parent.is_alive():
+        if sensor.state != SensorState.RUNNING or any(task.done() for task in tasks):
+            logger.error(f'Sensor {template.sensor} stopped running, exiting its worker.')
+            deadline = asyncio.get_running_loop().time() + WORKER_FLUSH_TIMEOUT
+            while not sensor.event_queue.empty() and not sensor._process_events_task.done() \
+                    and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(WORKER_WATCH_INTERVAL)
+            await sensor.stop()
+            return 1
+        await asyncio.sleep(WORKER_WATCH_INTERVAL)
+    await sensor.stop()
+    return 0
+
+
+class IsolatedSensor(AbstractSensor):
+    """
+    Runs the Sensor of a template in a worker process, supervised by the agent.
+
+    The worker instantiates the Sensor class of the template with a
+    :class:`RingCommunicator`, so the events it senses are written to a
+    :class:`SharedRingBuffer` instead of being pickled through a pipe. Here
+    `sense` moves them from the ring buffer to the event queue, from where
+    they are emitted through the given communicator as for any Sensor.
+
+    When the worker dies it is started again after the template
+    `restart_delay`, the events it wrote before dying are kept. Workers
+    exit by themselves when their Sensor stops running, e.g. after a
+    :class:`orchd_sdk.errors.SensorFatalError`, so they are restarted too. Workers are
+    started with the `spawn` method, so they do not inherit the state of the
+    agent.
+    """
+
+    POLL_INTERVAL = 0.005
+    STOP_TIMEOUT = 5.0
+
+    def __init__(self, sensor_template: SensorTemplate, communicator: AbstractCommunicator):
+        super().__init__(sensor_template, communicator)
+        self.ring: Union[SharedRingBuffer, None] = None
+        self.process: Union[multiprocessing.Process, None] = None
+        self.restarts = 0
+        self._context = multiprocessing.get_context('spawn')
+
+    async def sense(self) -> int:
+        """Moves the events written by the worker to the event queue, returning how many."""
+        records = self.ring.get(self.emit_batch_size)
+        for record in records:
+            await self.event_queue.put(event_from_payload(pickle.loads(record)))
+        return len(records)
+
+    def _spawn(self):
+        self.process = self._context.Process(
+            target=_run_sensor_worker, args=(self.sensor_template.model_dump_json(), self.ring.name),
+            name=f'orchd-sensor-{self.id}', daemon=True)
+        self.process.start()
+
+    async def _supervise(self):
+        while self.state == SensorState.RUNNING:
+            try:
+                if await self.sense():
+                    await asyncio.sleep(0)
+                    continue
+            except Exception as e:
+                logger.error(f'Error while reading events of worker! Details: {e}')
+            if not self.process.is_alive():
+                logger.warning(f'Worker of Sensor {self.id} exited with code {self.process.exitcode}, '
+                               f'restarting it in {self.sensor_template.restart_delay}s.')
+                await asyncio.sleep(self.sensor_template.restart_delay)
+                if self.state != SensorState.RUNNING:
+                    return
+                self.restarts += 1
+                self._spawn()
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    def start(self, scheduler=None):
+        """
+        Starts the worker process and the supervision of it.
+
+        Scheduling applies to the Sensor in the worker, so no scheduler is taken.
+        """
+        if scheduler is not None:
+            raise SensorError('Sensors run in a worker process can not be scheduled by the agent.')
+        self.ring = SharedRingBuffer(self.sensor_template.ring_size)
+        self._spawn()
+        self.state = SensorState.RUNNING
+        loop = asyncio.get_event_loop()
+        self._process_events_task = loop.create_task(self._process_events())
+        self._sense_task = loop.create_task(self._supervise())
+
+    async def stop(self):
+        """Stops the worker process and releases the ring buffer."""
+        await super().stop()
+        if self.process is not None:
+            self.process.terminate()
+            await asyncio.get_running_loop().run_in_executor(None, self.process.join, self.STOP_TIMEOUT)
+            if self.process.is_alive():
+                self.process.kill()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring.unlink()
+            self.ring = None
+
+    def status(self):
+        status = super().status()
+        status.worker = SensorWorkerInfo(
+            pid=self.process.pid if self.process else None,
+            alive=self.process is not None and self.process.is_alive(), restarts=self.restarts,
+            ring_used=self.ring.used if self.ring else 0,
+            ring_capacity=self.ring.capacity if self.ring else self.sensor_template.ring_size
+        )
+        return status
+
+
+def create_sensor(sensor_template: SensorTemplate, communicator: AbstractCommunicator) -> AbstractSensor:
+    """
+    Instantiates the Sensor of the template, wrapped in an :class:`IsolatedSensor`
+    if its execution mode is `process`.
+    """
+    mode = sensor_template.execution_mode
+    if mode == ExecutionMode.PROCESS:
+        return IsolatedSensor(sensor_template, communicator)
+    if mode != ExecutionMode.INLINE:
+        raise SensorError(f'Sensors can not run in {mode} execution mode.')
+    return import_class(sensor_template.sensor)(sensor_template, communicator)
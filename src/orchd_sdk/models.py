@@ -89,6 +89,388 @@ class Event(BaseModel):
     )
 
 
+class ExecutorInfo(BaseModel):
+    """
+    Metrics of a pool of threads used to run blocking handlers or sinks.
+    """
+    name: str = Field(
+        json_schema_extra={
+            'title': 'Name',
+            'description': 'Name of the pool, used as prefix of its thread names.',
+            'example': 'orchd-reaction-io.orchd.reaction_template.DummyTemplate'
+        }
+    )
+
+    workers: int = Field(
+        json_schema_extra={
+            'title': 'Workers',
+            'description': 'Maximum number of threads of the pool.',
+            'example': 4
+        }
+    )
+
+    pending: int = Field(
+        json_schema_extra={
+            'title': 'Pending Calls',
+            'description': 'Calls submitted and not finished yet.',
+            'example': 6
+        }
+    )
+
+    queue_depth: int = Field(
+        json_schema_extra={
+            'title': 'Queue Depth',
+            'description': 'Calls waiting for a free thread.',
+            'example': 2
+        }
+    )
+
+    completed: int = Field(
+        json_schema_extra={
+            'title': 'Completed Calls',
+            'description': 'Calls finished, successfully or not.',
+            'example': 1520
+        }
+    )
+
+    avg_wait: float = Field(
+        json_schema_extra={
+            'title': 'Average Wait',
+            'description': 'Average time, in seconds, calls waited for a free thread.',
+            'example': 0.002
+        }
+    )
+
+    max_wait: float = Field(
+        json_schema_extra={
+            'title': 'Maximum Wait',
+            'description': 'Longest time, in seconds, a call waited for a free thread.',
+            'example': 0.05
+        }
+    )
+
+
+class BatchingInfo(BaseModel):
+    """
+    Metrics of the batches written by a batching Sink.
+    """
+    buffered: int = Field(
+        json_schema_extra={
+            'title': 'Buffered Items',
+            'description': 'Items waiting for the next batch.',
+            'example': 40
+        }
+    )
+
+    batches: int = Field(
+        json_schema_extra={
+            'title': 'Batches',
+            'description': 'Batches written, successfully or not.',
+            'example': 120
+        }
+    )
+
+    failed_batches: int = Field(
+        json_schema_extra={
+            'title': 'Failed Batches',
+            'description': 'Batches whose write failed.',
+            'example': 1
+        }
+    )
+
+    dropped: int = Field(
+        json_schema_extra={
+            'title': 'Dropped Items',
+            'description': 'Items of failed batches dropped because the buffer was full.',
+            'example': 0
+        }
+    )
+
+    avg_batch_size: float = Field(
+        json_schema_extra={
+            'title': 'Average Batch Size',
+            'description': 'Average number of items per batch.',
+            'example': 97.5
+        }
+    )
+
+    max_batch_size: int = Field(
+        json_schema_extra={
+            'title': 'Maximum Batch Size',
+            'description': 'Largest number of items written in a batch.',
+            'example': 100
+        }
+    )
+
+    avg_flush_latency: float = Field(
+        json_schema_extra={
+            'title': 'Average Flush Latency',
+            'description': 'Average time, in seconds, a batch write took.',
+            'example': 0.012
+        }
+    )
+
+    max_flush_latency: float = Field(
+        json_schema_extra={
+            'title': 'Maximum Flush Latency',
+            'description': 'Longest time, in seconds, a batch write took.',
+            'example': 0.2
+        }
+    )
+
+
+class OutboxInfo(BaseModel):
+    """
+    Metrics of the durable outbox of a Sink.
+    """
+    segments: int = Field(
+        json_schema_extra={
+            'title': 'Segments',
+            'description': 'Number of segment files holding items not delivered yet.',
+            'example': 2
+        }
+    )
+
+    size_bytes: int = Field(
+        json_schema_extra={
+            'title': 'Size in Bytes',
+            'description': 'Disk space used by the segment files.',
+            'example': 33554432
+        }
+    )
+
+    appended: int = Field(
+        json_schema_extra={
+            'title': 'Appended',
+            'description': 'Items appended to the outbox since the Sink was opened.',
+            'example': 10500
+        }
+    )
+
+    delivered: int = Field(
+        json_schema_extra={
+            'title': 'Delivered',
+            'description': 'Items delivered since the Sink was opened.',
+            'example': 10400
+        }
+    )
+
+    failed_deliveries: int = Field(
+        json_schema_extra={
+            'title': 'Failed Deliveries',
+            'description': 'Delivery attempts that failed and were retried.',
+            'example': 3
+        }
+    )
+
+
+class CacheInfo(BaseModel):
+    """
+    Metrics of the result cache of a Reaction.
+    """
+    entries: int = Field(
+        json_schema_extra={
+            'title': 'Entries',
+            'description': 'Number of results in the cache.',
+            'example': 250
+        }
+    )
+
+    size_bytes: int = Field(
+        json_schema_extra={
+            'title': 'Size in Bytes',
+            'description': 'Estimated size of the cached results, measured only when the cache is '
+                           'bounded in bytes.',
+            'example': 64000
+        }
+    )
+
+    hits: int = Field(
+        json_schema_extra={
+            'title': 'Hits',
+            'description': 'Events whose result was found in the cache.',
+            'example': 9200
+        }
+    )
+
+    misses: int = Field(
+        json_schema_extra={
+            'title': 'Misses',
+            'description': 'Events that had to be handled.',
+            'example': 800
+        }
+    )
+
+    evictions: int = Field(
+        json_schema_extra={
+            'title': 'Evictions',
+            'description': 'Results evicted to keep the cache within its bounds.',
+            'example': 550
+        }
+    )
+
+    hit_ratio: float = Field(
+        json_schema_extra={
+            'title': 'Hit Ratio',
+            'description': 'Fraction of the lookups that were hits.',
+            'example': 0.92
+        }
+    )
+
+
+class SinkDispatchInfo(BaseModel):
+    """
+    Metrics of the writes scheduled to a Sink by its Reaction.
+    """
+    max_in_flight: int = Field(
+        json_schema_extra={
+            'title': 'Maximum In Flight',
+            'description': 'Maximum number of concurrent writes to the Sink.',
+            'example': 16
+        }
+    )
+
+    queue_depth: int = Field(
+        json_schema_extra={
+            'title': 'Queue Depth',
+            'description': 'Writes waiting for one of the in-flight slots.',
+            'example': 3
+        }
+    )
+
+    in_flight: int = Field(
+        json_schema_extra={
+            'title': 'In Flight',
+            'description': 'Writes running.',
+            'example': 16
+        }
+    )
+
+    completed: int = Field(
+        json_schema_extra={
+            'title': 'Completed Writes',
+            'description': 'Writes finished successfully.',
+            'example': 10234
+        }
+    )
+
+    failed: int = Field(
+        json_schema_extra={
+            'title': 'Failed Attempts',
+            'description': 'Write attempts that raised an error, retried or not.',
+            'example': 2
+        }
+    )
+
+    attempts: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Attempts',
+            'description': 'Write attempts made, including retries.',
+            'example': 1530
+        }
+    )
+
+    retrying: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Retrying',
+            'description': 'Writes waiting for their next attempt.',
+            'example': 1
+        }
+    )
+
+    give_ups: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Give Ups',
+            'description': 'Writes dropped after failing all the attempts of the retry policy.',
+            'example': 0
+        }
+    )
+
+    current_backoff: float = Field(
+        default=0.0,
+        json_schema_extra={
+            'title': 'Current Backoff',
+            'description': 'Delay, in seconds, of the last retry scheduled, 0 after a successful write.',
+            'example': 0.4
+        }
+    )
+
+    avg_latency: float = Field(
+        json_schema_extra={
+            'title': 'Average Latency',
+            'description': 'Average time, in seconds, from scheduling to the end of a write.',
+            'example': 0.012
+        }
+    )
+
+    max_latency: float = Field(
+        json_schema_extra={
+            'title': 'Maximum Latency',
+            'description': 'Longest time, in seconds, from scheduling to the end of a write.',
+            'example': 0.3
+        }
+    )
+
+    last_errors: List[str] = Field(
+        default_factory=list,
+        json_schema_extra={
+            'title': 'Last Errors',
+            'description': 'Most recent write failures.',
+            'example': ['ConnectionError: Connection refused']
+        }
+    )
+
+
+class RetryPolicy(BaseModel):
+    """
+    How failed Sink writes are retried.
+
+    The n-th retry waits ``min(max_delay, base_delay * 2 ** (n - 1))``
+    seconds, reduced by a random fraction of up to `jitter` of it, so Sinks
+    failing together do not retry together.
+    """
+    max_attempts: int = Field(
+        default=1,
+        json_schema_extra={
+            'title': 'Maximum Attempts',
+            'description': 'Attempts made to write the data, including the first one. 1 disables '
+                           'retries.',
+            'example': 5
+        }
+    )
+
+    base_delay: float = Field(
+        default=0.1,
+        json_schema_extra={
+            'title': 'Base Delay',
+            'description': 'Seconds before the first retry, doubled for each following one.',
+            'example': 0.5
+        }
+    )
+
+    max_delay: float = Field(
+        default=10.0,
+        json_schema_extra={
+            'title': 'Maximum Delay',
+            'description': 'Maximum number of seconds between two attempts.',
+            'example': 30
+        }
+    )
+
+    jitter: float = Field(
+        default=1.0,
+        json_schema_extra={
+            'title': 'Jitter',
+            'description': 'Maximum fraction of the delay randomly removed from it, from 0, no '
+                           'jitter, to 1, full jitter.',
+            'example': 0.5
+        }
+    )
+
+
 class SinkTemplate(BaseModel):
     """
     Representation of an Orchd Sink
@@ -137,6 +519,71 @@ class SinkTemplate(BaseModel):
         }
     )
 
+    max_in_flight: int = Field(
+        default=16,
+        json_schema_extra={
+            'title': 'Maximum In Flight',
+            'description': 'Maximum number of concurrent writes a Reaction makes to the Sink, the '
+                           'following ones are queued.',
+            'example': 32
+        }
+    )
+
+    open_timeout: float = Field(
+        default=10.0,
+        json_schema_extra={
+            'title': 'Open Timeout',
+            'description': 'Seconds the Sink has to open before the Reaction creating it fails.',
+            'example': 5
+        }
+    )
+
+    close_timeout: float = Field(
+        default=10.0,
+        json_schema_extra={
+            'title': 'Close Timeout',
+            'description': 'Seconds the Sink has to close, after its pending writes are drained.',
+            'example': 5
+        }
+    )
+
+    retry: RetryPolicy = Field(
+        default_factory=RetryPolicy,
+        json_schema_extra={
+            'title': 'Retry Policy',
+            'description': 'How Reactions retry the writes to the Sink that fail.'
+        }
+    )
+
+    shared: bool = Field(
+        default=False,
+        json_schema_extra={
+            'title': 'Shared',
+            'description': 'Reactions using templates with the same id and properties share one '
+                           'instance of the Sink, closed when the last of them releases it.',
+            'example': True
+        }
+    )
+
+    execution_mode: str = Field(
+        default='inline',
+        json_schema_extra={
+            'title': 'Execution Mode',
+            'description': 'Where the Sink runs: `inline`, on the event loop, or `thread`, in a '
+                           'pool of `max_workers` threads for Sinks using blocking libraries.',
+            'example': 'thread'
+        }
+    )
+
+    max_workers: int = Field(
+        default=1,
+        json_schema_extra={
+            'title': 'Maximum Workers',
+            'description': 'Number of threads used by the `thread` execution mode.',
+            'example': 2
+        }
+    )
+
 
 class Sink(BaseModel):
     """
@@ -165,6 +612,80 @@ class Sink(BaseModel):
         }
     )
 
+    executor: Optional[ExecutorInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Executor',
+            'description': 'Thread pool metrics, when the Sink runs in the `thread` execution mode.'
+        }
+    )
+
+    dispatch: Optional[SinkDispatchInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Dispatch',
+            'description': 'Metrics of the writes scheduled to the Sink by its Reaction.'
+        }
+    )
+
+    batching: Optional[BatchingInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Batching',
+            'description': 'Batch metrics, for Sinks writing in batches.'
+        }
+    )
+
+    outbox: Optional[OutboxInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Outbox',
+            'description': 'Outbox metrics, for Sinks delivering through a durable outbox.'
+        }
+    )
+
+    references: int = Field(
+        default=1,
+        json_schema_extra={
+            'title': 'References',
+            'description': 'Number of Reactions using the Sink, more than one for shared Sinks.',
+            'example': 3
+        }
+    )
+
+
+class EventFilter(BaseModel):
+    """
+    A predicate over an event field.
+
+    Reaction Templates use filters to select, among the events they are
+    triggered on, the ones that must reach the Reaction.
+    """
+    field: str = Field(
+        json_schema_extra={
+            'title': 'Event Field',
+            'description': 'Dot separated path of the event field to compare.',
+            'example': 'data.severity'
+        }
+    )
+
+    operator: str = Field(
+        default='==',
+        json_schema_extra={
+            'title': 'Operator',
+            'description': 'One of `==`, `!=`, `<`, `<=`, `>`, `>=` and `in`.',
+            'example': '>='
+        }
+    )
+
+    value: Any = Field(
+        json_schema_extra={
+            'title': 'Value',
+            'description': 'Value the event field is compared to.',
+            'example': 3
+        }
+    )
+
 
 class ReactionTemplate(BaseModel):
     """
@@ -201,8 +722,20 @@ class ReactionTemplate(BaseModel):
     triggered_on: List[str] = Field(
         json_schema_extra={
             'title': 'Triggered On',
-            'description': 'List of event names that triggers the handler.',
-            'example': ['io.orchd.events.system.Test']
+            'description': 'List of event names that triggers the handler. Dot separated '
+                           'segments can be replaced by `*` to match any one segment or by '
+                           '`**` to match any number of segments. `\'\'` matches all events.',
+            'example': ['io.orchd.events.system.Test', 'com.acme.plant1.**']
+        }
+    )
+    filters: List[EventFilter] = Field(
+        default_factory=list,
+        json_schema_extra={
+            'title': 'Event Filters',
+            'description': 'Predicates over the event fields, all of them must hold for an event '
+                           'to reach the handler.',
+            'example': [EventFilter(field='data.site', value='plant1'),
+                        EventFilter(field='data.severity', operator='>=', value=3)]
         }
     )
     handler_parameters: Dict[str, Any] = Field(
@@ -227,6 +760,125 @@ class ReactionTemplate(BaseModel):
         }
     )
 
+    inbox_size: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Inbox Size',
+            'description': 'Capacity of the Reaction inbox. Events are queued in the inbox and '
+                           'handled by a task owned by the Reaction. With 0 events are handled '
+                           'inline when published.',
+            'example': 1000
+        }
+    )
+
+    inbox_overflow_policy: str = Field(
+        default='block',
+        json_schema_extra={
+            'title': 'Inbox Overflow Policy',
+            'description': 'What to do with events arriving when the inbox is full: `block`, '
+                           '`drop_newest`, `drop_oldest` or `keep_latest` (per inbox overflow key).',
+            'example': 'drop_oldest'
+        }
+    )
+
+    inbox_overflow_key: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Inbox Overflow Key',
+            'description': 'Event field identifying events replaced by the `keep_latest` policy.',
+            'example': 'data.device_id'
+        }
+    )
+
+    max_concurrency: int = Field(
+        default=1,
+        json_schema_extra={
+            'title': 'Maximum Concurrency',
+            'description': 'Maximum number of handler calls running concurrently in a Reaction. '
+                           'Applies to coroutine handlers and to handlers not running inline.',
+            'example': 8
+        }
+    )
+
+    max_batch_size: int = Field(
+        default=100,
+        json_schema_extra={
+            'title': 'Maximum Batch Size',
+            'description': 'Number of buffered events that makes a Reaction call its batch handler.',
+            'example': 500
+        }
+    )
+
+    max_batch_latency: float = Field(
+        default=0.1,
+        json_schema_extra={
+            'title': 'Maximum Batch Latency',
+            'description': 'Seconds an event can wait in the buffer of a batch handler before the '
+                           'batch is handled.',
+            'example': 0.5
+        }
+    )
+
+    execution_mode: str = Field(
+        default='inline',
+        json_schema_extra={
+            'title': 'Execution Mode',
+            'description': 'Where the handler runs: `inline`, on the event loop, `thread`, in '
+                           '`max_concurrency` threads for blocking handlers, or `process`, in '
+                           '`max_concurrency` worker processes for CPU bound handlers.',
+            'example': 'process'
+        }
+    )
+
+    partition_key: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Partition Key',
+            'description': 'Event field whose value assigns events to partition lanes. Events with '
+                           'the same key are handled one at a time, in order, while different lanes '
+                           'run in parallel.',
+            'example': 'data.device_id'
+        }
+    )
+
+    partitions: int = Field(
+        default=4,
+        json_schema_extra={
+            'title': 'Partitions',
+            'description': 'Number of partition lanes used when a partition key is set.',
+            'example': 16
+        }
+    )
+
+    cache_max_entries: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Cache Maximum Entries',
+            'description': 'Maximum number of handler results cached by event content. The cache '
+                           'is enabled when this or the cache maximum bytes is set, 0 means no limit.',
+            'example': 10000
+        }
+    )
+
+    cache_max_bytes: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Cache Maximum Bytes',
+            'description': 'Maximum estimated size of the cached handler results, 0 means no limit.',
+            'example': 16777216
+        }
+    )
+
+    cache_ttl: Optional[float] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Cache TTL',
+            'description': 'Seconds a cached handler result is valid. Results do not expire when '
+                           'not set.',
+            'example': 30
+        }
+    )
+
     active: bool = Field(
         default=True,
         json_schema_extra={
@@ -298,6 +950,85 @@ class SensorTemplate(BaseModel):
         }
     )
 
+    emit_batch_size: int = Field(
+        default=100,
+        json_schema_extra={
+            'title': 'Emit Batch Size',
+            'description': 'Maximum number of queued events the Sensor emits at once through its '
+                           'Communicator.',
+            'example': 500
+        }
+    )
+
+    queue_size: int = Field(
+        default=10000,
+        json_schema_extra={
+            'title': 'Queue Size',
+            'description': 'Capacity of the queue of events sensed and not emitted yet.',
+            'example': 1000
+        }
+    )
+
+    queue_overflow_policy: str = Field(
+        default='block',
+        json_schema_extra={
+            'title': 'Queue Overflow Policy',
+            'description': 'What to do with events sensed when the queue is full: `block` the '
+                           'Sensor, `drop_newest`, `drop_oldest` or `keep_latest` (per queue overflow '
+                           'key).',
+            'example': 'keep_latest'
+        }
+    )
+
+    queue_overflow_key: Optional[str] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Queue Overflow Key',
+            'description': 'Event field identifying events replaced by the `keep_latest` policy.',
+            'example': 'data.device_id'
+        }
+    )
+
+    max_threads: int = Field(
+        default=1,
+        json_schema_extra={
+            'title': 'Maximum Threads',
+            'description': 'Threads of a Blocking Sensor running `sense_blocking` at the same time.',
+            'example': 4
+        }
+    )
+
+    execution_mode: str = Field(
+        default='inline',
+        json_schema_extra={
+            'title': 'Execution Mode',
+            'description': 'Where the Sensor runs: `inline`, on the event loop of the agent, or '
+                           '`process`, in a supervised worker process passing the events through '
+                           'shared memory.',
+            'example': 'process'
+        }
+    )
+
+    ring_size: int = Field(
+        default=1048576,
+        json_schema_extra={
+            'title': 'Ring Size',
+            'description': 'Bytes of the shared memory ring buffer carrying the events of a Sensor '
+                           'run in a worker process.',
+            'example': 4194304
+        }
+    )
+
+    restart_delay: float = Field(
+        default=1.0,
+        json_schema_extra={
+            'title': 'Restart Delay',
+            'description': 'Seconds to wait before restarting the worker process of a Sensor after '
+                           'it died.',
+            'example': 5.0
+        }
+    )
+
     communicator: str = Field(
         json_schema_extra={
             'title': 'Communicator Class',
@@ -359,6 +1090,205 @@ class ReactionInfo(BaseModel):
         }
     )
 
+    inbox_depth: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Inbox Depth',
+            'description': 'Number of events waiting in the Reaction inbox.',
+            'example': 12
+        }
+    )
+
+    events_dropped: int = Field(
+        default=0,
+        json_schema_extra={
+            'title': 'Events Dropped',
+            'description': 'Number of events dropped by the inbox overflow policy.',
+            'example': 3
+        }
+    )
+
+    executor: Optional[ExecutorInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Executor',
+            'description': 'Thread pool metrics, when the handler runs in the `thread` execution '
+                           'mode.'
+        }
+    )
+
+    lane_depths: List[int] = Field(
+        default_factory=list,
+        json_schema_extra={
+            'title': 'Lane Depths',
+            'description': 'Number of events waiting in each partition lane, when the Reaction '
+                           'template sets a partition key.',
+            'example': [0, 3, 1, 0]
+        }
+    )
+
+    cache: Optional[CacheInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Cache',
+            'description': 'Result cache metrics, when the Reaction template enables it.'
+        }
+    )
+
+
+class ScheduleInfo(BaseModel):
+    """
+    Metrics of a periodic call run by a :class:`orchd_sdk.scheduler.SensorScheduler`.
+    """
+    interval: float = Field(
+        json_schema_extra={
+            'title': 'Interval',
+            'description': 'Seconds between two calls, rounded to the scheduler resolution.',
+            'example': 5.0
+        }
+    )
+
+    phase: float = Field(
+        json_schema_extra={
+            'title': 'Phase',
+            'description': 'Offset, in seconds, given to the first call to spread the calls with '
+                           'the same interval.',
+            'example': 3.09
+        }
+    )
+
+    runs: int = Field(
+        json_schema_extra={
+            'title': 'Runs',
+            'description': 'Number of calls started.',
+            'example': 720
+        }
+    )
+
+    skipped: int = Field(
+        json_schema_extra={
+            'title': 'Skipped',
+            'description': 'Calls not started because the previous one was still running or the '
+                           'scheduler was too late to make them.',
+            'example': 2
+        }
+    )
+
+    last_lateness: float = Field(
+        json_schema_extra={
+            'title': 'Last Lateness',
+            'description': 'Seconds the last call started after it was due.',
+            'example': 0.002
+        }
+    )
+
+    mean_lateness: float = Field(
+        json_schema_extra={
+            'title': 'Mean Lateness',
+            'description': 'Mean of the seconds the calls started after they were due.',
+            'example': 0.001
+        }
+    )
+
+    max_lateness: float = Field(
+        json_schema_extra={
+            'title': 'Max Lateness',
+            'description': 'Most seconds a call started after it was due.',
+            'example': 0.015
+        }
+    )
+
+
+class BlockingSenseInfo(BaseModel):
+    """
+    Timing of the `sense_blocking` calls of a Blocking Sensor.
+    """
+    calls: int = Field(
+        json_schema_extra={
+            'title': 'Calls',
+            'description': 'Number of `sense_blocking` calls finished.',
+            'example': 3600
+        }
+    )
+
+    readings: int = Field(
+        json_schema_extra={
+            'title': 'Readings',
+            'description': 'Events returned or posted by `sense_blocking`.',
+            'example': 7200
+        }
+    )
+
+    batches: int = Field(
+        json_schema_extra={
+            'title': 'Batches',
+            'description': 'Batches in which the events posted from the threads reached the event '
+                           'loop.',
+            'example': 900
+        }
+    )
+
+    avg_duration: float = Field(
+        json_schema_extra={
+            'title': 'Average Duration',
+            'description': 'Mean seconds a `sense_blocking` call took.',
+            'example': 0.02
+        }
+    )
+
+    max_duration: float = Field(
+        json_schema_extra={
+            'title': 'Maximum Duration',
+            'description': 'Most seconds a `sense_blocking` call took.',
+            'example': 0.5
+        }
+    )
+
+
+class SensorWorkerInfo(BaseModel):
+    """
+    State of the worker process of a Sensor run in `process` execution mode.
+    """
+    pid: Optional[int] = Field(
+        json_schema_extra={
+            'title': 'Process Id',
+            'description': 'Id of the worker process, None if it was not started.',
+            'example': 4321
+        }
+    )
+
+    alive: bool = Field(
+        json_schema_extra={
+            'title': 'Alive',
+            'description': 'Whether the worker process is running.',
+            'example': True
+        }
+    )
+
+    restarts: int = Field(
+        json_schema_extra={
+            'title': 'Restarts',
+            'description': 'Number of times the worker process was restarted after dying.',
+            'example': 1
+        }
+    )
+
+    ring_used: int = Field(
+        json_schema_extra={
+            'title': 'Ring Used',
+            'description': 'Bytes of events written by the worker and not read yet.',
+            'example': 2048
+        }
+    )
+
+    ring_capacity: int = Field(
+        json_schema_extra={
+            'title': 'Ring Capacity',
+            'description': 'Bytes of the ring buffer.',
+            'example': 1048576
+        }
+    )
+
 
 class Sensor(BaseModel):
     """
@@ -411,6 +1341,38 @@ class Sensor(BaseModel):
         }
     )
 
+    schedule: Optional[ScheduleInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Schedule',
+            'description': 'Metrics of the scheduler calling the Sensor, if it is run by one.'
+        }
+    )
+
+    worker: Optional[SensorWorkerInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Worker',
+            'description': 'State of the worker process, if the Sensor runs in one.'
+        }
+    )
+
+    executor: Optional[ExecutorInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Executor',
+            'description': 'Metrics of the thread pool of a Blocking Sensor.'
+        }
+    )
+
+    blocking: Optional[BlockingSenseInfo] = Field(
+        default=None,
+        json_schema_extra={
+            'title': 'Blocking Sense',
+            'description': 'Timing of the `sense_blocking` calls of a Blocking Sensor.'
+        }
+    )
+
 
 class Project(BaseModel):
     model_config = ConfigDict(validate_assignment=True)
@@ -0,0 +1,242 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple, Union
+
+from orchd_sdk.errors import SinkError
+
+Position = Tuple[int, int]
+"""Position of a record in an :class:`Outbox`: segment sequence number and offset."""
+
+
+class Segment:
+    """
+    A memory-mapped segment file of an :class:`Outbox`.
+
+    Records are a header, with the payload length and CRC32, followed by the
+    payload. Segments are created zero filled, so a zero length marks the end
+    of the records, as does a record whose CRC does not match, e.g. one only
+    partly written when the process died.
+    """
+
+    HEADER = struct.Struct('<II')
+
+    def __init__(self, path: str, seq: int, size: int = 0):
+        self.path = path
+        self.seq = seq
+        with open(path, 'a+b') as file:
+            if size:
+                file.truncate(size)
+            self._map = mmap.mmap(file.fileno(), 0)
+        self.size = len(self._map)
+        self.end = self._scan()
+
+    def _scan(self) -> int:
+        offset, record = 0, self.read(0, self.size)
+        while record is not None:
+            offset = record[1]
+            record = self.read(offset, self.size)
+        return offset
+
+    def fits(self, length: int) -> bool:
+        return self.end + length <= self.size
+
+    def append(self, payload: bytes):
+        """Writes the record, the payload first, so the header only appears over a complete payload."""
+        start = self.end + self.HEADER.size
+        self._map[start:start + len(payload)] = payload
+        self._map[self.end:start] = self.HEADER.pack(len(payload), zlib.crc32(payload))
+        self.end = start + len(payload)
+
+    def read(self, offset: int, end: int = None) -> Union[Tuple[bytes, int], None]:
+        """The payload of the record at the offset and the offset of the next one, None past the last record."""
+        end = self.end if end is None else end
+        start = offset + self.HEADER.size
+        if start > end:
+            return None
+        length, crc = self.HEADER.unpack_from(self._map, offset)
+        if not length or start + length > end:
+            return None
+        payload = self._map[start:start + length]
+        if zlib.crc32(payload) != crc:
+            return None
+        return payload, start + length
+
+    def sync(self):
+        self._map.flush()
+
+    def close(self):
+        self._map.close()
+
+
+class Outbox:
+    """
+    Durable FIFO of items, kept in memory-mapped segment files.
+
+    Appending serializes the item and copies it into the mapped segment
+    being written, no system call is made until the segment is full and a
+    new one is created. Readers get the items from the acknowledged position
+    on, and acknowledging a position deletes the segments before it. Only
+    the segments being written and read are mapped, so memory use does not
+    grow with the backlog, which is bounded on disk by `max_segments`.
+
+    The acknowledged position is kept in a mapped cursor file. Items and
+    cursor written to the mappings survive the process, :meth:`sync` flushes
+    them to the disk to survive the machine too. Items read and not
+    acknowledged before a restart are read again, delivery is at least once.
+    """
+
+    SEGMENT_SUFFIX = '.seg'
+    CURSOR = struct.Struct('<QQ')
+
+    def __init__(self, directory: str, segment_size: int = 16 * 1024 * 1024, max_segments: int = 0,
+                 dumps: Callable[[Any], bytes] = pickle.dumps, loads: Callable[[bytes], Any] = pickle.loads):
+        if segment_size <= Segment.HEADER.size or max_segments < 0:
+            raise SinkError('Outbox segment_size must fit a record header and max_segments can not be negative.')
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.appended = 0
+        self._dumps = dumps
+        self._loads = loads
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, 'cursor'), 'a+b') as file:
+            file.truncate(self.CURSOR.size)
+            self._cursor_map = mmap.mmap(file.fileno(), 0)
+        self._seqs: Deque[int] = deque(sorted(
+            int(name[:-len(self.SEGMENT_SUFFIX)]) for name in os.listdir(directory)
+            if name.endswith(self.SEGMENT_SUFFIX)
+        ))
+        self._sizes: Dict[int, int] = {seq: os.path.getsize(self._path(seq)) for seq in self._seqs}
+        self._mapped: Dict[int, Segment] = dict()
+        self._writing: Union[Segment, None] = None
+
+        seq, _ = self.cursor
+        while self._seqs and self._seqs[0] < seq:
+            self._delete(self._seqs.popleft())
+        if not self._seqs:
+            self._writing = self._create(max(seq, 1), segment_size)
+            self._write_cursor((self._writing.seq, 0))
+        else:
+            if self._seqs[0] != seq:
+                self._write_cursor((self._seqs[0], 0))
+            self._writing = self._segment(self._seqs[-1])
+
+    @property
+    def cursor(self) -> Position:
+        """Position of the first item not acknowledged."""
+        return self.CURSOR.unpack_from(self._cursor_map)
+
+    @property
+    def segments(self) -> int:
+        return len(self._seqs)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def append(self, item: Any):
+        """Appends the item, raising :class:`SinkError` when the outbox reached `max_segments`."""
+        payload = self._dumps(item)
+        length = Segment.HEADER.size + len(payload)
+        if not self._writing.fits(length):
+            self._roll(length)
+        self._writing.append(payload)
+        self.appended += 1
+
+    def read(self, max_items: int) -> Tuple[List[Any], Position]:
+        """
+        Reads up to `max_items` from the cursor on, returning them and the
+        position to acknowledge once they are delivered.
+        """
+        items = list()
+        seq, offset = self.cursor
+        while len(items) < max_items:
+            record = self._segment(seq).read(offset)
+            if record is not None:
+                payload, offset = record
+                items.append(self._loads(payload))
+            elif seq != self._writing.seq:
+                seq, offset = self._seqs[self._seqs.index(seq) + 1], 0
+            else:
+                break
+        return items, (seq, offset)
+
+    def ack(self, position: Position):
+        """Moves the cursor to the position, deleting the segments before it."""
+        self._write_cursor(position)
+        while self._seqs[0] < position[0]:
+            self._delete(self._seqs.popleft())
+
+    def sync(self):
+        """Flushes the segment being written and the cursor to the disk."""
+        self._writing.sync()
+        self._cursor_map.flush()
+
+    def close(self):
+        self.sync()
+        for segment in self._mapped.values():
+            segment.close()
+        self._mapped = dict()
+        self._cursor_map.close()
+
+    def _roll(self, length: int):
+        if self.max_segments and len(self._seqs) >= self.max_segments:
+            raise SinkError(f'Outbox {self.directory} is full, it reached {self.max_segments} segments.')
+        previous = self._writing
+        self._writing = self._create(self._seqs[-1] + 1, max(self.segment_size, length))
+        if previous.seq != self.cursor[0]:
+            self._unmap(previous.seq)
+
+    def _create(self, seq: int, size: int) -> Segment:
+        segment = self._mapped[seq] = Segment(self._path(seq), seq, size)
+        self._seqs.append(seq)
+        self._sizes[seq] = size
+        return segment
+
+    def _segment(self, seq: int) -> Segment:
+        """The mapped segment, mapping it in place of the one being read, if not mapped yet."""
+        segment = self._mapped.get(seq)
+        if segment is None:
+            for mapped in list(self._mapped):
+                if self._writing is None or mapped != self._writing.seq:
+                    self._unmap(mapped)
+            segment = self._mapped[seq] = Segment(self._path(seq), seq)
+        return segment
+
+    def _unmap(self, seq: int):
+        segment = self._mapped.pop(seq, None)
+        if segment is not None:
+            segment.close()
+
+    def _delete(self, seq: int):
+        self._unmap(seq)
+        self._sizes.pop(seq, None)
+        os.remove(self._path(seq))
+
+    def _write_cursor(self, position: Position):
+        self.CURSOR.pack_into(self._cursor_map, 0, *position)
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f'{seq:020d}{self.SEGMENT_SUFFIX}')
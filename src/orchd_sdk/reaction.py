@@ -15,23 +15,26 @@
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import asyncio
-import importlib
 import logging
-import sys
 import uuid
 
+from functools import partial
 from abc import abstractmethod, ABC
-from asyncio import AbstractEventLoop
-from typing import Any, Dict, List, Union, Tuple
+from asyncio import AbstractEventLoop, Task, TimerHandle
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterable, List, NamedTuple, Sequence, Set, Union, Tuple
 
 from reactivex import Observable
+from reactivex.disposable import Disposable
 from reactivex.observer import Observer
-from reactivex.subject import Subject
 
-from orchd_sdk.common import import_class
-from orchd_sdk.errors import SinkError, ReactionHandlerError, ReactionError
-from orchd_sdk.models import Event, ReactionTemplate, SinkTemplate, ReactionInfo
-from orchd_sdk.sink import AbstractSink, DummySink
+from orchd_sdk.cache import ResultCache
+from orchd_sdk.common import ClassResolver, import_class, field_getter
+from orchd_sdk.errors import SinkError, ReactionHandlerError, ReactionError, InvalidInputError
+from orchd_sdk.executors import ExecutionMode, ProcessHandlerRunner, ThreadHandlerRunner, ThreadPool
+from orchd_sdk.flow import InFlightCounter, BoundedQueue, OverflowPolicy
+from orchd_sdk.models import Event, ReactionTemplate, SinkTemplate, ReactionInfo, Sink
+from orchd_sdk.routing import TopicTrie, Subscribers, CompiledFilters, compile_filters
+from orchd_sdk.sink import AbstractSink, DummySink, SinkDispatcher, SinkRegistry, global_sink_registry
 
 logger = logging.getLogger(__name__)
 
@@ -40,33 +43,215 @@ class ReactionsEventBus:
     """
     The Reaction Event Bus.
 
-    The Reaction Event Bus wraps a reactivex.subject.Subject and offers
-    a method to register Reactions (they are reactivex.observer.Observer).
+    The Reaction Event Bus keeps an index from event names to the Reactions
+    (they are reactivex.observer.Observer) triggered by them, so publishing
+    an event only reaches the Reactions subscribed to its name. Reactions
+    triggered on ``''`` are kept apart and receive every event.
+
+    Names in `triggered_on` may use ``*`` (one segment) and ``**`` (any
+    number of segments) wildcards, e.g. ``com.acme.plant1.**``. Those are
+    matched through a :class:`orchd_sdk.routing.TopicTrie`. Template
+    `filters` further select events by content, see
+    :class:`orchd_sdk.routing.Subscribers`.
+
+    Events can be published without waiting, with :meth:`event` and
+    :meth:`publish_many`, or awaited with :meth:`publish` and
+    :meth:`publish_batch`. The awaitable forms apply backpressure: when a
+    Reaction reached by the event has `high_watermark` or more units of
+    work in flight, the publisher is suspended until it goes down to
+    `low_watermark`. Publishers also wait for room in inboxes using the
+    `block` overflow policy.
 
     Whenever ones wants to propagate an event on the system CAN do this
     through an global reaction event bus. However it is allowed to create
     more BUSES depending on the system architecture being implemented.
     """
-    def __init__(self):
-        self._subject = Subject()
+
+    CATCH_ALL = ''
+    """Event name used in `triggered_on` to subscribe to every event."""
+
+    def __init__(self, high_watermark: int = 1024, low_watermark: int = None):
+        if low_watermark is None:
+            low_watermark = high_watermark // 2
+        if not 0 <= low_watermark < high_watermark:
+            raise InvalidInputError('Watermarks must satisfy 0 <= low_watermark < high_watermark.')
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self._reactions: Dict[str, Reaction] = dict()
+        self._subscriptions: Dict[str, Tuple[str, ...]] = dict()
+        self._routes: Dict[str, Subscribers] = dict()
+        self._patterns = TopicTrie()
+        self._catch_all = Subscribers()
+
+    @property
+    def reactions(self) -> List["Reaction"]:
+        """Reactions currently registered on the bus."""
+        return list(self._reactions.values())
 
     def register_reaction(self, reaction: "Reaction"):
-        """Registers a Reaction (Observer) on the subject."""
-        disposable = self._subject.subscribe(reaction)
-        reaction.disposable = disposable
+        """
+        Indexes the Reaction under the event names it is triggered on.
+
+        The template filters are compiled here, once, and equality filters
+        are indexed so events that match no filter never reach the Reaction.
+        The disposable attached to the Reaction removes it from the index.
+        """
+        triggered_on, filters = self.subscription(reaction.reaction_template)
+        self.unregister_reaction(reaction)
+
+        for name in triggered_on:
+            if name == self.CATCH_ALL:
+                subscribers = self._catch_all
+            else:
+                subscribers = self._routes.get(name)
+                if subscribers is None:
+                    subscribers = self._routes[name] = Subscribers()
+                    if TopicTrie.is_pattern(name):
+                        self._patterns.insert(name, subscribers)
+            subscribers.add(reaction, filters)
+
+        self._reactions[reaction.id] = reaction
+        self._subscriptions[reaction.id] = triggered_on
+        reaction.disposable = Disposable(lambda: self.unregister_reaction(reaction))
+
+    @classmethod
+    def subscription(cls, reaction_template: ReactionTemplate) -> Tuple[Tuple[str, ...], CompiledFilters]:
+        """
+        Validates the `triggered_on` and `filters` of the template, returning
+        the event names to index and the compiled filters.
+        """
+        triggered_on = tuple(dict.fromkeys(reaction_template.triggered_on))
+        if cls.CATCH_ALL in triggered_on:
+            triggered_on = (cls.CATCH_ALL,)
+
+        try:
+            for name in triggered_on:
+                if TopicTrie.is_pattern(name):
+                    TopicTrie.split(name)
+            return triggered_on, compile_filters(reaction_template.filters)
+        except InvalidInputError as e:
+            raise ReactionError(f'Reaction template {reaction_template.id} has an invalid '
+                                f'triggered_on or filters.') from e
+
+    def unregister_reaction(self, reaction: "Reaction"):
+        """Removes the Reaction from the index, if it is registered."""
+        if self._reactions.pop(reaction.id, None) is None:
+            return
+
+        for name in self._subscriptions.pop(reaction.id):
+            if name == self.CATCH_ALL:
+                self._catch_all.remove(reaction)
+                continue
+            subscribers = self._routes[name]
+            subscribers.remove(reaction)
+            if not subscribers:
+                del self._routes[name]
+                if TopicTrie.is_pattern(name):
+                    self._patterns.remove(name, subscribers)
+
+    def match(self, event_: Event) -> Sequence["Reaction"]:
+        """Reactions triggered by the given event, each one once."""
+        return self._match(self._topics(event_.event_name), event_)
+
+    def _topics(self, event_name: str) -> List[Subscribers]:
+        topics = list()
+        exact = self._routes.get(event_name)
+        if exact is not None:
+            topics.append(exact)
+        if self._patterns:
+            topics.extend(self._patterns.match(event_name))
+        if self._catch_all:
+            topics.append(self._catch_all)
+        return topics
+
+    @staticmethod
+    def _match(topics: List[Subscribers], event_: Event) -> Sequence["Reaction"]:
+        if not topics:
+            return ()
+        if len(topics) == 1:
+            return topics[0].match(event_)
+        reactions = list()
+        for topic in topics:
+            reactions.extend(topic.match(event_))
+        return tuple(dict.fromkeys(reactions))
 
     def event(self, event_: Event):
-        """Forwards the event to the subscribers"""
-        self._subject.on_next(event_)
+        """Forwards the event to the Reactions subscribed to its name."""
+        for reaction in self.match(event_):
+            reaction.on_next(event_)
+
+    def publish_many(self, events: Iterable[Event]):
+        """
+        Forwards a batch of events routing the whole batch in a single pass.
+
+        Events are grouped by Reaction, keeping their order, and each Reaction
+        receives the events meant for it in one
+        :meth:`Reaction.on_next_batch` call. A Reaction failing to handle its
+        batch is logged and does not keep the others from receiving theirs.
+        """
+        self._publish_many(events)
+
+    async def publish(self, event_: Event):
+        """
+        Forwards the event and waits while the Reactions it reached are above
+        the high watermark.
+        """
+        reactions = self.match(event_)
+        for reaction in reactions:
+            reaction.on_next(event_)
+        await self._wait_for_capacity(reactions)
+
+    async def publish_batch(self, events: Iterable[Event]):
+        """
+        Awaitable form of :meth:`publish_many`, waits while the Reactions
+        reached by the batch are above the high watermark.
+        """
+        await self._wait_for_capacity(self._publish_many(events))
+
+    def _publish_many(self, events: Iterable[Event]) -> Iterable["Reaction"]:
+        routes: Dict[str, List[Subscribers]] = dict()
+        batches: Dict[Reaction, List[Event]] = dict()
+        for event_ in events:
+            topics = routes.get(event_.event_name)
+            if topics is None:
+                topics = routes[event_.event_name] = self._topics(event_.event_name)
+            for reaction in self._match(topics, event_):
+                batch = batches.get(reaction)
+                if batch is None:
+                    batch = batches[reaction] = list()
+                batch.append(event_)
+
+        for reaction, batch in batches.items():
+            try:
+                reaction.on_next_batch(batch)
+            except Exception as e:
+                logger.error(f'Reaction {reaction.id} failed handling a batch of {len(batch)} event(s). '
+                             f'Details: {e}')
+        return batches.keys()
+
+    async def _wait_for_capacity(self, reactions: Iterable["Reaction"]):
+        for reaction in reactions:
+            if reaction.over_capacity(self.high_watermark):
+                logger.debug(f'Reaction {reaction.id} over capacity, publisher suspended.')
+                await reaction.wait_for_capacity(self.low_watermark)
 
     def remove_all_reactions(self):
         """Unsubscribe all observers"""
-        NotImplementedError()
+        for reaction in self.reactions:
+            reaction.dispose()
 
 
 class ReactionHandler(ABC):
     """
     A Reaction handler for a event.
+
+    `handle` can also be implemented as a coroutine (``async def``), the
+    Reaction then runs up to `ReactionTemplate.max_concurrency` calls of it
+    concurrently, each one in its own task.
+
+    Blocking handlers can run in a pool of threads and CPU bound handlers in
+    worker processes instead, setting the template `execution_mode` to
+    ``thread`` or ``process``, see :mod:`orchd_sdk.executors`.
     """
 
     @abstractmethod
@@ -80,6 +265,30 @@ class ReactionHandler(ABC):
         """
 
 
+class BatchReactionHandler(ReactionHandler):
+    """
+    A Reaction handler processing events in batches.
+
+    The Reaction buffers the events and calls `handle_batch` when
+    `ReactionTemplate.max_batch_size` events are buffered or
+    `ReactionTemplate.max_batch_latency` seconds passed since the first
+    one. The result is sunk as one unit. `handle_batch` can also be a
+    coroutine.
+    """
+
+    @abstractmethod
+    def handle_batch(self, events: List[Event], reaction: ReactionTemplate) -> Any:
+        """
+        Code to be executed as an reaction to a batch of events.
+
+        :param events: The events that triggered the action, in arrival order.
+        :param reaction: The reaction object.
+        """
+
+    def handle(self, event: Event, reaction: ReactionTemplate) -> Any:
+        return self.handle_batch([event], reaction)
+
+
 class ReactionState:
     UNINITIALIZED = (1, 'PROVISIONING')
     READY = (2, 'READY')
@@ -90,44 +299,174 @@ class ReactionState:
 
 
 class ReactionSinkManager:
+    """
+    Creates, runs and closes the Sinks of a Reaction.
+
+    Writes go through one :class:`orchd_sdk.sink.SinkDispatcher` per Sink,
+    limiting the writes in flight to the template `max_in_flight` and
+    keeping track of them, so they can be drained before closing.
+
+    Sinks are opened and closed concurrently, each within the timeouts of
+    its template. When a Sink fails to open, the ones created with it are
+    closed, concurrently too.
+
+    Sinks whose template `execution_mode` is ``thread`` get their own
+    :class:`orchd_sdk.executors.ThreadPool`, their blocking `sink`, `open`
+    and `close` methods are run there.
+
+    Sinks of `shared` templates are taken from the
+    :class:`orchd_sdk.sink.SinkRegistry`, every Reaction using them holds a
+    reference and writes through its own dispatcher, into the thread pool
+    of the registry for blocking Sinks, so `max_workers` bounds the calls of
+    all the Reactions. The last Reaction releasing the Sink closes it and
+    its pool.
+    """
+
+    DRAIN_TIMEOUT = 10.0
+    """Default seconds to wait for pending writes when closing Sinks."""
 
     def __init__(self, reaction):
         self._sinks: Dict[str, AbstractSink] = dict()
+        self._pools: Dict[str, ThreadPool] = dict()
+        self._dispatchers: Dict[str, SinkDispatcher] = dict()
         self.reaction: Reaction = reaction
+        self.registry: SinkRegistry = global_sink_registry
 
     @property
     def sinks(self) -> List[AbstractSink]:
         return list(self._sinks.values())
 
+    def sinks_info(self) -> List[Sink]:
+        """Info of the Sinks, including the metrics of their thread pools."""
+        info = list()
+        for sink in self._sinks.values():
+            pool = self._pools.get(sink.id)
+            info.append(sink.info.model_copy(update={
+                'executor': pool.info() if pool else None,
+                'dispatch': self._dispatchers[sink.id].info(),
+                'references': self.registry.references(sink)
+            }))
+        return info
+
     def add_sink(self, sink_template: SinkTemplate):
+        if not sink_template.shared:
+            sink = self.instantiate(sink_template)
+        else:
+            sink = self.registry.acquire(sink_template, self.instantiate)
+            if sink.id in self._sinks:
+                self.registry.release(sink)
+                raise SinkError(f'Shared Sink template {sink_template.id} is used twice by the same Reaction.')
+
+        try:
+            dispatcher = SinkDispatcher(
+                sink, sink_template.max_in_flight,
+                write=partial(self.write, sink), on_done=self.reaction.in_flight.done,
+                retry=sink_template.retry
+            )
+            create_pool = partial(self.create_pool, sink, sink_template)
+            pool = self.registry.pool(sink, create_pool) if self.registry.is_shared(sink) else create_pool()
+        except SinkError:
+            if self.registry.is_shared(sink):
+                self.registry.release(sink)
+            raise
+        if pool is not None:
+            self._pools[sink.id] = pool
+        self._dispatchers[sink.id] = dispatcher
+        self._sinks[sink.id] = sink
+        return sink
+
+    @staticmethod
+    def instantiate(sink_template: SinkTemplate) -> AbstractSink:
+        """Creates a Sink of the class named in the template."""
         try:
             SinkClass = import_class(sink_template.sink_class)
-            sink: AbstractSink = SinkClass(sink_template)
-            self._sinks[sink.id] = sink
-            return sink
-        except ModuleNotFoundError as e:
+            return SinkClass(sink_template)
+        except ClassResolver.ERRORS as e:
             raise SinkError(f'Not able to load Sink class {sink_template.sink_class}. '
                             f'Is it in PYTHONPATH?') from e
 
+    @staticmethod
+    def create_pool(sink: AbstractSink, sink_template: SinkTemplate) -> Union[ThreadPool, None]:
+        """Creates the thread pool for the template execution mode, None for inline Sinks."""
+        mode = sink_template.execution_mode
+        if mode == ExecutionMode.INLINE:
+            return None
+        if mode != ExecutionMode.THREAD:
+            raise SinkError(f'Sinks do not support the execution mode {mode!r}, use '
+                            f'{ExecutionMode.INLINE!r} or {ExecutionMode.THREAD!r}.')
+        if asyncio.iscoroutinefunction(sink.sink):
+            raise SinkError(f'Sink class {sink_template.sink_class} must implement a blocking `sink` '
+                            f'method to run in the {mode!r} execution mode.')
+        return ThreadPool(f'orchd-sink-{sink_template.name}', sink_template.max_workers)
+
+    def write(self, sink: AbstractSink, data: Any) -> Awaitable:
+        """Awaitable sinking the data, in the Sink thread pool if it has one."""
+        pool = self._pools.get(sink.id)
+        if pool is None:
+            return sink.sink(data)
+        return pool.run(sink.sink, data)
+
+    def dispatch(self, data: Any):
+        """Schedules the data to be sunk by every Sink."""
+        self.reaction.in_flight.started(len(self._dispatchers))
+        for dispatcher in self._dispatchers.values():
+            dispatcher.dispatch(data)
+
+    async def drain(self, timeout: float = DRAIN_TIMEOUT) -> bool:
+        """
+        Waits for the pending writes of all Sinks, cancelling what is left
+        when the timeout expires.
+
+        :return: False if writes had to be cancelled.
+        """
+        dispatchers = list(self._dispatchers.values())
+        drained = all(await asyncio.gather(*(d.drain(timeout) for d in dispatchers)))
+        if not drained:
+            cancelled = sum(d.cancel() for d in dispatchers)
+            logger.warning(f'Reaction {self.reaction.id}: {cancelled} Sink write(s) cancelled '
+                           f'after {timeout}s waiting to drain.')
+        return drained
+
     async def create_sinks(self, sink_templates: List[SinkTemplate]) -> Dict[str, AbstractSink]:
-        for template in sink_templates:
-            try:
-                self.add_sink(template)
-            except SinkError as e:
-                for sink in self.sinks:
-                    await sink.close()
-                    del self._sinks[sink.id]
-                raise e
+        """Creates and opens the Sinks, closing all of them if one fails."""
+        created = list()
+        try:
+            for template in sink_templates:
+                created.append(self.add_sink(template))
+            await self.open_sinks(created)
+        except SinkError:
+            await self._close_sinks(created)
+            raise
 
         return self._sinks
 
+    async def open_sinks(self, sinks: List[AbstractSink]):
+        """
+        Opens the Sinks concurrently, waiting up to the template `open_timeout`
+        of each one.
+
+        :raises SinkError: if a Sink fails or times out opening.
+        """
+        results = await asyncio.gather(*(self._open_sink(sink) for sink in sinks), return_exceptions=True)
+        failures = [(sink, result) for sink, result in zip(sinks, results) if isinstance(result, BaseException)]
+        for sink, error in failures:
+            logger.error(f'Sink {sink.id} ({sink.info.template.sink_class}) failed to open. Details: {error!r}')
+        if failures:
+            raise SinkError(f'{len(failures)} of {len(sinks)} Sink(s) failed to open.') from failures[0][1]
+
+    async def _open_sink(self, sink: AbstractSink):
+        if self.registry.is_shared(sink):
+            opening = self.registry.open(sink, partial(self._run_blocking, sink, sink.open))
+        else:
+            opening = self._run_blocking(sink, sink.open)
+        await asyncio.wait_for(opening, sink.info.template.open_timeout)
+
     async def remove_sink(self, sink_id):
         try:
-            sink = self._sinks[sink_id]
-            await sink.close()
-            del self._sinks[sink_id]
+            sink = self._sinks.pop(sink_id)
         except KeyError as e:
             raise SinkError(f'Sink with given ID{sink_id} not Found!') from e
+        await self._close_sink(sink)
 
     def get_sink_by_id(self, sink_id):
         try:
@@ -135,10 +474,56 @@ class ReactionSinkManager:
         except KeyError as e:
             raise SinkError(f'Sink with given ID({sink_id}) Not Found!') from e
 
-    async def close(self):
-        for sink in self._sinks.values():
-            await sink.close()
-        self._sinks = dict()
+    def _run_blocking(self, sink: AbstractSink, method: Callable[[], Any]) -> Awaitable:
+        """Awaitable running the `open` or `close` method, in the Sink thread pool if it is blocking."""
+        pool = self._pools.get(sink.id)
+        if pool is None or asyncio.iscoroutinefunction(method):
+            return method()
+        return pool.run(method)
+
+    async def _close_sink(self, sink: AbstractSink, timeout: float = DRAIN_TIMEOUT):
+        """
+        Drains the Sink writes, up to `timeout` seconds, and closes it within
+        its `close_timeout`. Shared Sinks are only closed by their last user.
+        """
+        dispatcher = self._dispatchers.pop(sink.id, None)
+        if dispatcher is not None and not await dispatcher.drain(timeout):
+            dispatcher.cancel()
+        last_user = not self.registry.is_shared(sink) or self.registry.release(sink)
+        try:
+            if last_user:
+                await asyncio.wait_for(self._run_blocking(sink, sink.close), sink.info.template.close_timeout)
+        finally:
+            pool = self._pools.pop(sink.id, None)
+            if pool is not None and last_user:
+                await pool.close()
+
+    async def _close_sinks(self, sinks: List[AbstractSink], timeout: float = DRAIN_TIMEOUT):
+        """Removes and closes the Sinks concurrently, logging the ones failing to close."""
+        for sink in sinks:
+            self._sinks.pop(sink.id, None)
+        results = await asyncio.gather(*(self._close_sink(sink, timeout) for sink in sinks),
+                                       return_exceptions=True)
+        for sink, result in zip(sinks, results):
+            if isinstance(result, BaseException):
+                logger.error(f'Sink {sink.id} ({sink.info.template.sink_class}) failed to close. '
+                             f'Details: {result!r}')
+
+    async def close(self, timeout: float = DRAIN_TIMEOUT):
+        """Drains the pending writes, up to the timeout, and closes the Sinks concurrently."""
+        await self.drain(timeout)
+        await self._close_sinks(self.sinks, timeout)
+
+
+class ReactionParts(NamedTuple):
+    """The parts of a Reaction built from its template, replaced together when it is reconfigured."""
+    handler: ReactionHandler
+    runner: Union[ThreadHandlerRunner, ProcessHandlerRunner, None]
+    sink_manager: ReactionSinkManager
+    cache: Union[ResultCache, None]
+    concurrency: asyncio.Semaphore
+    batching: bool
+    async_handler: bool
 
 
 class Reaction(Observer):
@@ -147,8 +532,33 @@ class Reaction(Observer):
 
     This class instantiates the reaction handler and subscribes the Reaction
     to the events that triggers it.
+
+    By default events are handled inline, on the publisher call. When the
+    template sets an `inbox_size` the Reaction queues events in a
+    :class:`orchd_sdk.flow.BoundedQueue` drained by its own task, so a slow
+    Reaction does not add latency to the others, and the template inbox
+    overflow policy decides what happens when the inbox is full.
+
+    When the template sets a `partition_key` the inbox is replaced by
+    `partitions` lanes. Events are assigned to a lane by the hash of their
+    key and each lane handles its events one at a time, in order, so events
+    with the same key are never handled concurrently nor out of order,
+    while events of different lanes are. Sink writes keep the lane order
+    only when the Sinks `max_in_flight` is 1.
+
+    Templates setting `cache_max_entries` or `cache_max_bytes` memoize the
+    handler results in a :class:`orchd_sdk.cache.ResultCache`, events with
+    the same name and data as a cached one skip the handler and have the
+    cached result sunk.
     """
 
+    LANE_SIZE = 1024
+    """Capacity of each partition lane when the template sets no `inbox_size`."""
+
+    QUEUE_SETTINGS = ('inbox_size', 'inbox_overflow_policy', 'inbox_overflow_key',
+                      'partition_key', 'partitions')
+    """Template settings shaping the inbox and lanes, fixed once the Reaction is initialized."""
+
     def __init__(self, reaction_template: ReactionTemplate):
         super().__init__()
         self.state: Tuple = ReactionState.UNINITIALIZED
@@ -158,21 +568,126 @@ class Reaction(Observer):
         self.reaction_template: ReactionTemplate = reaction_template
         self._loop: AbstractEventLoop = asyncio.get_event_loop()
         self.sink_manager = ReactionSinkManager(self)
+        self.in_flight = InFlightCounter()
+        self._inbox: Union[BoundedQueue, None] = None
+        self._lanes: List[BoundedQueue] = list()
+        self._partition_key: Union[Callable[[Event], Any], None] = None
+        self._drainers: List[Task] = list()
+        self._cache: Union[ResultCache, None] = None
+        self._event_bus: Union[ReactionsEventBus, None] = None
+        self._async_handler = False
+        self._runner: Union[ThreadHandlerRunner, ProcessHandlerRunner, None] = None
+        self._concurrency: Union[asyncio.Semaphore, None] = None
+        self._tasks: Set[Task] = set()
+        self._batching = False
+        self._batch: List[Event] = list()
+        self._batch_timer: Union[TimerHandle, None] = None
 
     async def init(self):
         try:
-            self.handler = self.create_handler_object()
-            await self.sink_manager.create_sinks(self.reaction_template.sinks)
-        except SinkError as e:
+            self._lanes = self.create_lanes()
+            self._inbox = None if self._lanes else self.create_inbox()
+        except InvalidInputError as e:
             self.state = ReactionState.ERROR
-            raise ReactionError("While creating reaction, an error occurred preparing Sinks.") from e
-        except ReactionHandlerError as e:
+            raise ReactionError("While creating reaction, the reaction template has invalid settings.") from e
+        try:
+            parts = await self.build(self.reaction_template, self.sink_manager)
+        except ReactionError:
             self.state = ReactionState.ERROR
-            raise ReactionError("While creating reaction, an error occurred preparing Reaction Handlers.") from e
+            raise
+        self._install(self.reaction_template, parts)
 
         self.state = ReactionState.READY
         return self
 
+    async def build(self, reaction_template: ReactionTemplate,
+                    sink_manager: ReactionSinkManager) -> ReactionParts:
+        """
+        Creates the handler, runner, Sinks and cache described in the
+        template, without installing them in the Reaction.
+        """
+        try:
+            handler = self.load_handler(reaction_template)
+            if reaction_template.max_concurrency < 1:
+                raise InvalidInputError('max_concurrency must be at least 1.')
+            if reaction_template.max_batch_size < 1 or reaction_template.max_batch_latency <= 0:
+                raise InvalidInputError('max_batch_size and max_batch_latency must be positive.')
+            batching = isinstance(handler, BatchReactionHandler)
+            if batching and reaction_template.partition_key is not None:
+                raise InvalidInputError('Batch handlers can not be partitioned.')
+            cache = self.create_cache(reaction_template, handler)
+            await sink_manager.create_sinks(reaction_template.sinks)
+            try:
+                runner = await self.create_runner(reaction_template, handler)
+            except Exception:
+                await sink_manager.close()
+                raise
+        except InvalidInputError as e:
+            raise ReactionError("While creating reaction, the reaction template has invalid settings.") from e
+        except SinkError as e:
+            raise ReactionError("While creating reaction, an error occurred preparing Sinks.") from e
+        except ReactionHandlerError as e:
+            raise ReactionError("While creating reaction, an error occurred preparing Reaction Handlers.") from e
+
+        handle = handler.handle_batch if batching else handler.handle
+        return ReactionParts(
+            handler=handler, runner=runner, sink_manager=sink_manager, cache=cache,
+            concurrency=asyncio.Semaphore(reaction_template.max_concurrency), batching=batching,
+            async_handler=runner is not None or asyncio.iscoroutinefunction(handle)
+        )
+
+    def _install(self, reaction_template: ReactionTemplate, parts: ReactionParts):
+        self.reaction_template = reaction_template
+        self.handler = parts.handler
+        self._runner = parts.runner
+        self.sink_manager = parts.sink_manager
+        self._cache = parts.cache
+        self._concurrency = parts.concurrency
+        self._batching = parts.batching
+        self._async_handler = parts.async_handler
+
+    async def reconfigure(self, reaction_template: ReactionTemplate,
+                          timeout: float = ReactionSinkManager.DRAIN_TIMEOUT):
+        """
+        Replaces the handler and Sinks of the Reaction by the ones described
+        in the given template, without stopping it.
+
+        The new handler, runner and Sinks are built while events keep being
+        handled by the current ones, then they are switched in between two
+        events, together with the bus subscription. Handler calls running at
+        the switch finish on the previous handler and their results are sunk
+        by the new Sinks. The previous runner is closed and the previous
+        Sinks drained and closed afterwards, waiting up to `timeout` seconds.
+
+        The Reaction keeps its current handler and Sinks if building the new
+        ones fails. The inbox and partition settings can not be changed.
+        """
+        if self.state not in (ReactionState.READY, ReactionState.RUNNING):
+            raise ReactionError(f'Reaction {self.id} must be initialized to be reconfigured.')
+        changed = [name for name in self.QUEUE_SETTINGS
+                   if getattr(reaction_template, name) != getattr(self.reaction_template, name)]
+        if changed:
+            raise ReactionError(f'Reaction {self.id} can not change {", ".join(changed)} when reconfigured.')
+        ReactionsEventBus.subscription(reaction_template)
+        parts = await self.build(reaction_template, ReactionSinkManager(self))
+
+        # No awaits until the switch is done, events are handled either by the previous parts or the new ones.
+        self.flush()
+        previous_runner, previous_sink_manager = self._runner, self.sink_manager
+        previous_tasks = set(self._tasks)
+        self._install(reaction_template, parts)
+        if self.state == ReactionState.RUNNING:
+            self._event_bus.register_reaction(self)
+        logger.info(f'Reaction {self.id} reconfigured with template {reaction_template.id}.')
+
+        if previous_tasks:
+            _, pending = await asyncio.wait(previous_tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        if previous_runner is not None:
+            await previous_runner.close()
+        await previous_sink_manager.close(timeout)
+
     @property
     def sinks(self) -> List[AbstractSink]:
         return list(self.sink_manager.sinks)
@@ -182,55 +697,363 @@ class Reaction(Observer):
             id=self.id,
             state=self.state[1],
             template=self.reaction_template,
-            sinks_instances=[s.info for s in self.sink_manager.sinks]
+            sinks_instances=self.sink_manager.sinks_info(),
+            inbox_depth=sum(queue.qsize() for queue in self._queues()),
+            events_dropped=sum(queue.dropped for queue in self._queues()),
+            executor=self._runner.info() if self._runner else None,
+            lane_depths=[lane.qsize() for lane in self._lanes],
+            cache=self._cache.info() if self._cache else None
         )
 
     def create_handler_object(self) -> ReactionHandler:
         """Instantiate a :class:`ReactionHandler` indicated
         in the reaction template."""
-        class_parts = self.reaction_template.handler.split('.')
-        class_name = class_parts.pop()
-        module_name = '.'.join(class_parts)
+        self.handler = self.load_handler(self.reaction_template)
+        return self.handler
 
+    @staticmethod
+    def load_handler(reaction_template: ReactionTemplate) -> ReactionHandler:
+        """Instantiate the :class:`ReactionHandler` indicated in the given template."""
         try:
-            if module_name not in sys.modules:
-                importlib.import_module(module_name)
-            HandlerClass = getattr(sys.modules.get(module_name), class_name)
-            self.handler = HandlerClass()
-            return self.handler
-        except (ModuleNotFoundError, AttributeError) as e:
+            HandlerClass = import_class(reaction_template.handler)
+            return HandlerClass()
+        except ClassResolver.ERRORS as e:
             raise ReactionHandlerError(f'Reaction Handler module/class '
-                                       f'{self.reaction_template.handler} not found!') from e
+                                       f'{reaction_template.handler} not found!') from e
+
+    @staticmethod
+    async def create_runner(reaction_template: ReactionTemplate, handler: ReactionHandler) \
+            -> Union[ThreadHandlerRunner, ProcessHandlerRunner, None]:
+        """
+        Creates and starts the runner for the template execution mode,
+        None when the handler runs inline.
+        """
+        mode = reaction_template.execution_mode
+        if mode == ExecutionMode.INLINE:
+            return None
+        if mode not in ExecutionMode.ALL:
+            raise InvalidInputError(f'Unknown execution mode {mode!r}, expected one of '
+                                    f'{", ".join(ExecutionMode.ALL)}.')
+        if asyncio.iscoroutinefunction(handler.handle) or \
+                asyncio.iscoroutinefunction(getattr(handler, 'handle_batch', None)):
+            raise InvalidInputError('Coroutine handlers can only run inline.')
+
+        if mode == ExecutionMode.THREAD:
+            runner = ThreadHandlerRunner(reaction_template, handler)
+        else:
+            runner = ProcessHandlerRunner(reaction_template)
+        try:
+            await runner.start()
+        except Exception as e:
+            await runner.close()
+            raise ReactionHandlerError(f'Not able to start workers for handler '
+                                       f'{reaction_template.handler}.') from e
+        return runner
+
+    def create_inbox(self) -> Union[BoundedQueue, None]:
+        """Creates the inbox described in the reaction template, if any."""
+        template = self.reaction_template
+        if not template.inbox_size:
+            return None
+        key = field_getter(template.inbox_overflow_key) if template.inbox_overflow_key else None
+        return BoundedQueue(template.inbox_size, template.inbox_overflow_policy, key)
+
+    def create_lanes(self) -> List[BoundedQueue]:
+        """
+        Creates the partition lanes described in the reaction template, if
+        any. Lanes follow the template inbox settings.
+        """
+        template = self.reaction_template
+        if template.partition_key is None:
+            return list()
+        if template.partitions < 1:
+            raise InvalidInputError('partitions must be at least 1.')
+        self._partition_key = field_getter(template.partition_key)
+        key = field_getter(template.inbox_overflow_key) if template.inbox_overflow_key else None
+        return [BoundedQueue(template.inbox_size or self.LANE_SIZE, template.inbox_overflow_policy, key)
+                for _ in range(template.partitions)]
+
+    @staticmethod
+    def create_cache(template: ReactionTemplate, handler: ReactionHandler) -> Union[ResultCache, None]:
+        """Creates the result cache described in the template, if any."""
+        if not template.cache_max_entries and not template.cache_max_bytes:
+            return None
+        if isinstance(handler, BatchReactionHandler):
+            raise InvalidInputError('Batch handler results can not be cached.')
+        return ResultCache(template.cache_max_entries, template.cache_max_bytes, template.cache_ttl)
+
+    def lane_of(self, event: Event) -> BoundedQueue:
+        """The partition lane of the event, given by the hash of its partition key."""
+        key = self._partition_key(event)
+        try:
+            digest = hash(key)
+        except TypeError:
+            digest = hash(repr(key))
+        return self._lanes[digest % len(self._lanes)]
+
+    def _queues(self) -> List[BoundedQueue]:
+        if self._lanes:
+            return self._lanes
+        return [self._inbox] if self._inbox is not None else list()
 
     def on_next(self, event: Event) -> None:
-        if event.event_name in self.reaction_template.triggered_on or \
-                '' in self.reaction_template.triggered_on:
-            self.sink(self.handler.handle(event, self.reaction_template))
+        """
+        Handles the event and sinks the result, or queues it in the inbox.
+
+        Events are routed by the :class:`ReactionsEventBus`, which only
+        delivers the events the Reaction is triggered on.
+        """
+        if self._lanes:
+            self.in_flight.started(1 - self.lane_of(event).put_nowait(event))
+        elif self._inbox is None:
+            self.process(event)
+        else:
+            self.in_flight.started(1 - self._inbox.put_nowait(event))
+
+    def process(self, event: Event):
+        """
+        Calls the handler for the event and sinks the result.
+
+        Coroutine handlers are run in a task, waiting for one of the
+        `max_concurrency` slots of the Reaction. Events for a
+        :class:`BatchReactionHandler` are buffered until the batch is full
+        or `max_batch_latency` seconds passed since the first one.
+        """
+        key, hit, result = self._cached(event)
+        if hit:
+            self.sink(result)
+        elif self._batching:
+            self._buffer(event)
+        elif self._async_handler:
+            self.in_flight.started()
+            self._spawn(self._acquire_and_run(self._call_handler(event, key), 1))
+        else:
+            self.sink(self._remember(key, self.handler.handle(event, self.reaction_template)))
+
+    def _cached(self, event: Event) -> Tuple[Union[bytes, None], bool, Any]:
+        """Looks the event up in the result cache: its key, whether it was found and the result."""
+        if self._cache is None:
+            return None, False, None
+        key = self._cache.key(event)
+        hit, result = self._cache.get(key)
+        return key, hit, result
+
+    def _remember(self, key: Union[bytes, None], result: Any, cache: ResultCache = None) -> Any:
+        if key is not None:
+            (cache or self._cache).put(key, result)
+        return result
+
+    def _buffer(self, event: Event):
+        self.in_flight.started()
+        self._batch.append(event)
+        if len(self._batch) >= self.reaction_template.max_batch_size:
+            self.flush()
+        elif self._batch_timer is None:
+            self._batch_timer = self._loop.call_later(self.reaction_template.max_batch_latency,
+                                                      self.flush)
+
+    def flush(self):
+        """Hands the buffered events to the batch handler and sinks the result as one unit."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if not self._batch:
+            return
+
+        events, self._batch = self._batch, list()
+        if self._async_handler:
+            self._spawn(self._acquire_and_run(self._call_batch_handler(events), len(events)))
+            return
+        try:
+            self.sink(self.handler.handle_batch(events, self.reaction_template))
+        except Exception as e:
+            logger.error(f'Reaction {self.id} failed handling {len(events)} event(s). Details: {e}')
+        finally:
+            self.in_flight.done(len(events))
+
+    def _call_handler(self, event: Event, key: Union[bytes, None] = None) -> Coroutine:
+        """
+        The handler call for the event. Handler, runner and cache are bound
+        when the call is created, so it is not affected by a reconfiguration.
+        """
+        return self._handle(event, key, self.reaction_template, self.handler, self._runner, self._cache)
+
+    def _call_batch_handler(self, events: List[Event]) -> Coroutine:
+        return self._handle_batch(events, self.reaction_template, self.handler, self._runner)
+
+    async def _handle(self, event, key, reaction_template, handler, runner, cache) -> Any:
+        if runner is None:
+            result = await handler.handle(event, reaction_template)
+        else:
+            result = await runner.handle(event)
+        return self._remember(key, result, cache)
+
+    @staticmethod
+    async def _handle_batch(events, reaction_template, handler, runner) -> Any:
+        if runner is None:
+            return await handler.handle_batch(events, reaction_template)
+        return await runner.handle_batch(events)
+
+    async def _acquire_and_run(self, call: Coroutine, units: int):
+        concurrency = self._concurrency
+        try:
+            await concurrency.acquire()
+        except asyncio.CancelledError:
+            call.close()
+            self.in_flight.done(units)
+            raise
+        await self._run_acquired(call, units, concurrency)
+
+    async def _run_acquired(self, call: Coroutine, units: int, concurrency: asyncio.Semaphore):
+        """Awaits the handler call holding a concurrency slot and releases it afterwards."""
+        try:
+            self.sink(await call)
+        except Exception as e:
+            logger.error(f'Reaction {self.id} failed handling {units} event(s). Details: {e}')
+        finally:
+            concurrency.release()
+            self.in_flight.done(units)
+
+    def _spawn(self, coro) -> Task:
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def on_next_batch(self, events: List[Event]) -> None:
+        """
+        Handles a batch of events published with
+        :meth:`ReactionsEventBus.publish_many`.
+
+        The default implementation handles the events one by one, logging
+        the ones failing, so they do not keep the rest of the batch from
+        being handled. Reactions able to process the whole batch at once can
+        override it.
+        """
+        for event in events:
+            try:
+                self.on_next(event)
+            except Exception as e:
+                logger.error(f'Reaction {self.id} failed handling event {event.id}. Details: {e}')
 
     def sink(self, data):
-        for sink in self.sink_manager.sinks:
-            logger.info(f"Sink {sink.id} scheduled to be executed.")
-            self._loop.create_task(sink.sink(data))
+        """Schedules the data to be sunk by the Reaction Sinks."""
+        self.sink_manager.dispatch(data)
+
+    def over_capacity(self, high_watermark: int) -> bool:
+        """
+        Whether publishers should wait before giving more events to the
+        Reaction: its in-flight work reached `high_watermark` or its inbox,
+        or one of its lanes, is full under the `block` overflow policy.
+        """
+        return self.in_flight.count >= high_watermark or \
+            any(queue.policy == OverflowPolicy.BLOCK and queue.full() for queue in self._queues())
+
+    async def wait_for_capacity(self, low_watermark: int):
+        """Waits until the in-flight work is down to `low_watermark` and the inbox and lanes have room."""
+        await self.in_flight.wait_below(low_watermark)
+        for queue in self._queues():
+            if queue.policy == OverflowPolicy.BLOCK:
+                await queue.wait_not_full()
+
+    async def _drain_inbox(self):
+        while True:
+            event = await self._inbox.get()
+            if self._async_handler and not self._batching:
+                key, hit, result = self._cached(event)
+                if hit:
+                    self.sink(result)
+                    self.in_flight.done()
+                    continue
+                concurrency = self._concurrency
+                try:
+                    await concurrency.acquire()
+                except asyncio.CancelledError:
+                    self.in_flight.done()
+                    raise
+                self._spawn(self._run_acquired(self._call_handler(event, key), 1, concurrency))
+                continue
+            try:
+                self.process(event)
+            except Exception as e:
+                logger.error(f'Reaction {self.id} failed handling event {event.id}. Details: {e}')
+            finally:
+                self.in_flight.done()
+            await asyncio.sleep(0)
+
+    async def _drain_lane(self, lane: BoundedQueue):
+        """Handles the events of a lane one at a time, awaiting the handler before the next one."""
+        while True:
+            event = await lane.get()
+            try:
+                key, hit, result = self._cached(event)
+                if not hit and self._async_handler:
+                    result = await self._call_handler(event, key)
+                elif not hit:
+                    result = self._remember(key, self.handler.handle(event, self.reaction_template))
+                self.sink(result)
+            except Exception as e:
+                logger.error(f'Reaction {self.id} failed handling event {event.id}. Details: {e}')
+            finally:
+                self.in_flight.done()
+            await asyncio.sleep(0)
 
     def activate(self, event_bus: ReactionsEventBus):
         event_bus.register_reaction(self)
+        self._event_bus = event_bus
+        if not self._drainers:
+            if self._lanes:
+                self._drainers = [self._loop.create_task(self._drain_lane(lane)) for lane in self._lanes]
+            elif self._inbox is not None:
+                self._drainers = [self._loop.create_task(self._drain_inbox())]
         logger.debug(f'Reaction for template {self.reaction_template.id} '
                      f'Activated. ID({self.id}).')
         self.state = ReactionState.RUNNING
 
     def dispose(self) -> None:
+        """
+        Unsubscribes the Reaction and stops draining its inbox and lanes. The
+        queued events are discarded, releasing the publishers waiting for the
+        Reaction to have capacity.
+        """
         self.disposable.dispose()
         super().dispose()
         self.disposable = None
+        for drainer in self._drainers:
+            drainer.cancel()
+        self._drainers = list()
+        self._discard_queued()
         self.state = ReactionState.STOPPED
 
+    def _discard_queued(self):
+        for queue in self._queues():
+            self.in_flight.done(queue.clear())
+
     async def stop(self):
         self.dispose()
 
-    async def close(self):
+    async def close(self, timeout: float = ReactionSinkManager.DRAIN_TIMEOUT):
+        """
+        Stops the Reaction and releases its resources.
+
+        Running handler calls and pending Sink writes are waited for, up to
+        `timeout` seconds each, and cancelled afterwards.
+        """
         if self.state == ReactionState.RUNNING:
             self.dispose()
-        await self.sink_manager.close()
+        self._discard_queued()
+        self.flush()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f'Reaction {self.id}: {len(pending)} handler call(s) cancelled '
+                               f'after {timeout}s waiting to finish.')
+        if self._runner is not None:
+            await self._runner.close()
+            self._runner = None
+        await self.sink_manager.close(timeout)
         self.state = ReactionState.FINALIZED
 
 
@@ -0,0 +1,278 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import operator
+
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Tuple, Union
+
+from orchd_sdk.common import field_getter
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.models import Event, EventFilter
+
+
+class _TrieNode:
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = dict()
+        self.values: Tuple[Any, ...] = tuple()
+
+
+class TopicTrie:
+    """
+    Prefix trie of dotted event name patterns.
+
+    Patterns are split in segments on ``.``. A ``*`` segment matches exactly
+    one segment of the event name and a ``**`` segment matches zero or more
+    segments, e.g. ``io.orchd.events.*`` matches ``io.orchd.events.Test`` and
+    ``com.acme.**`` matches every event under ``com.acme``.
+
+    Matching walks the trie segment by segment, so its cost depends on the
+    depth of the event name and not on the number of patterns stored.
+    """
+
+    SEPARATOR = '.'
+    ANY_SEGMENT = '*'
+    ANY_SEGMENTS = '**'
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def is_pattern(cls, name: str) -> bool:
+        """Whether the given name contains wildcard segments."""
+        return cls.ANY_SEGMENT in name
+
+    @classmethod
+    def split(cls, pattern: str) -> List[str]:
+        segments = pattern.split(cls.SEPARATOR)
+        for segment in segments:
+            if not segment or (cls.ANY_SEGMENT in segment
+                               and segment not in (cls.ANY_SEGMENT, cls.ANY_SEGMENTS)):
+                raise InvalidInputError(f'Invalid event name pattern {pattern!r}. Wildcards must '
+                                        f'be whole segments.')
+        return segments
+
+    def insert(self, pattern: str, value: Any):
+        """Stores the value under the given pattern."""
+        node = self._root
+        for segment in self.split(pattern):
+            node = node.children.setdefault(segment, _TrieNode())
+        if value not in node.values:
+            node.values = node.values + (value,)
+            self._size += 1
+
+    def remove(self, pattern: str, value: Any):
+        """Removes the value stored under the given pattern, pruning empty nodes."""
+        path = [self._root]
+        segments = self.split(pattern)
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+
+        node = path[-1]
+        if value not in node.values:
+            return
+        node.values = tuple(v for v in node.values if v is not value)
+        self._size -= 1
+
+        for segment, parent in zip(reversed(segments), reversed(path[:-1])):
+            child = parent.children[segment]
+            if child.values or child.children:
+                break
+            del parent.children[segment]
+
+    def match(self, name: str) -> List[Any]:
+        """Values stored under every pattern matching the given event name."""
+        if not self._size:
+            return []
+
+        segments = name.split(self.SEPARATOR)
+        depth = len(segments)
+        matched: Dict[int, Any] = dict()
+        visited = set()
+        pending = [(self._root, 0)]
+
+        while pending:
+            node, i = pending.pop()
+            if (id(node), i) in visited:
+                continue
+            visited.add((id(node), i))
+
+            many = node.children.get(self.ANY_SEGMENTS)
+            if many is not None:
+                pending.extend((many, j) for j in range(i, depth + 1))
+
+            if i == depth:
+                for value in node.values:
+                    matched.setdefault(id(value), value)
+                continue
+
+            exact = node.children.get(segments[i])
+            if exact is not None:
+                pending.append((exact, i + 1))
+            one = node.children.get(self.ANY_SEGMENT)
+            if one is not None:
+                pending.append((one, i + 1))
+
+        return list(matched.values())
+
+
+Predicate = Callable[[Event], bool]
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda field_value, value: field_value in value,
+}
+"""Operators available to :class:`orchd_sdk.models.EventFilter`."""
+
+
+class CompiledFilters(NamedTuple):
+    """
+    Filters compiled once for routing.
+
+    `index_field` and `index_value` come from the first equality filter with
+    a hashable value and are used for hash lookups, `predicate` checks all
+    the other filters and is None when there are none.
+    """
+    index_field: Union[str, None] = None
+    index_value: Hashable = None
+    predicate: Union[Predicate, None] = None
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def _compile_filter(filter_: EventFilter) -> Predicate:
+    try:
+        compare = OPERATORS[filter_.operator]
+    except KeyError as e:
+        raise InvalidInputError(f'Unknown filter operator {filter_.operator!r}, expected one of '
+                                f'{", ".join(OPERATORS)}.') from e
+    get = field_getter(filter_.field)
+    value = filter_.value
+
+    def predicate(event: Event) -> bool:
+        try:
+            return bool(compare(get(event), value))
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def compile_filters(filters: List[EventFilter]) -> CompiledFilters:
+    """Compiles the filters of a Reaction Template, all of them must hold for an event to match."""
+    index_field, index_value = None, None
+    predicates = list()
+    for filter_ in filters:
+        if index_field is None and filter_.operator == '==' and _is_hashable(filter_.value):
+            index_field, index_value = filter_.field, filter_.value
+        else:
+            predicates.append(_compile_filter(filter_))
+
+    if not predicates:
+        predicate = None
+    elif len(predicates) == 1:
+        predicate = predicates[0]
+    else:
+        def predicate(event: Event) -> bool:
+            return all(p(event) for p in predicates)
+
+    return CompiledFilters(index_field, index_value, predicate)
+
+
+class Subscribers:
+    """
+    Subscribers of one event name or pattern, indexed by their filters.
+
+    Subscribers without filters always match. Subscribers with an equality
+    filter are kept in hash maps by field and value, so only the ones whose
+    value is found in the event are checked further. The remaining ones have
+    their predicates evaluated one by one.
+    """
+
+    def __init__(self):
+        self._unconditional: Tuple[Any, ...] = tuple()
+        self._conditional: Tuple[Tuple[Any, Predicate], ...] = tuple()
+        self._indexed: Dict[str, Tuple[Callable[[Event], Any],
+                                       Dict[Hashable, Tuple[Tuple[Any, Predicate], ...]]]] = dict()
+        self._filters: Dict[int, CompiledFilters] = dict()
+
+    def __len__(self):
+        return len(self._filters)
+
+    def add(self, subscriber: Any, filters: CompiledFilters = CompiledFilters()):
+        self._filters[id(subscriber)] = filters
+        if filters.index_field is not None:
+            _, index = self._indexed.setdefault(filters.index_field,
+                                                  (field_getter(filters.index_field), dict()))
+            index[filters.index_value] = index.get(filters.index_value, tuple()) + \
+                ((subscriber, filters.predicate),)
+        elif filters.predicate is not None:
+            self._conditional = self._conditional + ((subscriber, filters.predicate),)
+        else:
+            self._unconditional = self._unconditional + (subscriber,)
+
+    def remove(self, subscriber: Any):
+        filters = self._filters.pop(id(subscriber), None)
+        if filters is None:
+            return
+
+        if filters.index_field is not None:
+            _, index = self._indexed[filters.index_field]
+            remaining = tuple(e for e in index[filters.index_value] if e[0] is not subscriber)
+            if remaining:
+                index[filters.index_value] = remaining
+            else:
+                del index[filters.index_value]
+                if not index:
+                    del self._indexed[filters.index_field]
+        elif filters.predicate is not None:
+            self._conditional = tuple(e for e in self._conditional if e[0] is not subscriber)
+        else:
+            self._unconditional = tuple(s for s in self._unconditional if s is not subscriber)
+
+    def match(self, event: Event) -> Tuple[Any, ...]:
+        """Subscribers whose filters hold for the event."""
+        if not self._indexed and not self._conditional:
+            return self._unconditional
+
+        matched = list(self._unconditional)
+        for get, index in self._indexed.values():
+            try:
+                entries = index.get(get(event), ())
+            except TypeError:
+                continue
+            matched.extend(s for s, predicate in entries if predicate is None or predicate(event))
+        matched.extend(s for s, predicate in self._conditional if predicate(event))
+        return tuple(matched)
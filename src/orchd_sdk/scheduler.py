@@ -0,0 +1,264 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import asyncio
+import logging
+from asyncio import Task
+from typing import Any, Awaitable, Callable, Dict, List, Union
+
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.models import ScheduleInfo
+
+logger = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio, successive multiples of it spread
+# evenly over [0, 1) however many phases are taken.
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+class Timer:
+    """An item due at the `expires` tick of a :class:`TimerWheel`."""
+    __slots__ = ('expires', 'item', 'cancelled')
+
+    def __init__(self, expires: int, item: Any):
+        self.expires = expires
+        self.item = item
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel counting time in ticks.
+
+    Level 0 has one slot per tick, each level above has slots `slots` times
+    wider than the one below. Timers are placed in the lowest level their
+    delay fits, and moved down a level when the wheel turns to their slot,
+    so scheduling, cancelling and expiring a timer take constant time
+    however many timers there are. Delays longer than the wheel span wait
+    at the top level, or in level 0 for a single level wheel, and are
+    placed again until they fit.
+    """
+
+    def __init__(self, slots: int = 64, levels: int = 4):
+        if slots < 2 or levels < 1:
+            raise InvalidInputError('A timer wheel needs at least 2 slots and 1 level.')
+        self.slots = slots
+        self.levels = levels
+        self.now = 0
+        self._span = slots ** levels
+        self._wheels: List[List[List[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+
+    def schedule(self, expires: int, item: Any) -> Timer:
+        """
+        Schedules the item for the `expires` tick, ticks already passed
+        expire in the next one.
+        """
+        timer = Timer(expires, item)
+        self._place(timer)
+        return timer
+
+    def _place(self, timer: Timer):
+        target = max(timer.expires, self.now + 1)
+        delay = target - self.now
+        if delay >= self._span:
+            target = self.now + self._span - 1
+            delay = self._span - 1
+        level, width = 0, 1
+        while delay >= width * self.slots:
+            level += 1
+            width *= self.slots
+        self._wheels[level][(target // width) % self.slots].append(timer)
+
+    def tick(self) -> List[Timer]:
+        """Advances the wheel one tick, returning the timers expiring in it."""
+        self.now += 1
+        now = self.now
+        cascades = []
+        width = self.slots
+        for level in range(1, self.levels):
+            if now % width:
+                break
+            cascades.append((level, width))
+            width *= self.slots
+
+        due = []
+        for level, width in reversed(cascades):
+            slot = (now // width) % self.slots
+            timers, self._wheels[level][slot] = self._wheels[level][slot], []
+            for timer in timers:
+                if timer.cancelled:
+                    continue
+                if timer.expires <= now:
+                    due.append(timer)
+                else:
+                    self._place(timer)
+
+        slot = now % self.slots
+        timers, self._wheels[0][slot] = self._wheels[0][slot], []
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            if timer.expires <= now:
+                due.append(timer)
+            else:
+                self._place(timer)
+        return due
+
+
+class ScheduledCall:
+    """A coroutine function called every `interval` ticks by a :class:`SensorScheduler`."""
+
+    def __init__(self, key: str, call: Callable[[], Awaitable], interval: int, phase: int):
+        self.key = key
+        self.call = call
+        self.interval = interval
+        self.phase = phase
+        self.timer: Union[Timer, None] = None
+        self.task: Union[Task, None] = None
+        self.runs = 0
+        self.skipped = 0
+        self.last_lateness = 0.0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def record(self, lateness: float):
+        self.runs += 1
+        self.last_lateness = lateness
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+
+
+class SensorScheduler:
+    """
+    Calls many periodic coroutines, such as the `sense` of polling Sensors,
+    from a single timer.
+
+    Each tick of `resolution` seconds the scheduler turns a
+    :class:`TimerWheel` and starts the calls due in it, instead of every
+    Sensor sleeping on its own timer. Calls run at a fixed rate from their
+    first tick, so they do not drift, and the first tick is offset by a
+    phase taken from the golden ratio sequence, so calls sharing an
+    interval are spread over it instead of firing together.
+
+    A call still running when it is due again is skipped, as are the ticks
+    missed when the loop was too busy to keep up. How late every call
+    started is reported by `info`.
+
+    The scheduler ticks only while it has calls.
+    """
+
+    def __init__(self, resolution: float = 0.01, slots: int = 64, levels: int = 4):
+        if resolution <= 0:
+            raise InvalidInputError('Scheduler resolution must be positive.')
+        self.resolution = resolution
+        self.wheel = TimerWheel(slots, levels)
+        self._calls: Dict[str, ScheduledCall] = dict()
+        self._phase = 0.0
+        self._origin = 0.0
+        self._task: Union[Task, None] = None
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __contains__(self, key: str):
+        return key in self._calls
+
+    def add(self, key: str, call: Callable[[], Awaitable], interval: float):
+        """
+        Calls `call` every `interval` seconds, from a phase in the first interval.
+        :param key: Identifies the call, e.g. the Sensor id.
+        :param call: Coroutine function to call.
+        :param interval: Seconds between two calls, rounded to the resolution.
+        """
+        if key in self._calls:
+            raise InvalidInputError(f'A call {key} is already scheduled.')
+        if interval <= 0:
+            raise InvalidInputError('Scheduled calls need a positive interval.')
+        if not self.running:
+            self._origin = asyncio.get_running_loop().time() - self.wheel.now * self.resolution
+            self._task = asyncio.create_task(self._run())
+
+        ticks = max(round(interval / self.resolution), 1)
+        self._phase = (self._phase + GOLDEN_RATIO_FRACTION) % 1
+        scheduled = ScheduledCall(key, call, ticks, int(self._phase * ticks))
+        scheduled.timer = self.wheel.schedule(self.wheel.now + 1 + scheduled.phase, scheduled)
+        self._calls[key] = scheduled
+
+    def remove(self, key: str):
+        """Stops calling the call with the given key, cancelling it if running."""
+        scheduled = self._calls.pop(key, None)
+        if scheduled is None:
+            return
+        scheduled.timer.cancel()
+        if scheduled.task and not scheduled.task.done():
+            scheduled.task.cancel()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def info(self, key: str) -> ScheduleInfo:
+        scheduled = self._calls[key]
+        return ScheduleInfo(
+            interval=scheduled.interval * self.resolution, phase=scheduled.phase * self.resolution,
+            runs=scheduled.runs, skipped=scheduled.skipped, last_lateness=scheduled.last_lateness,
+            mean_lateness=scheduled.total_lateness / scheduled.runs if scheduled.runs else 0.0,
+            max_lateness=scheduled.max_lateness
+        )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._calls:
+            await asyncio.sleep(self._origin + (self.wheel.now + 1) * self.resolution - loop.time())
+            now = loop.time()
+            current = int((now - self._origin) / self.resolution)
+            while self.wheel.now < current:
+                for timer in self.wheel.tick():
+                    self._start(timer.item, now, current)
+
+    def _start(self, scheduled: ScheduledCall, now: float, current: int):
+        due = scheduled.timer.expires
+        lateness = now - (self._origin + due * self.resolution)
+        if scheduled.task and not scheduled.task.done():
+            scheduled.skipped += 1
+        else:
+            scheduled.record(lateness)
+            scheduled.task = asyncio.create_task(self._call(scheduled))
+
+        missed = max(current - due, 0) // scheduled.interval
+        scheduled.skipped += missed
+        scheduled.timer = self.wheel.schedule(due + (missed + 1) * scheduled.interval, scheduled)
+
+    @staticmethod
+    async def _call(scheduled: ScheduledCall):
+        try:
+            await scheduled.call()
+        except Exception as e:
+            logger.error(f'Scheduled call {scheduled.key} failed! Details: {e}')
+
+    async def close(self):
+        """Removes all the calls and stops ticking."""
+        for key in list(self._calls):
+            self.remove(key)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+global_sensor_scheduler = SensorScheduler()
@@ -13,19 +13,24 @@
 # WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
 # COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
-from typing import Union
-
 import asyncio
+import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
-from asyncio import Task, Queue
+from asyncio import Task
+from typing import Any, List, Union
 
 import logging
 
-from orchd_sdk.errors import SensorFatalError
+from orchd_sdk.common import field_getter
+from orchd_sdk.errors import InvalidInputError, SensorFatalError
+from orchd_sdk.executors import ThreadPool
+from orchd_sdk.flow import BoundedQueue
 from orchd_sdk.reaction import global_reactions_event_bus, ReactionsEventBus
+from orchd_sdk.scheduler import SensorScheduler
 
-from orchd_sdk.models import Event, SensorTemplate, Sensor
+from orchd_sdk.models import BlockingSenseInfo, Event, SensorTemplate, Sensor
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +64,29 @@ class AbstractCommunicator(ABC):
         :param event: Event to be emitted
         """
 
+    async def emit_events(self, events: List[Event]) -> Union[int, None]:
+        """
+        Emits a batch of events in the orchd agent's Reactor.
+
+        The basic implementation emits the events one by one, logging the
+        ones failing and going on with the rest, Communicators able to send
+        the whole batch at once should override it. When it raises, none of
+        the events are considered emitted.
+        :param events: Events to be emitted, in order.
+        :return: The number of events that could not be emitted, None if
+            all of them were.
+        """
+        failed = 0
+        for event in events:
+            try:
+                await self.emit_event(event)
+            except SensorFatalError:
+                raise
+            except Exception as e:
+                failed += 1
+                logger.error(f'Error while emitting event {event.id}! Details: {e}')
+        return failed
+
     @abstractmethod
     def close(self):
         """
@@ -84,6 +112,17 @@ class AbstractSensor(ABC):
 
     Sensors need to implement the logic that will detect external events
     and inject it in Orchd. To inject the event they will use the Communicator.
+
+    Sensed events wait to be emitted in `event_queue`, a
+    :class:`orchd_sdk.flow.BoundedQueue` sized by the template `queue_size`.
+    When it is full, the template `queue_overflow_policy` either blocks
+    `sense` while it awaits `event_queue.put`, or drops events, which are
+    counted as discarded.
+
+    Polling Sensors can be started with a
+    :class:`orchd_sdk.scheduler.SensorScheduler`, which calls `sense` every
+    `sensing_interval` along with the other Sensors it runs, instead of the
+    Sensor sleeping between calls on its own.
     """
 
     @abstractmethod
@@ -91,16 +130,27 @@ class AbstractSensor(ABC):
                  communicator: AbstractCommunicator,
                  sensing_interval=0):
         self.id = str(uuid.uuid4())
-        self.event_queue = Queue()
+        self.event_queue = self.create_queue(sensor_template)
         self.sensor_template = sensor_template
         self.communicator = communicator
         self.sensing_interval = sensor_template.sensing_interval or sensing_interval
+        self.emit_batch_size = sensor_template.emit_batch_size
         self._state = SensorState.READY
         self._process_events_task: Union[Task, None] = None
+        self._sense_task: Union[Task, None] = None
+        self._scheduler: Union[SensorScheduler, None] = None
         self._extra_tasks: list[Task] = list()
-        self._events_counter = -1
-        self._events_forwarded = -1
-        self._events_discarded = -1
+        self._events_forwarded = 0
+        self._events_not_emitted = 0
+
+    @staticmethod
+    def create_queue(sensor_template: SensorTemplate) -> BoundedQueue:
+        """Creates the event queue described in the sensor template."""
+        key = field_getter(sensor_template.queue_overflow_key) if sensor_template.queue_overflow_key else None
+        try:
+            return BoundedQueue(sensor_template.queue_size, sensor_template.queue_overflow_policy, key)
+        except InvalidInputError as e:
+            raise SensorError(f'Sensor template {sensor_template.id} has invalid queue settings.') from e
 
     @abstractmethod
     async def sense(self):
@@ -113,28 +163,73 @@ class AbstractSensor(ABC):
         """
 
     async def _process_events(self):
+        """
+        Emits the queued events as soon as they are available, taking all the
+        queued ones, up to `emit_batch_size`, at once.
+        """
         while self.state == SensorState.RUNNING:
+            events = []
             try:
-                event = await self.event_queue.get()
-                await self.communicator.emit_event(event)
-                await asyncio.sleep(self.sensing_interval)
+                events.append(await self.event_queue.get())
+                while len(events) < self.emit_batch_size and not self.event_queue.empty():
+                    events.append(self.event_queue.get_nowait())
+                failed = await self.communicator.emit_events(events) or 0
+                self._events_forwarded += len(events) - failed
+                self._events_not_emitted += failed
             except SensorFatalError as e:
+                self._events_not_emitted += len(events)
                 logger.critical(f'Sensor cannot continue and will be killed! Reason: {e}')
                 return
             except Exception as e:
+                self._events_not_emitted += len(events)
                 logger.error(f'Error while emitting event! Details: {e}')
+            await asyncio.sleep(0)
+
+    async def _sense_once(self) -> bool:
+        """Calls `sense`, returning False if the Sensor cannot continue."""
+        try:
+            await self.sense()
+        except SensorFatalError as e:
+            logger.critical(f'Sensor cannot continue and will be killed! Reason: {e}')
+            return False
+        except Exception as e:
+            logger.error(f'Error while sensing! Details: {e}')
+        return True
+
+    async def _sense_loop(self):
+        """Calls `sense`, waiting `sensing_interval` seconds between two calls."""
+        while self.state == SensorState.RUNNING:
+            if not await self._sense_once():
+                return
+            await asyncio.sleep(self.sensing_interval)
 
-    def start(self):
+    async def _scheduled_sense(self):
+        """Calls `sense` for the scheduler, leaving it if the Sensor cannot continue."""
+        if not await self._sense_once():
+            self._scheduler.remove(self.id)
+
+    def start(self, scheduler: SensorScheduler = None):
         """
         Prepares the sensor and starts it.
 
-        The basic implementation calls the sense method in a loop, it will
-        stop when the state of the sensor changes to SensorState.STOPPED
+        The basic implementation calls the sense method in a loop, paced by
+        the sensing interval, and emits the events it queues as they come.
+        It will stop when the state of the sensor changes to SensorState.STOPPED
 
         This is a basic implementation and can be overridden if necessary.
+        :param scheduler: Scheduler to call the sense method instead of the
+            loop, the sensing interval must then be positive.
         """
+        if scheduler is not None and self.sensing_interval <= 0:
+            raise SensorError('Only Sensors with a positive sensing interval can be scheduled.')
         self.state = SensorState.RUNNING
-        self._process_events_task = asyncio.get_event_loop().create_task(self._process_events())
+        loop = asyncio.get_event_loop()
+        self._process_events_task = loop.create_task(self._process_events())
+        if scheduler is not None:
+            self._scheduler = scheduler
+            scheduler.add(self.id, self._scheduled_sense, self.sensing_interval)
+        else:
+            self._sense_task = loop.create_task(self._sense_loop())
 
     async def stop(self):
         """
@@ -145,14 +240,22 @@ class AbstractSensor(ABC):
         self.state = SensorState.STOPPED
         if self._process_events_task:
             self._process_events_task.cancel()
+        if self._sense_task:
+            self._sense_task.cancel()
+        if self._scheduler is not None:
+            self._scheduler.remove(self.id)
         for t in self._extra_tasks:
             t.cancel()
 
     def status(self):
+        schedule = None
+        if self._scheduler is not None and self.id in self._scheduler:
+            schedule = self._scheduler.info(self.id)
         return Sensor(
             id=self.id, template=self.sensor_template, status=self._state,
-            events_count=self._events_counter, events_forwarded=self._events_forwarded,
-            events_discarded=self._events_discarded
+            events_count=self.event_queue.received, events_forwarded=self._events_forwarded,
+            events_discarded=self.event_queue.dropped + self._events_not_emitted,
+            schedule=schedule
         )
 
     @property
@@ -164,6 +267,106 @@ class AbstractSensor(ABC):
         self._state = state
 
 
+class BlockingSensor(AbstractSensor):
+    """
+    Base class for Sensors reading through blocking libraries, e.g. serial
+    ports or synchronous device clients.
+
+    Instead of `sense`, implement `sense_blocking`, which runs in a
+    :class:`orchd_sdk.executors.ThreadPool` of the template `max_threads`
+    threads owned by the Sensor, so it does not block the event loop. It can
+    return the readings, which are queued honouring the queue overflow
+    policy, or post them while it runs with `post`. Posted readings reach
+    the event loop in batches: the loop is woken up once for all the
+    readings posted until it handles them. Posted readings can not wait for
+    room in the queue, with the `block` policy they are queued beyond it.
+
+    Without a scheduler, `max_threads` sensing loops run, each calling
+    `sense_blocking` and waiting `sensing_interval` between two calls.
+    Stopping the Sensor waits for the running calls to return, blocking
+    reads should use timeouts.
+    """
+
+    def __init__(self, sensor_template: SensorTemplate, communicator: AbstractCommunicator,
+                 sensing_interval=0):
+        super().__init__(sensor_template, communicator, sensing_interval)
+        self.pool = ThreadPool(f'orchd-sensor-{sensor_template.name}', sensor_template.max_threads)
+        self.calls = 0
+        self.readings = 0
+        self.batches = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self._loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._posted: List[Event] = list()
+        self._posted_lock = threading.Lock()
+
+    @abstractmethod
+    def sense_blocking(self) -> Union[Event, List[Event], None]:
+        """
+        Reads the external source, blocking the thread it runs in.
+        :return: The readings, if not posted with `post`.
+        """
+
+    def post(self, event: Event):
+        """Queues a reading from a thread of the pool."""
+        with self._posted_lock:
+            self._posted.append(event)
+            if len(self._posted) > 1:
+                return
+        self._loop.call_soon_threadsafe(self._queue_posted)
+
+    def _queue_posted(self):
+        with self._posted_lock:
+            posted, self._posted = self._posted, list()
+        self.batches += 1
+        self.readings += len(posted)
+        for event in posted:
+            self.event_queue.put_nowait(event)
+
+    def _timed_sense_blocking(self, duration: List[float]) -> Any:
+        started_at = time.monotonic()
+        try:
+            return self.sense_blocking()
+        finally:
+            duration[0] = time.monotonic() - started_at
+
+    async def sense(self):
+        """Runs `sense_blocking` in the pool and queues the readings it returns."""
+        duration = [0.0]
+        try:
+            readings = await self.pool.run(self._timed_sense_blocking, duration)
+        finally:
+            self.calls += 1
+            self.total_duration += duration[0]
+            self.max_duration = max(self.max_duration, duration[0])
+        if readings is None:
+            return
+        for event in [readings] if isinstance(readings, Event) else readings:
+            self.readings += 1
+            await self.event_queue.put(event)
+
+    def start(self, scheduler=None):
+        self._loop = asyncio.get_event_loop()
+        super().start(scheduler)
+        if scheduler is None:
+            for _ in range(self.sensor_template.max_threads - 1):
+                self._extra_tasks.append(self._loop.create_task(self._sense_loop()))
+
+    async def stop(self):
+        await super().stop()
+        await self.pool.close()
+
+    def status(self):
+        status = super().status()
+        status.executor = self.pool.info()
+        status.blocking = BlockingSenseInfo(
+            calls=self.calls, readings=self.readings, batches=self.batches,
+            avg_duration=self.total_duration / self.calls if self.calls else 0.0,
+            max_duration=self.max_duration
+        )
+        return status
+
+
 class DummySensor(AbstractSensor):
     """
     Dummy sensor that emits io.orchd.events.system.Test events.
@@ -208,10 +411,21 @@ class LocalCommunicator(AbstractCommunicator):
 
     async def emit_event(self, event: Event):
         """
-        Emits an event using the global ReactionsEventBus
+        Emits an event using the global ReactionsEventBus, waiting while
+        the Reactions it reached are above the bus high watermark.
         :param event: Event to emit.
         """
-        self.event_bus.event(event)
+        await self.event_bus.publish(event)
+
+    async def emit_events(self, events: List[Event]):
+        """
+        Emits a batch of events using the ReactionsEventBus in a single pass,
+        waiting while the Reactions it reached are above the bus high watermark.
+        Reactions failing to handle some events do not keep the batch from
+        being emitted.
+        :param events: Events to emit.
+        """
+        await self.event_bus.publish_batch(events)
 
     async def authenticate(self):
         """
@@ -14,15 +14,23 @@
 # COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import asyncio
+import json
+import random
+import time
 import uuid
 import logging
 
-from typing import Any
 from abc import abstractmethod, ABC
+from asyncio import Task
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Set, Tuple, Union
 
 from orchd_sdk.errors import SinkError
-from orchd_sdk.common import import_class
-from orchd_sdk.models import SinkTemplate, Sink
+from orchd_sdk.common import ClassResolver, import_class
+from orchd_sdk.executors import ThreadPool
+from orchd_sdk.models import BatchingInfo, OutboxInfo, RetryPolicy, SinkTemplate, Sink, SinkDispatchInfo
+from orchd_sdk.outbox import Outbox
 
 
 logger = logging.getLogger(__name__)
@@ -49,6 +57,14 @@ class AbstractSink(ABC):
         self._template = template
         self._info = Sink(id=self.id, template=template)
 
+    async def open(self):
+        """
+        Opens the connections, files or other resources of the Sink.
+
+        Called once before the first `sink` call. The basic implementation
+        does nothing, Sinks with resources to set up should override it.
+        """
+
     @abstractmethod
     def close(self):
         pass
@@ -81,12 +97,511 @@ class DummySink(AbstractSink):
         pass
 
 
+_NOTHING = object()
+
+
+class BatchingSink(AbstractSink):
+    """
+    Base class for Sinks writing items in bulk.
+
+    Items given to `sink` are buffered and written with a single call to
+    :meth:`write_batch` once there are `max_items` of them, their estimated
+    size reaches `max_bytes` or the oldest one waited `max_delay` seconds.
+    The limits are read from the template properties, falling back to the
+    class defaults, a `max_bytes` of 0 disables the size limit.
+
+    The `sink` call filling the batch waits for it to be written, batches
+    are written one at a time and in order. Sinks overriding `close` must
+    call ``await super().close()`` to flush the buffered items.
+
+    The items of a batch whose write fails are put back at the head of the
+    buffer, to be written with the next batch, except the item of the `sink`
+    call that failed, which is left to the caller to retry. The buffer then
+    keeps at most `max_buffered` items, `MAX_BUFFERED_BATCHES` batches by
+    default, dropping the oldest ones.
+    """
+
+    MAX_ITEMS = 100
+    MAX_BYTES = 0
+    MAX_DELAY = 1.0
+    MAX_BUFFERED_BATCHES = 10
+
+    def __init__(self, template: SinkTemplate):
+        super().__init__(template)
+        properties = template.properties or dict()
+        self.max_items: int = properties.get('max_items', self.MAX_ITEMS)
+        self.max_bytes: int = properties.get('max_bytes', self.MAX_BYTES)
+        self.max_delay: float = properties.get('max_delay', self.MAX_DELAY)
+        self.max_buffered: int = properties.get('max_buffered', self.max_items * self.MAX_BUFFERED_BATCHES)
+        if self.max_items < 1 or self.max_bytes < 0 or self.max_delay <= 0:
+            raise SinkError('max_items and max_delay must be positive and max_bytes can not be negative.')
+        if self.max_buffered < self.max_items:
+            raise SinkError('max_buffered can not be lower than max_items.')
+        self._buffer: List[Any] = list()
+        self._buffer_bytes = 0
+        self._write_lock = asyncio.Lock()
+        self._timer: Union[asyncio.TimerHandle, None] = None
+        self._timed_flush: Union[Task, None] = None
+        self._batches = 0
+        self._failed_batches = 0
+        self._dropped = 0
+        self._items_batched = 0
+        self._max_batch_size = 0
+        self._total_flush_latency = 0.0
+        self._max_flush_latency = 0.0
+
+    @abstractmethod
+    async def write_batch(self, items: List[Any]):
+        """Writes the items, in the order they were given to the Sink."""
+
+    def item_size(self, item: Any) -> int:
+        """Estimated size of an item in bytes, used with `max_bytes`."""
+        if isinstance(item, (bytes, bytearray, str)):
+            return len(item)
+        return len(json.dumps(item, default=str))
+
+    async def sink(self, data: Any):
+        self._buffer.append(data)
+        if self.max_bytes:
+            self._buffer_bytes += self.item_size(data)
+        if len(self._buffer) >= self.max_items or (self.max_bytes and self._buffer_bytes >= self.max_bytes):
+            await self._flush(retried=data)
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_on_time)
+
+    async def flush(self):
+        """
+        Writes the buffered items, if any, after the batches being written.
+        If the write fails the items are buffered again.
+        """
+        await self._flush()
+
+    async def _flush(self, retried: Any = _NOTHING):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        items, self._buffer, self._buffer_bytes = self._buffer, list(), 0
+        async with self._write_lock:
+            started = time.monotonic()
+            try:
+                await self.write_batch(items)
+            except Exception:
+                self._failed_batches += 1
+                self._buffer_again(items[:-1] if items and items[-1] is retried else items)
+                raise
+            finally:
+                latency = time.monotonic() - started
+                self._batches += 1
+                self._items_batched += len(items)
+                self._max_batch_size = max(self._max_batch_size, len(items))
+                self._total_flush_latency += latency
+                self._max_flush_latency = max(self._max_flush_latency, latency)
+
+    def _buffer_again(self, items: List[Any]):
+        self._buffer[:0] = items
+        overflow = len(self._buffer) - self.max_buffered
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self._dropped += overflow
+        if self.max_bytes:
+            self._buffer_bytes = sum(self.item_size(item) for item in self._buffer)
+        if self._buffer and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush_on_time)
+
+    def _flush_on_time(self):
+        self._timer = None
+        self._timed_flush = asyncio.get_running_loop().create_task(self._flush_logging_errors())
+
+    async def _flush_logging_errors(self):
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f'Sink {self.id} failed to write a batch. Details: {e}')
+
+    async def close(self):
+        """Flushes the buffered items."""
+        if self._timed_flush is not None:
+            await asyncio.gather(self._timed_flush, return_exceptions=True)
+        try:
+            await self.flush()
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def batching_info(self) -> BatchingInfo:
+        return BatchingInfo(
+            buffered=len(self._buffer), batches=self._batches, failed_batches=self._failed_batches,
+            dropped=self._dropped,
+            avg_batch_size=self._items_batched / self._batches if self._batches else 0.0,
+            max_batch_size=self._max_batch_size,
+            avg_flush_latency=self._total_flush_latency / self._batches if self._batches else 0.0,
+            max_flush_latency=self._max_flush_latency
+        )
+
+    @property
+    def info(self):
+        return self._info.model_copy(update={'batching': self.batching_info()})
+
+
+class DurableSink(AbstractSink):
+    """
+    Base class for Sinks that must not lose items while their target is
+    slow or unreachable.
+
+    Items given to `sink` are appended to an :class:`orchd_sdk.outbox.Outbox`
+    in the `outbox_dir` template property, and a background task delivers
+    them in order with :meth:`deliver`, `outbox_batch_size` at a time. Failed
+    deliveries are retried every `outbox_retry_delay` seconds, the backlog
+    stays on disk meanwhile, bounded by `outbox_max_segments` segments of
+    `outbox_segment_size` bytes. Items not delivered when the Sink is closed
+    are delivered after it is opened again, even by a new process.
+
+    Delivery is at least once: items delivered right before a crash may be
+    delivered again.
+    """
+
+    SEGMENT_SIZE = 16 * 1024 * 1024
+    MAX_SEGMENTS = 0
+    BATCH_SIZE = 100
+    RETRY_DELAY = 1.0
+
+    def __init__(self, template: SinkTemplate):
+        super().__init__(template)
+        properties = template.properties or dict()
+        if 'outbox_dir' not in properties:
+            raise SinkError(f'Sink template {template.id} must set the outbox_dir property.')
+        self.outbox_dir: str = properties['outbox_dir']
+        self.segment_size: int = properties.get('outbox_segment_size', self.SEGMENT_SIZE)
+        self.max_segments: int = properties.get('outbox_max_segments', self.MAX_SEGMENTS)
+        self.batch_size: int = properties.get('outbox_batch_size', self.BATCH_SIZE)
+        self.retry_delay: float = properties.get('outbox_retry_delay', self.RETRY_DELAY)
+        self.outbox: Union[Outbox, None] = None
+        self._pending = asyncio.Event()
+        self._drainer: Union[Task, None] = None
+        self._delivered = 0
+        self._failed_deliveries = 0
+
+    @abstractmethod
+    async def deliver(self, items: List[Any]):
+        """Delivers the items to the target, raising if they could not be delivered."""
+
+    async def open(self):
+        """Opens the outbox and starts delivering its backlog."""
+        self.outbox = Outbox(self.outbox_dir, self.segment_size, self.max_segments)
+        self._pending.set()
+        self._drainer = asyncio.get_running_loop().create_task(self._drain())
+
+    async def sink(self, data: Any):
+        self.outbox.append(data)
+        self._pending.set()
+
+    async def _drain(self):
+        while True:
+            items, position = self.outbox.read(self.batch_size)
+            if not items:
+                self.outbox.ack(position)
+                self._pending.clear()
+                await self._pending.wait()
+                continue
+            try:
+                await self.deliver(items)
+            except Exception as e:
+                self._failed_deliveries += 1
+                logger.warning(f'Sink {self.id} failed to deliver {len(items)} item(s), retrying in '
+                               f'{self.retry_delay}s. Details: {e}')
+                await asyncio.sleep(self.retry_delay)
+                continue
+            self.outbox.ack(position)
+            self._delivered += len(items)
+
+    async def close(self):
+        """Stops delivering and closes the outbox, keeping the items not delivered."""
+        if self._drainer is not None:
+            self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+            self._drainer = None
+        if self.outbox is not None:
+            self.outbox.close()
+            self.outbox = None
+
+    def outbox_info(self) -> Union[OutboxInfo, None]:
+        if self.outbox is None:
+            return None
+        return OutboxInfo(
+            segments=self.outbox.segments, size_bytes=self.outbox.size_bytes,
+            appended=self.outbox.appended, delivered=self._delivered,
+            failed_deliveries=self._failed_deliveries
+        )
+
+    @property
+    def info(self):
+        return self._info.model_copy(update={'outbox': self.outbox_info()})
+
+
+class SinkDispatcher:
+    """
+    Schedules the writes to a Sink.
+
+    At most `max_in_flight` writes run at the same time, the following ones
+    wait in FIFO order. The dispatcher keeps a reference to every running
+    write task, so none is garbage collected or forgotten, records failures
+    and latencies, and can be drained when the Sink is about to be closed.
+
+    Failed writes are retried following the :class:`RetryPolicy`. A write
+    waiting for its next attempt is kept on a timer, not in a running slot,
+    so it does not hold up the fresh ones, and it goes ahead of the queued
+    writes when the timer fires.
+
+    `on_done` is called with the number of writes finished, given up or
+    cancelled, which lets the owner account for in-flight work.
+    """
+
+    MAX_ERRORS = 10
+    """Number of recent failures kept for the Sink info."""
+
+    def __init__(self, sink: AbstractSink, max_in_flight: int,
+                 write: Callable[[Any], Awaitable] = None,
+                 on_done: Callable[[int], None] = None,
+                 retry: RetryPolicy = None):
+        if max_in_flight < 1:
+            raise SinkError('max_in_flight must be at least 1.')
+        retry = retry or RetryPolicy()
+        if retry.max_attempts < 1 or retry.base_delay < 0 or retry.max_delay < 0 or not 0 <= retry.jitter <= 1:
+            raise SinkError('Invalid retry policy, max_attempts must be at least 1, delays can not be '
+                            'negative and jitter must be between 0 and 1.')
+        self.sink = sink
+        self.max_in_flight = max_in_flight
+        self.retry = retry
+        self.completed = 0
+        self.failed = 0
+        self.attempts = 0
+        self.give_ups = 0
+        self.current_backoff = 0.0
+        self.errors: Deque[str] = deque(maxlen=self.MAX_ERRORS)
+        self._write = write or sink.sink
+        self._on_done = on_done
+        self._queue: Deque[Tuple[Any, float, int]] = deque()
+        self._tasks: Set[Task] = set()
+        self._timers: Set[asyncio.TimerHandle] = set()
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._idle_waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def retrying(self) -> int:
+        return len(self._timers)
+
+    def dispatch(self, data: Any):
+        """Schedules the data to be sunk."""
+        self._queue.append((data, time.monotonic(), 1))
+        self._pump()
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before the given attempt, the second being the first retry."""
+        delay = min(self.retry.max_delay, self.retry.base_delay * 2 ** (attempt - 2))
+        return delay * (1 - self.retry.jitter * random.random())
+
+    async def drain(self, timeout: float = None) -> bool:
+        """
+        Waits until the queued, running and retrying writes are finished.
+
+        :return: False if the timeout expired first.
+        """
+        if self._idle():
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._idle_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def cancel(self) -> int:
+        """Drops the queued and retrying writes and cancels the running ones, returning how many there were."""
+        dropped = len(self._queue) + len(self._timers)
+        self._queue.clear()
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        if dropped and self._on_done:
+            self._on_done(dropped)
+        running = len(self._tasks)
+        for task in list(self._tasks):
+            task.cancel()
+        return dropped + running
+
+    def info(self) -> SinkDispatchInfo:
+        finished = self.completed + self.give_ups
+        return SinkDispatchInfo(
+            max_in_flight=self.max_in_flight, queue_depth=self.queue_depth,
+            in_flight=self.in_flight, completed=self.completed, failed=self.failed,
+            avg_latency=self._total_latency / finished if finished else 0.0,
+            max_latency=self._max_latency, last_errors=list(self.errors),
+            attempts=self.attempts, retrying=self.retrying, give_ups=self.give_ups,
+            current_backoff=self.current_backoff
+        )
+
+    def _idle(self) -> bool:
+        return not self._queue and not self._tasks and not self._timers
+
+    def _pump(self):
+        while self._queue and len(self._tasks) < self.max_in_flight:
+            task = asyncio.get_running_loop().create_task(self._run(*self._queue.popleft()))
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    async def _run(self, data: Any, queued_at: float, attempt: int) -> bool:
+        """Makes an attempt to write the data, returning True when it is finished, False if it will be retried."""
+        self.attempts += 1
+        try:
+            await self._write(data)
+            self.completed += 1
+            self.current_backoff = 0.0
+        except Exception as e:
+            self.failed += 1
+            self.errors.append(f'{type(e).__name__}: {e}')
+            if attempt < self.retry.max_attempts:
+                self.current_backoff = self.backoff(attempt + 1)
+                logger.warning(f'Sink {self.sink.id} failed to sink data, attempt {attempt} of '
+                               f'{self.retry.max_attempts}, retrying in {self.current_backoff:.3f}s. '
+                               f'Details: {e}')
+                self._schedule_retry(data, queued_at, attempt + 1)
+                return False
+            self.give_ups += 1
+            logger.error(f'Sink {self.sink.id} failed to sink data. Details: {e}')
+        latency = time.monotonic() - queued_at
+        self._total_latency += latency
+        self._max_latency = max(self._max_latency, latency)
+        return True
+
+    def _schedule_retry(self, data: Any, queued_at: float, attempt: int):
+        def retry():
+            self._timers.discard(timer)
+            self._queue.appendleft((data, queued_at, attempt))
+            self._pump()
+
+        timer = asyncio.get_running_loop().call_later(self.current_backoff, retry)
+        self._timers.add(timer)
+
+    def _task_done(self, task: Task):
+        self._tasks.discard(task)
+        if self._on_done and (task.cancelled() or task.exception() is not None or task.result()):
+            self._on_done(1)
+        self._pump()
+        if self._idle():
+            while self._idle_waiters:
+                waiter = self._idle_waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+
+
+class SharedSink:
+    """A Sink of the :class:`SinkRegistry`, the number of references to it and its thread pool."""
+
+    def __init__(self, sink: AbstractSink):
+        self.sink = sink
+        self.references = 0
+        self.opening: Union[asyncio.Future, None] = None
+        self.pool: Union[ThreadPool, None] = None
+        self.pool_created = False
+
+
+class SinkRegistry:
+    """
+    Registry of the Sinks shared by Reactions.
+
+    Templates with the same id and properties resolve to the same Sink
+    instance. Every :meth:`acquire` takes a reference to it and every
+    :meth:`release` gives one back, the caller releasing the last reference
+    is the one that must close the Sink. The Sink is opened once, by the
+    first caller of :meth:`open`, the others wait for it to be opened.
+
+    Blocking Sinks have a single thread pool too, created by the first
+    caller of :meth:`pool` and closed by the one releasing the last reference.
+    """
+
+    def __init__(self):
+        self._shared: Dict[Tuple[str, str], SharedSink] = dict()
+        self._keys: Dict[str, Tuple[str, str]] = dict()
+
+    def __len__(self):
+        return len(self._shared)
+
+    @staticmethod
+    def key(template: SinkTemplate) -> Tuple[str, str]:
+        return template.id, json.dumps(template.properties, sort_keys=True, default=str)
+
+    def acquire(self, template: SinkTemplate,
+                create: Callable[[SinkTemplate], AbstractSink] = None) -> AbstractSink:
+        """Takes a reference to the Sink of the template, created with `create` if not registered yet."""
+        key = self.key(template)
+        shared = self._shared.get(key)
+        if shared is None:
+            shared = SharedSink((create or sink_factory)(template))
+            self._shared[key] = shared
+            self._keys[shared.sink.id] = key
+        shared.references += 1
+        return shared.sink
+
+    async def open(self, sink: AbstractSink, open_: Callable[[], Awaitable]):
+        """Opens the Sink with `open_` if nobody did, otherwise waits for it to be opened."""
+        shared = self._get(sink)
+        if shared.opening is None:
+            shared.opening = asyncio.ensure_future(open_())
+        await asyncio.shield(shared.opening)
+
+    def pool(self, sink: AbstractSink,
+             create: Callable[[], Union[ThreadPool, None]]) -> Union[ThreadPool, None]:
+        """The thread pool of the Sink, created with `create` by the first caller."""
+        shared = self._get(sink)
+        if not shared.pool_created:
+            shared.pool = create()
+            shared.pool_created = True
+        return shared.pool
+
+    def release(self, sink: AbstractSink) -> bool:
+        """Gives back a reference to the Sink, returning True when it was the last one."""
+        shared = self._get(sink)
+        shared.references -= 1
+        if shared.references > 0:
+            return False
+        del self._shared[self._keys.pop(sink.id)]
+        return True
+
+    def is_shared(self, sink: AbstractSink) -> bool:
+        return sink.id in self._keys
+
+    def references(self, sink: AbstractSink) -> int:
+        return self._get(sink).references if self.is_shared(sink) else 1
+
+    def _get(self, sink: AbstractSink) -> SharedSink:
+        try:
+            return self._shared[self._keys[sink.id]]
+        except KeyError as e:
+            raise SinkError(f'Sink {sink.id} is not shared.') from e
+
+
 def sink_factory(template: SinkTemplate):
     try:
         Class = import_class(template.sink_class)
         if isinstance(Class, AbstractSink):
             raise SinkError('Sink class is not Valid!')
         return Class(template)
-    except ModuleNotFoundError:
+    except ClassResolver.ERRORS:
         raise SinkError('Sink class not found in PYTHONPATH.')
 
+
+global_sink_registry = SinkRegistry()
+"""Process wide registry of shared Sinks."""
@@ -14,11 +14,14 @@
 # COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import asyncio
+from unittest.mock import patch
+
 import pytest
 
 from orchd_sdk.models import Event
 from orchd_sdk.sensor import LocalCommunicator
-from orchd_sdk.reaction import global_reactions_event_bus
+from orchd_sdk.reaction import DummyReaction, DummyReactionHandler, ReactionsEventBus, global_reactions_event_bus
 
 
 class TestLocalCommunicatorIntegration:
@@ -31,21 +34,22 @@ class TestLocalCommunicatorIntegration:
         """
         Tests if the emitted event is captured by subscribers.
 
-        The test uses a LocalCommunicator to emit an event.
+        The test uses a LocalCommunicator to emit an event, captured by a
+        Reaction triggered on every event.
         """
         comm = LocalCommunicator()
-        result = None
-
-        def on_next(value):
-            nonlocal result
-            result = value
+        template = DummyReaction.template.model_copy(update={'triggered_on': [ReactionsEventBus.CATCH_ALL]})
+        reaction = DummyReaction(template)
 
-        disposable = global_reactions_event_bus._subject.subscribe(on_next=on_next)
-        event = Event(event_name='io.orchd.event.system.Test',
-                      data=dict())
+        with patch.object(DummyReactionHandler, 'handle', return_value=None) as handle:
+            await reaction.init()
+            reaction.activate(global_reactions_event_bus)
+            event = Event(event_name='io.orchd.event.system.Test',
+                          data=dict())
 
-        await comm.emit_event(event)
-        assert type(result) == Event
-        assert result is event
+            await comm.emit_event(event)
+            await asyncio.sleep(0.01)
+            await reaction.close()
 
-        disposable.dispose()
+        handle.assert_called_once()
+        assert handle.call_args.args[0] is event
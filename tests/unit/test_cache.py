@@ -0,0 +1,89 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import time
+from unittest.mock import patch
+
+import pytest
+
+from orchd_sdk.cache import ResultCache
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.models import Event
+
+
+def reading(value, name='io.orchd.events.Reading'):
+    return Event(event_name=name, data={'device_id': 'a', 'value': value})
+
+
+def test_key_must_only_depend_on_event_name_and_data():
+    assert ResultCache.key(reading(1)) == ResultCache.key(reading(1))
+    assert ResultCache.key(reading(1)) != ResultCache.key(reading(2))
+    assert ResultCache.key(reading(1)) != ResultCache.key(reading(1, 'io.orchd.events.Other'))
+
+
+def test_key_must_be_none_for_data_not_serializable():
+    assert ResultCache.key(Event(event_name='io.orchd.events.Reading', data={'value': object()})) is None
+
+
+def test_get_must_count_hits_and_misses():
+    cache = ResultCache(max_entries=10)
+    key = ResultCache.key(reading(1))
+
+    assert cache.get(key) == (False, None)
+    cache.put(key, 'result')
+    assert cache.get(key) == (True, 'result')
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.info().hit_ratio == 0.5
+
+
+def test_put_must_evict_least_recently_used_entries():
+    cache = ResultCache(max_entries=2)
+    a, b, c = (ResultCache.key(reading(v)) for v in range(3))
+    cache.put(a, 'a')
+    cache.put(b, 'b')
+    cache.get(a)
+    cache.put(c, 'c')
+
+    assert cache.get(b) == (False, None)
+    assert cache.get(a) == (True, 'a')
+    assert cache.evictions == 1
+
+
+def test_put_must_keep_the_cache_within_max_bytes():
+    cache = ResultCache(max_bytes=200)
+    for value in range(10):
+        cache.put(ResultCache.key(reading(value)), 'x' * 50)
+
+    assert 0 < cache.size_bytes <= 200
+    assert len(cache) < 10
+    cache.put(ResultCache.key(reading(99)), 'x' * 500)
+    assert cache.get(ResultCache.key(reading(99))) == (False, None)
+
+
+def test_entries_must_expire_after_ttl():
+    cache = ResultCache(max_entries=10, ttl=5)
+    key = ResultCache.key(reading(1))
+    cache.put(key, 'result')
+
+    with patch('orchd_sdk.cache.time.monotonic', return_value=time.monotonic() + 6):
+        assert cache.get(key) == (False, None)
+    assert len(cache) == 0
+
+
+def test_cache_must_fail_on_invalid_bounds():
+    with pytest.raises(InvalidInputError):
+        ResultCache(max_entries=-1)
+    with pytest.raises(InvalidInputError):
+        ResultCache(max_entries=10, ttl=0)
@@ -0,0 +1,91 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import sys
+
+from types import ModuleType, SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from orchd_sdk.common import ClassResolver
+from orchd_sdk.reaction import DummyReaction, DummyReactionHandler
+from orchd_sdk.sensor import DummySensor
+from orchd_sdk.sink import DummySink
+
+
+class TestClassResolver:
+
+    def test_resolve_must_memoize_classes(self):
+        resolver = ClassResolver()
+        module = ModuleType('probe_module')
+        module.Probe = DummySink
+        with patch.dict(sys.modules, {'probe_module': module}):
+            assert resolver.resolve('probe_module.Probe') is DummySink
+
+        with patch('orchd_sdk.common.importlib.import_module') as import_module:
+            assert resolver.resolve('probe_module.Probe') is DummySink
+            import_module.assert_not_called()
+
+    def test_resolve_must_cache_missing_classes(self):
+        resolver = ClassResolver()
+        with pytest.raises(ModuleNotFoundError):
+            resolver.resolve('not.existent.Class')
+
+        with patch('orchd_sdk.common.importlib.import_module') as import_module:
+            with pytest.raises(ModuleNotFoundError):
+                resolver.resolve('not.existent.Class')
+            import_module.assert_not_called()
+
+    def test_forget_must_allow_resolving_again(self):
+        resolver = ClassResolver()
+        with pytest.raises(AttributeError):
+            resolver.resolve('orchd_sdk.sink.NotYetDefined')
+
+        with patch('orchd_sdk.sink.NotYetDefined', DummySink, create=True):
+            resolver.forget('orchd_sdk.sink.NotYetDefined')
+            assert resolver.resolve('orchd_sdk.sink.NotYetDefined') is DummySink
+
+    def test_preload_must_resolve_the_classes_of_templates(self):
+        resolver = ClassResolver()
+        broken = DummySink.template.model_copy(update={'sink_class': 'not.existent.Sink'})
+
+        failed = resolver.preload([DummyReaction.template, DummySensor.template, broken])
+
+        assert list(failed) == ['not.existent.Sink']
+        with patch('orchd_sdk.common.importlib.import_module') as import_module:
+            assert resolver.resolve(DummyReaction.template.handler) is DummyReactionHandler
+            assert resolver.resolve('orchd_sdk.sensor.LocalCommunicator')
+            import_module.assert_not_called()
+
+    def test_preload_must_import_each_module_once(self):
+        resolver = ClassResolver()
+        module = ModuleType('probe_module')
+        module.Handler, module.Sink = DummyReactionHandler, DummySink
+        templates = [
+            SimpleNamespace(handler='probe_module.Handler', sinks=[SimpleNamespace(sink_class='probe_module.Sink')]),
+            SimpleNamespace(sink_class='probe_module.Missing'),
+            SimpleNamespace(sensor='absent_module.Sensor', communicator='absent_module.Communicator'),
+        ]
+
+        with patch('orchd_sdk.common.importlib.import_module', side_effect=[module, ModuleNotFoundError('absent')]) \
+                as import_module:
+            failed = resolver.preload(templates)
+
+        assert [c.args[0] for c in import_module.call_args_list] == ['probe_module', 'absent_module']
+        assert list(failed) == ['probe_module.Missing', 'absent_module.Sensor', 'absent_module.Communicator']
+        assert isinstance(failed['probe_module.Missing'], AttributeError)
+        with patch.dict(sys.modules, {'probe_module': module}):
+            assert resolver.resolve('probe_module.Sink') is DummySink
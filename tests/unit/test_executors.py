@@ -0,0 +1,76 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from orchd_sdk.executors import event_to_payload, event_from_payload, ProcessHandlerRunner, ThreadPool
+from orchd_sdk.models import Event
+from orchd_sdk.reaction import DummyReaction
+
+
+@pytest.fixture
+def test_event():
+    return Event(event_name='io.orchd.events.system.Test', data={'values': [1, 2, 3]})
+
+
+def test_event_payload_round_trip(test_event):
+    assert event_from_payload(event_to_payload(test_event)) == test_event
+
+
+class TestProcessHandlerRunner:
+
+    @pytest.mark.asyncio
+    async def test_handle_must_run_the_handler_in_a_worker_and_return_its_result(self, test_event):
+        template = DummyReaction.template.model_copy(update={'execution_mode': 'process',
+                                                             'max_concurrency': 2})
+        runner = ProcessHandlerRunner(template)
+        await runner.start()
+        try:
+            assert await runner.handle(test_event) == test_event
+        finally:
+            await runner.close()
+
+
+class TestThreadPool:
+
+    @pytest.mark.asyncio
+    async def test_run_must_call_the_function_in_a_named_thread(self):
+        pool = ThreadPool('orchd-test', 1)
+        try:
+            assert (await pool.run(lambda: threading.current_thread().name)).startswith('orchd-test')
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_info_must_report_queue_depth_and_wait_time(self):
+        pool = ThreadPool('orchd-test', 1)
+        calls = [asyncio.ensure_future(pool.run(time.sleep, 0.05)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        info = pool.info()
+        assert info.pending == 3
+        assert info.queue_depth == 2
+
+        await asyncio.gather(*calls)
+        info = pool.info()
+        assert info.completed == 3
+        assert info.queue_depth == 0
+        assert info.max_wait >= 0.05
+        await pool.close()
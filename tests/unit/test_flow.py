@@ -0,0 +1,99 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+
+import pytest
+
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.flow import InFlightCounter, BoundedQueue, OverflowPolicy
+
+
+class TestInFlightCounter:
+
+    @pytest.mark.asyncio
+    async def test_wait_below_must_return_immediately_when_under_threshold(self):
+        counter = InFlightCounter()
+        counter.started(2)
+        await asyncio.wait_for(counter.wait_below(2), 0.1)
+
+    @pytest.mark.asyncio
+    async def test_wait_below_must_wait_until_work_goes_down_to_threshold(self):
+        counter = InFlightCounter()
+        counter.started(3)
+        waiter = asyncio.ensure_future(counter.wait_below(1))
+
+        counter.done()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        counter.done()
+        await asyncio.wait_for(waiter, 0.1)
+        assert counter.count == 1
+
+
+class TestBoundedQueue:
+
+    @pytest.mark.parametrize('policy, expected', [
+        (OverflowPolicy.DROP_NEWEST, [1, 2]),
+        (OverflowPolicy.DROP_OLDEST, [2, 3]),
+    ])
+    def test_overflow_must_drop_according_to_policy(self, policy, expected):
+        queue = BoundedQueue(2, policy)
+        dropped = [queue.put_nowait(item) for item in (1, 2, 3)]
+
+        assert dropped == [0, 0, 1]
+        assert queue.dropped == 1
+        assert [queue.get_nowait() for _ in range(queue.qsize())] == expected
+
+    def test_keep_latest_must_replace_queued_item_with_the_same_key(self):
+        queue = BoundedQueue(2, OverflowPolicy.KEEP_LATEST, key=lambda item: item[0])
+        for item in (('a', 1), ('b', 1), ('a', 2)):
+            queue.put_nowait(item)
+        assert [item for _, item in queue._items] == [('a', 2), ('b', 1)]
+
+        queue.put_nowait(('c', 1))
+        assert queue.dropped == 2
+        assert [queue.get_nowait() for _ in range(queue.qsize())] == [('b', 1), ('c', 1)]
+
+    def test_block_must_not_drop_on_put_nowait(self):
+        queue = BoundedQueue(1, OverflowPolicy.BLOCK)
+        queue.put_nowait(1)
+        queue.put_nowait(2)
+
+        assert queue.qsize() == 2
+        assert queue.dropped == 0
+
+    @pytest.mark.asyncio
+    async def test_block_put_must_wait_for_room(self):
+        queue = BoundedQueue(1, OverflowPolicy.BLOCK)
+        await queue.put(1)
+        putting = asyncio.ensure_future(queue.put(2))
+        await asyncio.sleep(0)
+        assert not putting.done()
+
+        assert await queue.get() == 1
+        await asyncio.wait_for(putting, 0.1)
+        assert await queue.get() == 2
+
+    @pytest.mark.parametrize('maxsize, policy, key', [
+        (0, OverflowPolicy.BLOCK, None),
+        (1, 'unknown', None),
+        (1, OverflowPolicy.KEEP_LATEST, None)
+    ])
+    def test_given_invalid_configuration_throw_exception(self, maxsize, policy, key):
+        with pytest.raises(InvalidInputError):
+            BoundedQueue(maxsize, policy, key)
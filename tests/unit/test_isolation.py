@@ -0,0 +1,155 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+from orchd_sdk.errors import InvalidInputError, SensorFatalError
+from orchd_sdk.isolation import IsolatedSensor, SharedRingBuffer, create_sensor
+from orchd_sdk.models import Event
+from orchd_sdk.sensor import AbstractSensor, DummySensor, LocalCommunicator, SensorError
+
+
+class CountingSensor(AbstractSensor):
+    """
+    Senses increasing numbers, exiting the process after `exit_after` of them,
+    or failing fatally after `fatal_after` of them, if set.
+    """
+
+    def __init__(self, sensor_template, communicator):
+        super().__init__(sensor_template, communicator)
+        self.count = 0
+
+    async def sense(self):
+        self.count += 1
+        await self.event_queue.put(Event(event_name='io.orchd.events.system.Test',
+                                         data={'count': self.count, 'pid': os.getpid()}))
+        if self.count == self.sensor_template.parameters.get('exit_after'):
+            await asyncio.sleep(0.05)
+            os._exit(1)
+        if self.count == self.sensor_template.parameters.get('fatal_after'):
+            raise SensorFatalError('device gone')
+
+
+def counting_template(**parameters):
+    return DummySensor.template.model_copy(update={
+        'sensor': f'{__name__}.CountingSensor', 'execution_mode': 'process', 'sensing_interval': 0.01,
+        'restart_delay': 0.05, 'parameters': parameters
+    })
+
+
+async def wait_for(condition, timeout=20):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestSharedRingBuffer:
+
+    def test_records_must_be_read_in_order_across_the_end_of_the_buffer(self):
+        ring = SharedRingBuffer(64)
+        try:
+            reader = SharedRingBuffer(name=ring.name)
+            written = []
+            for i in range(20):
+                record = bytes([i]) * (i % 7 + 1)
+                assert ring.put(record)
+                written.append(record)
+                if i % 3 == 2:
+                    assert reader.get(10) == written
+                    written = []
+            assert reader.get(10) == written
+            assert ring.used == 0
+            reader.close()
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_full_buffer_must_refuse_records(self):
+        ring = SharedRingBuffer(32)
+        try:
+            assert ring.put(b'x' * 20)
+            assert not ring.put(b'y' * 20)
+            assert ring.get(1) == [b'x' * 20]
+            assert ring.put(b'y' * 20)
+            with pytest.raises(InvalidInputError):
+                ring.put(b'z' * 40)
+        finally:
+            ring.close()
+            ring.unlink()
+
+
+class TestIsolatedSensor:
+
+    @pytest.mark.asyncio
+    async def test_events_sensed_in_worker_must_be_emitted_by_the_agent(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        sensor = create_sensor(counting_template(), communicator)
+        assert isinstance(sensor, IsolatedSensor)
+
+        sensor.start()
+        try:
+            await wait_for(lambda: sensor.status().events_forwarded >= 5)
+        finally:
+            await sensor.stop()
+
+        events = [e for call in communicator.emit_events.await_args_list for e in call.args[0]]
+        assert [e.data['count'] for e in events[:5]] == [1, 2, 3, 4, 5]
+        assert events[0].data['pid'] != os.getpid()
+        assert not sensor.process.is_alive()
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_must_be_restarted(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        sensor = IsolatedSensor(counting_template(exit_after=2), communicator)
+
+        sensor.start()
+        try:
+            await wait_for(lambda: sensor.restarts >= 1 and sensor.status().events_forwarded >= 3)
+            status = sensor.status()
+        finally:
+            await sensor.stop()
+
+        assert status.worker.restarts >= 1
+        events = [e for call in communicator.emit_events.await_args_list for e in call.args[0]]
+        assert len({e.data['pid'] for e in events}) >= 2
+
+    @pytest.mark.asyncio
+    async def test_worker_of_a_fatally_failing_sensor_must_be_restarted(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        sensor = IsolatedSensor(counting_template(fatal_after=2), communicator)
+
+        sensor.start()
+        try:
+            await wait_for(lambda: sensor.restarts >= 1 and sensor.status().events_forwarded >= 3)
+        finally:
+            await sensor.stop()
+
+        events = [e for call in communicator.emit_events.await_args_list for e in call.args[0]]
+        assert len({e.data['pid'] for e in events}) >= 2
+        assert [e.data['count'] for e in events[:3]] == [1, 2, 1]
+
+    def test_unknown_execution_mode_must_raise(self):
+        with pytest.raises(SensorError):
+            create_sensor(counting_template().model_copy(update={'execution_mode': 'thread'}),
+                          LocalCommunicator())
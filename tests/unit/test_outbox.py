@@ -0,0 +1,146 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import asyncio
+import os
+
+import pytest
+
+from orchd_sdk.errors import SinkError
+from orchd_sdk.outbox import Outbox
+from orchd_sdk.sink import DummySink, DurableSink
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(Outbox.SEGMENT_SUFFIX))
+
+
+class TestOutbox:
+
+    def test_items_must_be_read_in_order_across_segments(self, tmp_path):
+        outbox = Outbox(str(tmp_path), segment_size=64)
+        for item in range(10):
+            outbox.append({'seq': item})
+
+        items, position = outbox.read(100)
+        assert [item['seq'] for item in items] == list(range(10))
+        assert outbox.segments > 1
+        assert outbox.read(3)[0] == items[:3]
+        outbox.close()
+
+    def test_ack_must_delete_the_segments_read(self, tmp_path):
+        outbox = Outbox(str(tmp_path), segment_size=64)
+        for item in range(10):
+            outbox.append(item)
+
+        items, position = outbox.read(100)
+        outbox.ack(position)
+
+        assert outbox.read(100)[0] == []
+        assert len(segment_files(tmp_path)) == 1
+        outbox.close()
+
+    def test_items_not_acknowledged_must_survive_a_restart(self, tmp_path):
+        outbox = Outbox(str(tmp_path), segment_size=64)
+        for item in range(6):
+            outbox.append(item)
+        outbox.ack(outbox.read(4)[1])
+        outbox.close()
+
+        outbox = Outbox(str(tmp_path), segment_size=64)
+        outbox.append(6)
+        assert outbox.read(100)[0] == [4, 5, 6]
+        outbox.close()
+
+    def test_partly_written_records_must_be_ignored_on_restart(self, tmp_path):
+        outbox = Outbox(str(tmp_path))
+        outbox.append('complete')
+        outbox.append('torn')
+        outbox.close()
+
+        path = os.path.join(tmp_path, segment_files(tmp_path)[0])
+        with open(path, 'r+b') as file:
+            data = file.read()
+            file.seek(data.index(b'torn'))
+            file.write(b'xx')
+
+        outbox = Outbox(str(tmp_path))
+        assert outbox.read(100)[0] == ['complete']
+        outbox.append('next')
+        assert outbox.read(100)[0] == ['complete', 'next']
+        outbox.close()
+
+    def test_append_must_fail_when_max_segments_is_reached(self, tmp_path):
+        outbox = Outbox(str(tmp_path), segment_size=64, max_segments=2)
+        with pytest.raises(SinkError):
+            for item in range(100):
+                outbox.append(item)
+        assert outbox.segments == 2
+        outbox.close()
+
+
+class FlakyDurableSink(DurableSink):
+    """Durable Sink failing its first delivery."""
+
+    def __init__(self, template):
+        super().__init__(template)
+        self.delivered = list()
+        self.failures = 1
+
+    async def deliver(self, items):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('unreachable')
+        self.delivered.extend(items)
+
+
+class TestDurableSink:
+
+    @pytest.mark.asyncio
+    async def test_items_must_be_delivered_in_order_after_failures(self, tmp_path):
+        template = DummySink.template.model_copy(update={'properties': {
+            'outbox_dir': str(tmp_path), 'outbox_retry_delay': 0.01
+        }})
+        sink = FlakyDurableSink(template)
+        await sink.open()
+        for item in range(5):
+            await sink.sink(item)
+
+        await asyncio.sleep(0.05)
+        assert sink.delivered == [0, 1, 2, 3, 4]
+        assert sink.info.outbox.failed_deliveries == 1
+        await sink.close()
+
+    @pytest.mark.asyncio
+    async def test_backlog_must_be_delivered_when_opened_again(self, tmp_path):
+        template = DummySink.template.model_copy(update={'properties': {
+            'outbox_dir': str(tmp_path), 'outbox_retry_delay': 10
+        }})
+        sink = FlakyDurableSink(template)
+        await sink.open()
+        await sink.sink('kept')
+        await asyncio.sleep(0.01)
+        await sink.close()
+
+        sink = FlakyDurableSink(template)
+        sink.failures = 0
+        await sink.open()
+        await asyncio.sleep(0.01)
+        assert sink.delivered == ['kept']
+        await sink.close()
+
+    def test_outbox_dir_must_be_set(self):
+        with pytest.raises(SinkError):
+            FlakyDurableSink(DummySink.template)
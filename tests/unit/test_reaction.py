@@ -14,17 +14,21 @@
 # COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import asyncio
+import time
+import threading
 from typing import List
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, call
 from uuid import uuid4
 
 import pytest
 import pytest_asyncio
 
 from orchd_sdk.errors import ReactionError, SinkError
-from orchd_sdk.models import Event, SinkTemplate
-from orchd_sdk.reaction import DummyReaction, ReactionsEventBus, ReactionHandler, ReactionState, ReactionSinkManager
-from orchd_sdk.sink import DummySink
+from orchd_sdk.models import Event, EventFilter, SinkTemplate
+from orchd_sdk.reaction import DummyReaction, ReactionsEventBus, ReactionHandler, ReactionState, \
+    ReactionSinkManager, BatchReactionHandler
+from orchd_sdk.sink import DummySink, AbstractSink
 
 
 @pytest.fixture
@@ -52,6 +56,117 @@ def dummy_sink_template_list() -> List[SinkTemplate]:
     ]
 
 
+class ConcurrencyProbeHandler(ReactionHandler):
+    """Async handler recording how many calls run at the same time."""
+    running = 0
+    max_running = 0
+    handled = 0
+
+    async def handle(self, event, reaction):
+        cls = ConcurrencyProbeHandler
+        cls.running += 1
+        cls.max_running = max(cls.max_running, cls.running)
+        await asyncio.sleep(0.01)
+        cls.running -= 1
+        cls.handled += 1
+        return event
+
+
+class ThreadProbeHandler(ReactionHandler):
+    """Blocking handler recording the thread it runs in."""
+    threads = []
+
+    def handle(self, event, reaction):
+        ThreadProbeHandler.threads.append(threading.current_thread().name)
+        return event
+
+
+class BlockingSink(AbstractSink):
+    """Sink with blocking methods recording the threads they run in."""
+    threads = []
+
+    def sink(self, data):
+        BlockingSink.threads.append(threading.current_thread().name)
+
+    def close(self):
+        BlockingSink.threads.append(threading.current_thread().name)
+
+
+class SerialSink(AbstractSink):
+    """Blocking Sink recording how many of its `sink` calls run at the same time."""
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def sink(self, data):
+        with SerialSink.lock:
+            SerialSink.running += 1
+            SerialSink.max_running = max(SerialSink.max_running, SerialSink.running)
+        time.sleep(0.005)
+        with SerialSink.lock:
+            SerialSink.running -= 1
+
+    def close(self):
+        pass
+
+
+class SlowSink(DummySink):
+    """Sink taking `delay` seconds, from its template properties, to open and close."""
+    opened = 0
+    closed = 0
+
+    async def open(self):
+        await asyncio.sleep(self._template.properties.get('delay', 0.05))
+        if self._template.properties.get('fail'):
+            raise ConnectionError('unreachable')
+        SlowSink.opened += 1
+
+    async def close(self):
+        await asyncio.sleep(self._template.properties.get('delay', 0.05))
+        SlowSink.closed += 1
+
+
+class CountingBatchHandler(BatchReactionHandler):
+    """Batch handler returning the size of each batch."""
+
+    def handle_batch(self, events, reaction):
+        return len(events)
+
+
+class PartitionProbeHandler(ReactionHandler):
+    """Async handler recording the order of the events of each device and their concurrency."""
+    handled = {}
+    running = {}
+    max_running = 0
+
+    async def handle(self, event, reaction):
+        cls = PartitionProbeHandler
+        device = event.data['device_id']
+        assert not cls.running.get(device), 'events of a device handled concurrently'
+        cls.running[device] = True
+        cls.max_running = max(cls.max_running, sum(cls.running.values()))
+        await asyncio.sleep(0.01)
+        cls.running[device] = False
+        cls.handled.setdefault(device, []).append(event.data['seq'])
+        return event
+
+
+@pytest.fixture
+def batch_reaction_template(dummy_reaction_template):
+    dummy_reaction_template.handler = f'{__name__}.CountingBatchHandler'
+    dummy_reaction_template.max_batch_size = 3
+    dummy_reaction_template.max_batch_latency = 0.05
+    yield dummy_reaction_template
+
+
+@pytest.fixture
+def async_reaction_template(dummy_reaction_template):
+    ConcurrencyProbeHandler.running = ConcurrencyProbeHandler.max_running = ConcurrencyProbeHandler.handled = 0
+    dummy_reaction_template.handler = f'{__name__}.ConcurrencyProbeHandler'
+    dummy_reaction_template.max_concurrency = 2
+    yield dummy_reaction_template
+
+
 @pytest_asyncio.fixture(scope='function')
 async def reaction_sink_manager():
     reaction = DummyReaction()
@@ -144,7 +259,7 @@ class TestReaction:
         await reaction.stop()
         assert reaction.state == ReactionState.STOPPED
         assert reaction.disposable is None
-        assert len(reaction_event_bus._subject.observers) == 0
+        assert len(reaction_event_bus.reactions) == 0
 
     @pytest.mark.asyncio
     async def test_status_must_be_RUNNING_if_activated_after_stopping(self, reaction_event_bus):
@@ -194,9 +309,257 @@ class TestReaction:
         await reaction.init()
         reaction.activate(reaction_event_bus)
 
-        assert len(reaction_event_bus._subject.observers) == 1
+        assert len(reaction_event_bus.reactions) == 1
+        await reaction.close()
+        assert len(reaction_event_bus.reactions) == 0
+
+    @pytest.mark.asyncio
+    async def test_reaction_with_inbox_must_handle_events_in_its_own_task(
+            self, dummy_reaction_template, reaction_event_bus, test_event):
+        dummy_reaction_template.inbox_size = 10
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        reaction.handler.handle = Mock()
+        reaction.activate(reaction_event_bus)
+
+        reaction_event_bus.event(test_event)
+        reaction.handler.handle.assert_not_called()
+
+        await asyncio.sleep(0.01)
+        reaction.handler.handle.assert_called_once()
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_inbox_drops_must_be_reported_in_status(self, dummy_reaction_template, test_event):
+        dummy_reaction_template.inbox_size = 2
+        dummy_reaction_template.inbox_overflow_policy = 'drop_oldest'
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+
+        for _ in range(5):
+            reaction.on_next(test_event)
+
+        status = reaction.status()
+        assert status.inbox_depth == 2
+        assert status.events_dropped == 3
+        assert reaction.in_flight.count == 2
+
+    @pytest.mark.asyncio
+    async def test_initialization_must_fail_on_invalid_inbox_policy(self, dummy_reaction_template):
+        dummy_reaction_template.inbox_size = 2
+        dummy_reaction_template.inbox_overflow_policy = 'keep_latest'
+
+        with pytest.raises(ReactionError):
+            await DummyReaction(dummy_reaction_template).init()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('inbox_size', [0, 10])
+    async def test_async_handler_must_run_up_to_max_concurrency_calls(
+            self, async_reaction_template, test_event, inbox_size, reaction_event_bus):
+        async_reaction_template.inbox_size = inbox_size
+        reaction = DummyReaction(async_reaction_template)
+        await reaction.init()
+        reaction.activate(reaction_event_bus)
+
+        for _ in range(5):
+            reaction_event_bus.event(test_event)
+        await asyncio.sleep(0.1)
+
+        assert ConcurrencyProbeHandler.handled == 5
+        assert ConcurrencyProbeHandler.max_running == 2
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_must_release_publishers_waiting_for_inbox_room(
+            self, async_reaction_template, test_event, reaction_event_bus):
+        async_reaction_template.inbox_size = 2
+        reaction = DummyReaction(async_reaction_template)
+        await reaction.init()
+        reaction.activate(reaction_event_bus)
+
+        publishers = [asyncio.create_task(reaction_event_bus.publish(test_event)) for _ in range(8)]
+        await asyncio.sleep(0)
+        assert not all(p.done() for p in publishers)
+
+        await reaction.stop()
+        await asyncio.wait_for(asyncio.gather(*publishers), 1)
+        assert reaction.status().inbox_depth == 0
+        await reaction.close()
+        assert reaction.in_flight.count == 0
+
+    @pytest.mark.asyncio
+    async def test_close_must_wait_for_running_async_handlers(self, async_reaction_template, test_event):
+        reaction = DummyReaction(async_reaction_template)
+        await reaction.init()
+
+        reaction.on_next(test_event)
+        await reaction.close()
+
+        assert ConcurrencyProbeHandler.handled == 1
+        assert reaction.in_flight.count == 0
+
+    @pytest.mark.asyncio
+    async def test_process_execution_mode_must_sink_the_worker_result(self, dummy_reaction_template, test_event):
+        dummy_reaction_template.execution_mode = 'process'
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+
+        with patch.object(DummySink, 'sink') as sink:
+            reaction.on_next(test_event)
+            await reaction.close()
+            sink.assert_awaited_once_with(test_event)
+
+    @pytest.mark.asyncio
+    async def test_thread_execution_mode_must_run_handler_and_sinks_in_named_threads(
+            self, dummy_reaction_template, dummy_sink_template, test_event):
+        ThreadProbeHandler.threads, BlockingSink.threads = [], []
+        dummy_reaction_template.handler = f'{__name__}.ThreadProbeHandler'
+        dummy_reaction_template.execution_mode = 'thread'
+        dummy_sink_template.sink_class = f'{__name__}.BlockingSink'
+        dummy_sink_template.execution_mode = 'thread'
+        dummy_reaction_template.sinks = [dummy_sink_template]
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+
+        reaction.on_next(test_event)
+        await asyncio.sleep(0.05)
+        status = reaction.status()
+        await reaction.close()
+
+        assert ThreadProbeHandler.threads[0].startswith('orchd-reaction-')
+        assert len(BlockingSink.threads) == 2
+        assert all(t.startswith('orchd-sink-') for t in BlockingSink.threads)
+        assert status.executor.completed == 1
+        assert status.sinks_instances[0].executor.completed == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_handler_must_be_called_when_batch_is_full(self, batch_reaction_template, test_event):
+        reaction = DummyReaction(batch_reaction_template)
+        await reaction.init()
+
+        with patch.object(reaction, 'sink') as sink:
+            for _ in range(7):
+                reaction.on_next(test_event)
+
+            assert sink.call_args_list == [call(3), call(3)]
+            assert reaction.in_flight.count == 1
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_handler_must_be_called_after_max_batch_latency(self, batch_reaction_template, test_event):
+        reaction = DummyReaction(batch_reaction_template)
+        await reaction.init()
+
+        with patch.object(reaction, 'sink') as sink:
+            reaction.on_next(test_event)
+            reaction.on_next(test_event)
+            sink.assert_not_called()
+
+            await asyncio.sleep(0.1)
+            sink.assert_called_once_with(2)
+            assert reaction.in_flight.count == 0
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_partitioned_reaction_must_keep_the_order_of_each_key(self, dummy_reaction_template):
+        PartitionProbeHandler.handled, PartitionProbeHandler.running = dict(), dict()
+        PartitionProbeHandler.max_running = 0
+        dummy_reaction_template.handler = f'{__name__}.PartitionProbeHandler'
+        dummy_reaction_template.partition_key = 'data.device_id'
+        dummy_reaction_template.partitions = 8
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        reaction.activate(ReactionsEventBus())
+
+        for seq in range(5):
+            for device in ('a', 'b', 'c', 'd'):
+                reaction.on_next(Event(event_name='io.orchd.events.system.Test',
+                                       data={'device_id': device, 'seq': seq}))
+        assert sum(reaction.status().lane_depths) == 20
+        await asyncio.wait_for(reaction.in_flight.wait_below(0), 1)
+
+        assert PartitionProbeHandler.handled == {d: [0, 1, 2, 3, 4] for d in ('a', 'b', 'c', 'd')}
+        assert PartitionProbeHandler.max_running > 1
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_partitioned_reaction_must_reject_batch_handlers(self, batch_reaction_template):
+        batch_reaction_template.partition_key = 'data.device_id'
+
+        with pytest.raises(ReactionError):
+            await DummyReaction(batch_reaction_template).init()
+
+    @pytest.mark.asyncio
+    async def test_cached_results_must_skip_the_handler_and_be_sunk(self, dummy_reaction_template, test_event):
+        dummy_reaction_template.cache_max_entries = 10
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+
+        with patch.object(reaction.handler, 'handle', return_value='result') as handle, \
+                patch.object(reaction, 'sink') as sink:
+            reaction.on_next(test_event)
+            reaction.on_next(test_event.model_copy(update={'id': str(uuid4())}))
+
+            handle.assert_called_once()
+            assert sink.call_args_list == [call('result'), call('result')]
+        cache = reaction.status().cache
+        assert (cache.hits, cache.misses, cache.entries) == (1, 1, 1)
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_reconfigure_must_switch_handler_sinks_and_subscription(
+            self, async_reaction_template, test_event):
+        event_bus = ReactionsEventBus()
+        reaction = DummyReaction()
+        await reaction.init()
+        reaction.activate(event_bus)
+        previous_sink = reaction.sinks[0]
+
+        async_reaction_template.triggered_on = ['io.orchd.events.system.Other']
+        with patch.object(previous_sink, 'close') as close:
+            await reaction.reconfigure(async_reaction_template)
+            close.assert_called_once()
+
+        assert isinstance(reaction.handler, ConcurrencyProbeHandler)
+        assert reaction.sinks[0] is not previous_sink
+        assert not event_bus.match(test_event)
+        event_bus.event(Event(event_name='io.orchd.events.system.Other', data=dict()))
+        await asyncio.sleep(0.05)
+        assert ConcurrencyProbeHandler.handled == 1
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_reconfigure_must_let_running_calls_finish(self, async_reaction_template, test_event):
+        reaction = DummyReaction(async_reaction_template)
+        await reaction.init()
+        reaction.on_next(test_event)
+        await asyncio.sleep(0)
+
+        await reaction.reconfigure(async_reaction_template.model_copy(update={'max_concurrency': 4}))
+
+        assert ConcurrencyProbeHandler.handled == 1
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_reconfigure_must_keep_current_parts_on_failure(self, dummy_reaction_template):
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        handler, sinks = reaction.handler, reaction.sinks
+
+        with pytest.raises(ReactionError):
+            await reaction.reconfigure(dummy_reaction_template.model_copy(update={'handler': 'not.existent.Handler'}))
+        with pytest.raises(ReactionError):
+            await reaction.reconfigure(dummy_reaction_template.model_copy(update={'inbox_size': 10}))
+
+        assert reaction.handler is handler and reaction.sinks == sinks
         await reaction.close()
-        assert len(reaction_event_bus._subject.observers) == 0
+
+    @pytest.mark.asyncio
+    async def test_initialization_must_fail_on_unknown_execution_mode(self, dummy_reaction_template):
+        dummy_reaction_template.execution_mode = 'unknown'
+
+        with pytest.raises(ReactionError):
+            await DummyReaction(dummy_reaction_template).init()
 
     @pytest.mark.asyncio
     async def test_must_trasition_to_FINALIZED_state_when_closed(self, reaction_event_bus):
@@ -216,6 +579,217 @@ class TestReaction:
         assert len(reaction.sinks) == 0
 
 
+class TestReactionsEventBus:
+
+    @pytest.mark.asyncio
+    async def test_event_must_only_reach_reactions_triggered_on_its_name(
+            self, reaction_event_bus, dummy_reaction_template, test_event):
+        other_template = dummy_reaction_template.model_copy(update={'triggered_on': ['io.orchd.events.Other']})
+        reaction = DummyReaction(dummy_reaction_template)
+        other_reaction = DummyReaction(other_template)
+        for r in (reaction, other_reaction):
+            await r.init()
+            r.handler.handle = Mock()
+            r.activate(reaction_event_bus)
+
+        reaction_event_bus.event(test_event)
+
+        reaction.handler.handle.assert_called_once()
+        other_reaction.handler.handle.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_catch_all_reaction_must_receive_every_event_once(
+            self, reaction_event_bus, dummy_reaction_template, test_event):
+        dummy_reaction_template.triggered_on = ['', test_event.event_name]
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        reaction.handler.handle = Mock()
+        reaction.activate(reaction_event_bus)
+
+        reaction_event_bus.event(test_event)
+        reaction_event_bus.event(Event(event_name='io.orchd.events.Other'))
+
+        assert reaction.handler.handle.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_wildcard_reaction_must_receive_events_of_its_subtree(
+            self, reaction_event_bus, dummy_reaction_template, test_event):
+        dummy_reaction_template.triggered_on = ['io.orchd.events.**', test_event.event_name]
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        reaction.handler.handle = Mock()
+        reaction.activate(reaction_event_bus)
+
+        reaction_event_bus.event(test_event)
+        reaction_event_bus.event(Event(event_name='io.orchd.events.docker.ContainerStarted'))
+        reaction_event_bus.event(Event(event_name='com.acme.plant1.Temperature'))
+
+        assert reaction.handler.handle.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_filtered_reaction_must_only_receive_matching_events(
+            self, reaction_event_bus, dummy_reaction_template, test_event):
+        dummy_reaction_template.filters = [EventFilter(field='data.site', value='plant1')]
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        reaction.handler.handle = Mock()
+        reaction.activate(reaction_event_bus)
+        matching_event = test_event.model_copy(update={'data': {'site': 'plant1'}})
+
+        reaction_event_bus.event(test_event)
+        reaction_event_bus.publish_many([matching_event, test_event])
+
+        reaction.handler.handle.assert_called_once_with(matching_event, dummy_reaction_template)
+
+    @pytest.mark.asyncio
+    async def test_register_must_fail_on_invalid_pattern(self, reaction_event_bus, dummy_reaction_template):
+        dummy_reaction_template.triggered_on = ['io.orchd.events*']
+
+        with pytest.raises(ReactionError):
+            reaction_event_bus.register_reaction(DummyReaction(dummy_reaction_template))
+        assert len(reaction_event_bus.reactions) == 0
+
+    @pytest.mark.asyncio
+    async def test_disposed_reaction_must_be_removed_from_the_index(self, reaction_event_bus, test_event):
+        reaction = DummyReaction()
+        await reaction.init()
+        reaction.handler.handle = Mock()
+        reaction.activate(reaction_event_bus)
+        await reaction.stop()
+
+        reaction_event_bus.event(test_event)
+
+        reaction.handler.handle.assert_not_called()
+        assert reaction_event_bus._routes == {}
+
+    @pytest.mark.asyncio
+    async def test_publish_many_must_deliver_each_reaction_its_events_in_one_batch(
+            self, reaction_event_bus, dummy_reaction_template, test_event):
+        other_template = dummy_reaction_template.model_copy(update={'triggered_on': ['io.orchd.events.Other']})
+        reaction = DummyReaction(dummy_reaction_template)
+        other_reaction = DummyReaction(other_template)
+        for r in (reaction, other_reaction):
+            r.on_next_batch = Mock()
+            r.activate(reaction_event_bus)
+        other_event = Event(event_name='io.orchd.events.Other')
+        events = [test_event, other_event, test_event.model_copy(update={'id': '2'})]
+
+        reaction_event_bus.publish_many(events)
+
+        reaction.on_next_batch.assert_called_once_with([events[0], events[2]])
+        other_reaction.on_next_batch.assert_called_once_with([other_event])
+
+    @pytest.mark.asyncio
+    async def test_on_next_batch_must_handle_each_event_by_default(self, test_event):
+        reaction = DummyReaction()
+        await reaction.init()
+        reaction.handler.handle = Mock()
+
+        reaction.on_next_batch([test_event, test_event])
+
+        assert reaction.handler.handle.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_reactions_must_not_drop_the_batch_of_the_others(self, reaction_event_bus, test_event):
+        def fail_on_first(event, template):
+            if event.data['i'] == 0:
+                raise ValueError('bad reading')
+
+        broken, failing, healthy = DummyReaction(), DummyReaction(), DummyReaction()
+        for reaction in (broken, failing, healthy):
+            await reaction.init()
+            reaction.activate(reaction_event_bus)
+        broken.on_next_batch = Mock(side_effect=RuntimeError('broken'))
+        failing.handler.handle = Mock(side_effect=fail_on_first)
+        healthy.handler.handle = Mock()
+        events = [test_event.model_copy(update={'id': str(i), 'data': {'i': i}}) for i in range(5)]
+
+        await reaction_event_bus.publish_batch(events)
+
+        assert failing.handler.handle.call_count == 5
+        assert [c.args[0] for c in healthy.handler.handle.call_args_list] == events
+
+    @pytest.mark.asyncio
+    async def test_publish_must_suspend_publisher_above_high_watermark(self, test_event):
+        event_bus = ReactionsEventBus(high_watermark=2, low_watermark=1)
+        reaction = DummyReaction()
+        await reaction.init()
+        reaction.activate(event_bus)
+        reaction.in_flight.started(2)
+
+        publishing = asyncio.ensure_future(event_bus.publish(test_event))
+        await asyncio.sleep(0.01)
+        assert not publishing.done()
+
+        reaction.in_flight.done(2)
+        await asyncio.wait_for(publishing, 0.1)
+
+    @pytest.mark.asyncio
+    async def test_in_flight_must_count_scheduled_sink_writes(self, test_event):
+        reaction = DummyReaction()
+        await reaction.init()
+
+        reaction.on_next(test_event)
+        assert reaction.in_flight.count == 1
+
+        await asyncio.sleep(0.01)
+        assert reaction.in_flight.count == 0
+
+    @pytest.mark.asyncio
+    async def test_status_must_report_sink_dispatch_stats(self, test_event):
+        reaction = DummyReaction()
+        await reaction.init()
+
+        reaction.on_next(test_event)
+        await asyncio.sleep(0.01)
+
+        dispatch = reaction.status().sinks_instances[0].dispatch
+        assert dispatch.completed == 1
+        assert dispatch.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_close_must_drain_pending_sink_writes(self, test_event):
+        reaction = DummyReaction()
+        await reaction.init()
+        sink = reaction.sink_manager.sinks[0]
+        sunk = list()
+
+        async def slow_sink(data):
+            await asyncio.sleep(0.01)
+            sunk.append(data)
+
+        sink.sink = slow_sink
+        reaction.on_next(test_event)
+        await reaction.close()
+
+        assert len(sunk) == 1
+        assert reaction.in_flight.count == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_must_wait_for_room_in_blocking_inbox(self, dummy_reaction_template, test_event):
+        dummy_reaction_template.inbox_size = 1
+        event_bus = ReactionsEventBus()
+        reaction = DummyReaction(dummy_reaction_template)
+        await reaction.init()
+        reaction.activate(event_bus)
+
+        await asyncio.wait_for(event_bus.publish(test_event), 0.1)
+        await asyncio.wait_for(event_bus.publish(test_event), 0.1)
+        assert reaction.status().events_dropped == 0
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_remove_all_reactions(self, reaction_event_bus):
+        reactions = [DummyReaction(), DummyReaction()]
+        for reaction in reactions:
+            reaction.activate(reaction_event_bus)
+
+        reaction_event_bus.remove_all_reactions()
+
+        assert len(reaction_event_bus.reactions) == 0
+        assert all(r.state == ReactionState.STOPPED for r in reactions)
+
+
 class TestReactionSinkManager:
 
     def test_add_sink_must_fail_if_sink_class_do_not_exists(self, reaction_sink_manager, dummy_sink_template):
@@ -223,6 +797,11 @@ class TestReactionSinkManager:
             dummy_sink_template.sink_class = 'nonexistent.SinkClass'
             reaction_sink_manager.add_sink(dummy_sink_template)
 
+    def test_add_sink_must_fail_if_async_sink_runs_in_threads(self, reaction_sink_manager, dummy_sink_template):
+        dummy_sink_template.execution_mode = 'thread'
+        with pytest.raises(SinkError):
+            reaction_sink_manager.add_sink(dummy_sink_template)
+
     def test_add_sink_must_succeed_if_class_exists(self, reaction_sink_manager, dummy_sink_template):
         reaction_sink_manager.add_sink(dummy_sink_template)
         assert len(reaction_sink_manager.sinks) == 1
@@ -251,6 +830,80 @@ class TestReactionSinkManager:
             await reaction_sink_manager.create_sinks(dummy_sink_template_list)
         assert len(reaction_sink_manager.sinks) == 0
 
+    @pytest.mark.asyncio
+    async def test_sinks_must_be_opened_and_closed_concurrently(self, reaction_sink_manager, dummy_sink_template_list):
+        SlowSink.opened = SlowSink.closed = 0
+        for template in dummy_sink_template_list:
+            template.sink_class = f'{__name__}.SlowSink'
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await reaction_sink_manager.create_sinks(dummy_sink_template_list)
+        await reaction_sink_manager.close()
+
+        assert SlowSink.opened == SlowSink.closed == 3
+        assert loop.time() - started < 0.25
+
+    @pytest.mark.asyncio
+    async def test_when_a_sink_fails_to_open_close_all_created_sinks(self, reaction_sink_manager, dummy_sink_template_list):
+        SlowSink.opened = SlowSink.closed = 0
+        for template in dummy_sink_template_list:
+            template.sink_class = f'{__name__}.SlowSink'
+        dummy_sink_template_list[1].properties = {'fail': True}
+        dummy_sink_template_list[2].properties = {'delay': 1}
+        dummy_sink_template_list[2].open_timeout = 0.05
+        dummy_sink_template_list[2].close_timeout = 0.05
+
+        with pytest.raises(SinkError):
+            await reaction_sink_manager.create_sinks(dummy_sink_template_list)
+
+        assert SlowSink.opened == 1
+        assert SlowSink.closed == 2
+        assert len(reaction_sink_manager.sinks) == 0
+
+    @pytest.mark.asyncio
+    async def test_shared_sinks_must_be_closed_by_their_last_user(self, dummy_sink_template):
+        SlowSink.opened = SlowSink.closed = 0
+        dummy_sink_template.sink_class = f'{__name__}.SlowSink'
+        dummy_sink_template.shared = True
+        managers = [ReactionSinkManager(DummyReaction()) for _ in range(2)]
+
+        for manager in managers:
+            await manager.create_sinks([dummy_sink_template])
+        assert managers[0].sinks[0] is managers[1].sinks[0]
+        assert managers[0].sinks_info()[0].references == 2
+        assert SlowSink.opened == 1
+
+        await managers[0].close()
+        assert SlowSink.closed == 0
+        await managers[1].close()
+        assert SlowSink.closed == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_blocking_sinks_must_share_one_thread_pool(self, dummy_sink_template):
+        SerialSink.max_running = 0
+        dummy_sink_template.sink_class = f'{__name__}.SerialSink'
+        dummy_sink_template.shared = True
+        dummy_sink_template.execution_mode = 'thread'
+        dummy_sink_template.max_workers = 1
+        dummy_sink_template.max_in_flight = 4
+        managers = [ReactionSinkManager(DummyReaction()) for _ in range(3)]
+        for manager in managers:
+            await manager.create_sinks([dummy_sink_template])
+        pool = managers[0]._pools[managers[0].sinks[0].id]
+        assert all(m._pools[m.sinks[0].id] is pool for m in managers)
+
+        for manager in managers:
+            for i in range(4):
+                manager.dispatch(i)
+        for manager in managers[:2]:
+            await manager.close()
+        assert not pool._executor._shutdown
+        await managers[2].close()
+
+        assert SerialSink.max_running == 1
+        assert pool._executor._shutdown
+
     @pytest.mark.asyncio
     async def test_get_sink_by_an_existent_id(self, dummy_sink_template_list, reaction_sink_manager):
         await reaction_sink_manager.create_sinks(dummy_sink_template_list)
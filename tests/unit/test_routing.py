@@ -0,0 +1,119 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import pytest
+
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.models import Event, EventFilter
+from orchd_sdk.routing import TopicTrie, Subscribers, compile_filters
+
+
+class TestTopicTrie:
+
+    @pytest.mark.parametrize('pattern, name', [
+        ('io.orchd.events.system.Test', 'io.orchd.events.system.Test'),
+        ('io.orchd.events.*.Test', 'io.orchd.events.system.Test'),
+        ('io.orchd.*.*.Test', 'io.orchd.events.system.Test'),
+        ('io.orchd.**', 'io.orchd.events.system.Test'),
+        ('io.**.Test', 'io.orchd.events.system.Test'),
+        ('io.orchd.events.system.Test.**', 'io.orchd.events.system.Test'),
+        ('**', 'com.acme.plant1.line3.temp'),
+        ('com.**.line3.*', 'com.acme.plant1.line3.temp'),
+    ])
+    def test_given_matching_pattern_return_its_values(self, pattern, name):
+        trie = TopicTrie()
+        trie.insert(pattern, 'value')
+        assert trie.match(name) == ['value']
+
+    @pytest.mark.parametrize('pattern, name', [
+        ('io.orchd.events.*', 'io.orchd.events.system.Test'),
+        ('io.orchd.*.Test', 'io.orchd.events.system.Test'),
+        ('com.acme.**', 'io.orchd.events.system.Test'),
+        ('com.**.line4.*', 'com.acme.plant1.line3.temp'),
+    ])
+    def test_given_not_matching_pattern_return_nothing(self, pattern, name):
+        trie = TopicTrie()
+        trie.insert(pattern, 'value')
+        assert trie.match(name) == []
+
+    def test_value_matched_by_many_patterns_must_be_returned_once(self):
+        trie = TopicTrie()
+        trie.insert('com.acme.**', 'value')
+        trie.insert('com.*.plant1.**', 'value')
+        assert trie.match('com.acme.plant1.line3') == ['value']
+
+    def test_remove_must_prune_empty_nodes(self):
+        trie = TopicTrie()
+        trie.insert('com.acme.*.temp', 'value')
+        trie.remove('com.acme.*.temp', 'value')
+
+        assert len(trie) == 0
+        assert trie.match('com.acme.plant1.temp') == []
+        assert trie._root.children == {}
+
+    @pytest.mark.parametrize('pattern', ['com.acme*', 'com..acme', 'com.***'])
+    def test_given_invalid_pattern_throw_exception(self, pattern):
+        with pytest.raises(InvalidInputError):
+            TopicTrie().insert(pattern, 'value')
+
+
+class TestSubscribers:
+
+    @pytest.fixture
+    def events(self):
+        return [
+            Event(event_name='com.acme.Alarm', data={'site': 'plant1', 'severity': 1}),
+            Event(event_name='com.acme.Alarm', data={'site': 'plant1', 'severity': 4}),
+            Event(event_name='com.acme.Alarm', data={'site': 'plant2', 'severity': 5}),
+            Event(event_name='com.acme.Alarm', data={'site': ['unhashable']}),
+        ]
+
+    @pytest.mark.parametrize('filters, expected', [
+        ([], [0, 1, 2, 3]),
+        ([EventFilter(field='data.site', value='plant1')], [0, 1]),
+        ([EventFilter(field='data.severity', operator='>=', value=3)], [1, 2]),
+        ([EventFilter(field='data.site', value='plant1'),
+          EventFilter(field='data.severity', operator='>=', value=3)], [1]),
+        ([EventFilter(field='data.site', operator='in', value=['plant2', 'plant3'])], [2]),
+        ([EventFilter(field='data.missing', value=None)], [0, 1, 2, 3]),
+    ])
+    def test_match_must_apply_filters(self, events, filters, expected):
+        subscribers = Subscribers()
+        subscribers.add('subscriber', compile_filters(filters))
+
+        matched = [i for i, event in enumerate(events) if subscribers.match(event)]
+        assert matched == expected
+
+    def test_equality_filters_must_be_indexed(self):
+        filters = compile_filters([EventFilter(field='data.site', value='plant1'),
+                                   EventFilter(field='data.severity', operator='>', value=1)])
+
+        assert filters.index_field == 'data.site'
+        assert filters.index_value == 'plant1'
+        assert filters.predicate is not None
+
+    def test_remove_must_clear_the_index(self, events):
+        subscribers = Subscribers()
+        subscribers.add('subscriber', compile_filters([EventFilter(field='data.site', value='plant1')]))
+        subscribers.remove('subscriber')
+
+        assert len(subscribers) == 0
+        assert subscribers.match(events[0]) == ()
+        assert subscribers._indexed == {}
+
+    def test_given_unknown_operator_throw_exception(self):
+        with pytest.raises(InvalidInputError):
+            compile_filters([EventFilter(field='data.site', operator='~', value='plant1')])
@@ -0,0 +1,145 @@
+# The MIT License (MIT)
+# Copyright © 2022 <Mathias Santos de Brito>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit
+# persons to whom the Software is furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of the
+# Software.
+#
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE
+# WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR
+# COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+
+from orchd_sdk.errors import InvalidInputError
+from orchd_sdk.scheduler import SensorScheduler, TimerWheel
+from orchd_sdk.sensor import DummySensor, LocalCommunicator, SensorError
+
+
+class TestTimerWheel:
+
+    def test_timers_must_expire_at_their_tick_on_every_level(self):
+        wheel = TimerWheel(slots=4, levels=3)
+        for expires in (1, 3, 5, 17, 63, 100):
+            wheel.schedule(expires, expires)
+
+        expired = {timer.item: wheel.now for _ in range(120) for timer in wheel.tick()}
+
+        assert expired == {1: 1, 3: 3, 5: 5, 17: 17, 63: 63, 100: 100}
+
+    @pytest.mark.parametrize('slots, levels', [(2, 1), (4, 1), (2, 3), (4, 2), (8, 3)])
+    def test_random_schedules_must_expire_exactly_at_their_tick(self, slots, levels):
+        rng = random.Random(slots * 10 + levels)
+        wheel = TimerWheel(slots=slots, levels=levels)
+        pending = dict()
+        for tick in range(600):
+            for item in range(rng.randint(0, 3)):
+                expires = wheel.now + rng.randint(-2, 400)
+                timer = wheel.schedule(expires, (tick, item))
+                pending[timer.item] = max(expires, wheel.now + 1)
+            for timer in wheel.tick():
+                assert pending.pop(timer.item) == wheel.now
+        while pending:
+            for timer in wheel.tick():
+                assert pending.pop(timer.item) == wheel.now
+            assert wheel.now < 2000
+
+    def test_cancelled_timers_must_not_expire(self):
+        wheel = TimerWheel(slots=4, levels=2)
+        wheel.schedule(2, 'kept')
+        wheel.schedule(9, 'cancelled').cancel()
+
+        assert [timer.item for _ in range(12) for timer in wheel.tick()] == ['kept']
+
+    def test_invalid_wheel_must_raise(self):
+        with pytest.raises(InvalidInputError):
+            TimerWheel(slots=1)
+
+
+class TestSensorScheduler:
+
+    @pytest.mark.asyncio
+    async def test_calls_must_run_periodically_and_report_lateness(self):
+        scheduler = SensorScheduler(resolution=0.005)
+        call = AsyncMock()
+        scheduler.add('a', call, 0.02)
+
+        await asyncio.sleep(0.13)
+        info = scheduler.info('a')
+        await scheduler.close()
+
+        assert 4 <= call.await_count <= 7
+        assert info.runs == call.await_count
+        assert 0 <= info.mean_lateness <= info.max_lateness
+
+    @pytest.mark.asyncio
+    async def test_phases_must_be_spread_over_the_interval(self):
+        scheduler = SensorScheduler(resolution=0.01)
+        for key in 'abcd':
+            scheduler.add(key, AsyncMock(), 1)
+
+        phases = [scheduler.info(key).phase for key in 'abcd']
+        await scheduler.close()
+
+        assert len(set(phases)) == 4
+        assert all(0 <= phase < 1 for phase in phases)
+
+    @pytest.mark.asyncio
+    async def test_call_still_running_must_be_skipped(self):
+        scheduler = SensorScheduler(resolution=0.005)
+
+        async def slow():
+            await asyncio.sleep(0.05)
+        scheduler.add('slow', slow, 0.01)
+
+        await asyncio.sleep(0.08)
+        info = scheduler.info('slow')
+        await scheduler.close()
+
+        assert info.runs <= 2
+        assert info.skipped >= 3
+
+    @pytest.mark.asyncio
+    async def test_removed_call_must_stop_being_called(self):
+        scheduler = SensorScheduler(resolution=0.005)
+        call = AsyncMock()
+        scheduler.add('a', call, 0.01)
+        await asyncio.sleep(0.03)
+        scheduler.remove('a')
+        count = call.await_count
+
+        await asyncio.sleep(0.03)
+
+        assert call.await_count == count
+        assert not scheduler.running
+
+    @pytest.mark.asyncio
+    async def test_scheduled_sensor_must_report_its_schedule(self):
+        scheduler = SensorScheduler(resolution=0.005)
+        sensor = DummySensor(DummySensor.template.model_copy(update={'sensing_interval': 0.01}),
+                             LocalCommunicator())
+        sensor.sense = AsyncMock()
+
+        sensor.start(scheduler)
+        await asyncio.sleep(0.05)
+        status = sensor.status()
+        await sensor.stop()
+
+        assert sensor.sense.await_count >= 2
+        assert status.schedule.runs >= sensor.sense.await_count
+        assert sensor.id not in scheduler
+
+    @pytest.mark.asyncio
+    async def test_sensor_without_interval_must_not_be_scheduled(self):
+        sensor = DummySensor(DummySensor.template, LocalCommunicator())
+        with pytest.raises(SensorError):
+            sensor.start(SensorScheduler())
@@ -15,12 +15,15 @@
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import asyncio
-from unittest.mock import AsyncMock
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from orchd_sdk.reaction import ReactionsEventBus
-from orchd_sdk.sensor import DummySensor, LocalCommunicator, SensorState
+from orchd_sdk.models import Event
+from orchd_sdk.reaction import DummyReaction, ReactionsEventBus
+from orchd_sdk.sensor import AbstractCommunicator, BlockingSensor, DummySensor, LocalCommunicator, SensorError, SensorState
 
 
 class TestSensor:
@@ -66,6 +69,192 @@ class TestSensor:
         await sensor.stop()
         sense_mock.assert_awaited()
 
+    @pytest.mark.asyncio
+    async def test_queued_events_must_be_emitted_in_batches(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        sensor = DummySensor(DummySensor.template.model_copy(update={'emit_batch_size': 100}), communicator)
+        sensor.sense = AsyncMock()
+        for _ in range(250):
+            sensor.event_queue.put_nowait(Event(event_name='io.orchd.events.system.Test'))
+
+        sensor.start()
+        await asyncio.sleep(0.01)
+        await sensor.stop()
+
+        assert [len(c.args[0]) for c in communicator.emit_events.await_args_list] == [100, 100, 50]
+
+    @pytest.mark.asyncio
+    async def test_sensing_interval_must_pace_sense_calls(self):
+        sensor = DummySensor(DummySensor.template.model_copy(update={'sensing_interval': 0.05}),
+                             LocalCommunicator())
+        sensor.sense = AsyncMock()
+
+        sensor.start()
+        await asyncio.sleep(0.12)
+        await sensor.stop()
+
+        assert sensor.sense.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_status_must_count_received_forwarded_and_discarded_events(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        template = DummySensor.template.model_copy(update={'queue_size': 2, 'queue_overflow_policy': 'drop_oldest'})
+        sensor = DummySensor(template, communicator)
+        sensor.sense = AsyncMock()
+        for _ in range(5):
+            sensor.event_queue.put_nowait(Event(event_name='io.orchd.events.system.Test'))
+
+        sensor.start()
+        await asyncio.sleep(0.01)
+        await sensor.stop()
+
+        status = sensor.status()
+        assert (status.events_count, status.events_forwarded, status.events_discarded) == (5, 2, 3)
+
+    @pytest.mark.asyncio
+    async def test_only_events_not_emitted_must_be_counted_as_discarded(self):
+        class FlakyCommunicator(AbstractCommunicator):
+            async def emit_event(self, event):
+                if event.data['i'] == 1:
+                    raise ConnectionError('unreachable')
+
+            async def authenticate(self):
+                pass
+
+            def close(self):
+                pass
+
+        sensor = DummySensor(DummySensor.template, FlakyCommunicator())
+        sensor.sense = AsyncMock()
+        for i in range(5):
+            sensor.event_queue.put_nowait(Event(event_name='io.orchd.events.system.Test', data={'i': i}))
+
+        sensor.start()
+        await asyncio.sleep(0.01)
+        await sensor.stop()
+
+        status = sensor.status()
+        assert (status.events_forwarded, status.events_discarded) == (4, 1)
+
+    @pytest.mark.asyncio
+    async def test_failing_reaction_must_not_discard_the_emitted_batch(self):
+        bus = ReactionsEventBus()
+        reaction = DummyReaction()
+        await reaction.init()
+        reaction.activate(bus)
+        reaction.handler.handle = Mock(side_effect=[ValueError('bad reading'), None, None])
+        sensor = DummySensor(DummySensor.template, LocalCommunicator(bus))
+        sensor.sense = AsyncMock()
+        for _ in range(3):
+            sensor.event_queue.put_nowait(Event(event_name='io.orchd.events.system.Test'))
+
+        sensor.start()
+        await asyncio.sleep(0.01)
+        await sensor.stop()
+
+        status = sensor.status()
+        assert (status.events_forwarded, status.events_discarded) == (3, 0)
+        assert reaction.handler.handle.call_count == 3
+        await reaction.close()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_must_hold_sense_until_the_queue_has_room(self):
+        template = DummySensor.template.model_copy(update={'queue_size': 1})
+        sensor = DummySensor(template, LocalCommunicator())
+        await sensor.event_queue.put(Event(event_name='io.orchd.events.system.Test'))
+
+        put = asyncio.create_task(sensor.event_queue.put(Event(event_name='io.orchd.events.system.Test')))
+        await asyncio.sleep(0.01)
+        assert not put.done()
+
+        sensor.event_queue.get_nowait()
+        await asyncio.wait_for(put, 1)
+        assert sensor.status().events_discarded == 0
+
+    def test_invalid_queue_settings_must_raise_sensor_error(self):
+        template = DummySensor.template.model_copy(update={'queue_overflow_policy': 'keep_latest'})
+        with pytest.raises(SensorError):
+            DummySensor(template, LocalCommunicator())
+
+
+class SleepingSensor(BlockingSensor):
+    """Blocks for `delay` seconds and returns a reading, or posts `posts` readings."""
+
+    def __init__(self, sensor_template, communicator):
+        super().__init__(sensor_template, communicator)
+        self.running = 0
+        self.most_running = 0
+        self._lock = threading.Lock()
+
+    def sense_blocking(self):
+        with self._lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(self.sensor_template.parameters.get('delay', 0))
+        with self._lock:
+            self.running -= 1
+        for i in range(self.sensor_template.parameters.get('posts', 0)):
+            self.post(Event(event_name='io.orchd.events.system.Test', data={'i': i}))
+        if not self.sensor_template.parameters.get('posts'):
+            return Event(event_name='io.orchd.events.system.Test')
+
+
+def sleeping_template(**update):
+    return DummySensor.template.model_copy(update={'sensing_interval': 0.001, **update})
+
+
+class TestBlockingSensor:
+
+    @pytest.mark.asyncio
+    async def test_sense_blocking_must_not_block_the_loop(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        sensor = SleepingSensor(sleeping_template(parameters={'delay': 0.05}), communicator)
+
+        sensor.start()
+        ticks = 0
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+        await sensor.stop()
+
+        status = sensor.status()
+        assert ticks == 10
+        assert status.events_forwarded >= 1
+        assert status.blocking.calls >= 1
+        assert status.blocking.max_duration >= 0.05
+        assert status.executor.workers == 1
+
+    @pytest.mark.asyncio
+    async def test_posted_readings_must_be_queued_in_batches(self):
+        communicator = LocalCommunicator()
+        communicator.emit_events = AsyncMock(return_value=None)
+        sensor = SleepingSensor(sleeping_template(parameters={'posts': 500}), communicator)
+        sensor.sense = AsyncMock()
+
+        sensor.start()
+        await sensor.pool.run(sensor.sense_blocking)
+        await asyncio.sleep(0.01)
+        await sensor.stop()
+
+        events = [e for call in communicator.emit_events.await_args_list for e in call.args[0]]
+        assert [e.data['i'] for e in events] == list(range(500))
+        assert sensor.readings == 500
+        assert 1 <= sensor.batches < 500
+
+    @pytest.mark.asyncio
+    async def test_max_threads_must_bound_concurrent_calls(self):
+        sensor = SleepingSensor(sleeping_template(max_threads=3, parameters={'delay': 0.02}),
+                                LocalCommunicator())
+
+        sensor.start()
+        await asyncio.sleep(0.1)
+        await sensor.stop()
+
+        assert sensor.most_running == 3
+
 
 class TestLocalCommunicator:
 
@@ -83,3 +272,13 @@ class TestLocalCommunicator:
         bus = ReactionsEventBus()
         communicator2 = LocalCommunicator(event_bus=bus)
         assert communicator2.event_bus is bus
+
+    @pytest.mark.asyncio
+    async def test_emit_events_must_publish_the_batch_at_once(self):
+        bus = ReactionsEventBus()
+        bus.publish_batch = AsyncMock()
+        events = [Event(event_name='io.orchd.events.system.Test') for _ in range(3)]
+
+        await LocalCommunicator(event_bus=bus).emit_events(events)
+
+        bus.publish_batch.assert_awaited_once_with(events)
@@ -14,11 +14,13 @@
 # COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import asyncio
+
 import pytest
 
 from orchd_sdk.errors import SinkError
-from orchd_sdk.models import SinkTemplate
-from orchd_sdk.sink import sink_factory, DummySink, AbstractSink
+from orchd_sdk.models import RetryPolicy, SinkTemplate
+from orchd_sdk.sink import sink_factory, DummySink, AbstractSink, BatchingSink, SinkDispatcher, SinkRegistry
 
 
 def test_sink_factory():
@@ -30,3 +32,275 @@ def test_sink_factory():
         template: SinkTemplate = DummySink.template.model_copy()
         template.sink_class = 'not.existent.Class'
         sink_factory(template)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_must_limit_writes_in_flight():
+    running = list()
+    release = asyncio.Event()
+
+    async def write(data):
+        running.append(data)
+        await release.wait()
+
+    dispatcher = SinkDispatcher(DummySink(), 2, write=write)
+    for i in range(5):
+        dispatcher.dispatch(i)
+    await asyncio.sleep(0.01)
+    assert running == [0, 1]
+    assert dispatcher.in_flight == 2 and dispatcher.queue_depth == 3
+
+    release.set()
+    assert await dispatcher.drain(1) is True
+    assert running == [0, 1, 2, 3, 4]
+    assert dispatcher.info().completed == 5
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_must_record_failed_writes():
+    async def write(data):
+        raise ValueError('unreachable')
+
+    done = list()
+    dispatcher = SinkDispatcher(DummySink(), 1, write=write, on_done=done.append)
+    dispatcher.dispatch('data')
+    await dispatcher.drain(1)
+
+    info = dispatcher.info()
+    assert info.failed == 1 and info.completed == 0
+    assert info.last_errors == ['ValueError: unreachable']
+    assert done == [1]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_must_cancel_pending_writes_when_drain_times_out():
+    async def write(data):
+        await asyncio.sleep(10)
+
+    done = list()
+    dispatcher = SinkDispatcher(DummySink(), 1, write=write, on_done=done.append)
+    dispatcher.dispatch(1)
+    dispatcher.dispatch(2)
+    assert await dispatcher.drain(0.01) is False
+
+    assert dispatcher.cancel() == 2
+    await asyncio.sleep(0.01)
+    assert sum(done) == 2
+    assert dispatcher.in_flight == 0 and dispatcher.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_must_retry_failed_writes_with_backoff():
+    attempts = list()
+
+    async def write(data):
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) < 3:
+            raise ConnectionError('unreachable')
+
+    done = list()
+    retry = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=1, jitter=0)
+    dispatcher = SinkDispatcher(DummySink(), 1, write=write, on_done=done.append, retry=retry)
+    dispatcher.dispatch('data')
+    await asyncio.sleep(0)
+    assert dispatcher.info().retrying == 1
+    assert dispatcher.info().current_backoff == 0.01
+    assert await dispatcher.drain(1) is True
+
+    info = dispatcher.info()
+    assert (info.attempts, info.failed, info.completed, info.give_ups) == (3, 2, 1, 0)
+    assert attempts[1] - attempts[0] >= 0.009
+    assert attempts[2] - attempts[1] >= 0.019
+    assert done == [1]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_must_not_hold_slots_while_waiting_to_retry():
+    written = list()
+
+    async def write(data):
+        if data == 'failing':
+            raise ConnectionError('unreachable')
+        written.append(data)
+
+    retry = RetryPolicy(max_attempts=2, base_delay=10, jitter=0)
+    dispatcher = SinkDispatcher(DummySink(), 1, write=write, retry=retry)
+    dispatcher.dispatch('failing')
+    dispatcher.dispatch('fresh')
+    await asyncio.sleep(0.01)
+
+    assert written == ['fresh']
+    assert dispatcher.retrying == 1
+    assert dispatcher.cancel() == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_must_give_up_after_max_attempts():
+    async def write(data):
+        raise ConnectionError('unreachable')
+
+    retry = RetryPolicy(max_attempts=2, base_delay=0.001)
+    dispatcher = SinkDispatcher(DummySink(), 1, write=write, retry=retry)
+    dispatcher.dispatch('data')
+    await dispatcher.drain(1)
+
+    info = dispatcher.info()
+    assert (info.attempts, info.failed, info.give_ups) == (2, 2, 1)
+
+
+def test_dispatcher_must_fail_on_invalid_max_in_flight():
+    with pytest.raises(SinkError):
+        SinkDispatcher(DummySink(), 0)
+    with pytest.raises(SinkError):
+        SinkDispatcher(DummySink(), 1, retry=RetryPolicy(jitter=2))
+
+
+def test_registry_must_share_sinks_of_same_template_and_properties():
+    registry = SinkRegistry()
+    template = DummySink.template.model_copy(update={'shared': True})
+
+    sink = registry.acquire(template)
+    assert registry.acquire(template.model_copy()) is sink
+    assert registry.acquire(template.model_copy(update={'properties': {'endpoint': 'other'}})) is not sink
+    assert registry.references(sink) == 2
+
+    assert registry.release(sink) is False
+    assert registry.release(sink) is True
+    assert registry.is_shared(sink) is False
+    assert len(registry) == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_must_open_shared_sinks_once():
+    registry = SinkRegistry()
+    sink = registry.acquire(DummySink.template)
+    registry.acquire(DummySink.template)
+    opened = list()
+
+    async def open_():
+        await asyncio.sleep(0.01)
+        opened.append(sink)
+
+    await asyncio.gather(registry.open(sink, open_), registry.open(sink, open_))
+    assert opened == [sink]
+
+
+class ListBatchingSink(BatchingSink):
+    """Batching Sink keeping the batches it writes."""
+
+    def __init__(self, template):
+        super().__init__(template)
+        self.batches = list()
+
+    async def write_batch(self, items):
+        self.batches.append(items)
+
+
+def batching_sink(**properties):
+    return ListBatchingSink(DummySink.template.model_copy(update={'properties': properties}))
+
+
+@pytest.mark.asyncio
+async def test_batching_sink_must_write_full_batches():
+    sink = batching_sink(max_items=3)
+    for item in range(7):
+        await sink.sink(item)
+
+    assert sink.batches == [[0, 1, 2], [3, 4, 5]]
+    await sink.close()
+    assert sink.batches[-1] == [6]
+    assert sink.info.batching.batches == 3
+    assert sink.info.batching.max_batch_size == 3
+
+
+@pytest.mark.asyncio
+async def test_batching_sink_must_flush_when_max_bytes_is_reached():
+    sink = batching_sink(max_items=100, max_bytes=10)
+    for item in ('abcd', 'efgh', 'ijkl', 'm'):
+        await sink.sink(item)
+
+    assert sink.batches == [['abcd', 'efgh', 'ijkl']]
+    assert sink.info.batching.buffered == 1
+
+
+@pytest.mark.asyncio
+async def test_batching_sink_must_flush_after_max_delay():
+    sink = batching_sink(max_items=100, max_delay=0.02)
+    await sink.sink('a')
+    await sink.sink('b')
+    assert sink.batches == []
+
+    await asyncio.sleep(0.05)
+    assert sink.batches == [['a', 'b']]
+
+
+class FlakyBatchingSink(ListBatchingSink):
+    """Batching Sink failing its first `failures` writes."""
+
+    def __init__(self, template, failures=1):
+        super().__init__(template)
+        self.failures = failures
+
+    async def write_batch(self, items):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('unreachable')
+        await super().write_batch(items)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_must_be_written_when_the_dispatcher_retries():
+    sink = FlakyBatchingSink(DummySink.template.model_copy(update={'properties': {'max_items': 3}}))
+    retry = RetryPolicy(max_attempts=5, base_delay=0.001, jitter=0)
+    dispatcher = SinkDispatcher(sink, 1, retry=retry)
+    for item in range(3):
+        dispatcher.dispatch(item)
+    assert await dispatcher.drain(1) is True
+
+    assert sink.batches == [[0, 1, 2]]
+    info = dispatcher.info()
+    assert (info.completed, info.failed, info.give_ups) == (3, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_failed_timed_batch_must_be_buffered_again():
+    sink = FlakyBatchingSink(DummySink.template.model_copy(update={'properties': {'max_delay': 0.01}}))
+    await sink.sink('a')
+    await sink.sink('b')
+    await asyncio.sleep(0.015)
+    assert sink.batches == []
+    assert sink.info.batching.buffered == 2
+
+    await asyncio.sleep(0.02)
+    assert sink.batches == [['a', 'b']]
+    assert sink.info.batching.failed_batches == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_must_not_grow_the_buffer_beyond_max_buffered():
+    gate = asyncio.Event()
+
+    class GatedBatchingSink(FlakyBatchingSink):
+        async def write_batch(self, items):
+            await gate.wait()
+            await super().write_batch(items)
+
+    sink = GatedBatchingSink(DummySink.template.model_copy(
+        update={'properties': {'max_items': 3, 'max_buffered': 3}}))
+    await sink.sink(0)
+    await sink.sink(1)
+    filling = asyncio.create_task(sink.sink(2))
+    await asyncio.sleep(0)
+    await sink.sink(10)
+    await sink.sink(11)
+    gate.set()
+    with pytest.raises(ConnectionError):
+        await filling
+
+    assert sink._buffer == [1, 10, 11]
+    assert sink.info.batching.dropped == 1
+
+
+def test_batching_sink_must_fail_on_invalid_limits():
+    with pytest.raises(SinkError):
+        batching_sink(max_items=0)